@@ -0,0 +1,153 @@
+import threading
+from typing import Dict, Optional
+
+from Audio_Input.chord_input_processor import ChordInputProcessor
+from Audio_Input.user_input_handler import UserInputHandler
+from Audio_Input.random_sequence_generator import RandomSequenceGenerator
+from Audio_Input.mixed_sequence_completer import MixedSequenceCompleter
+
+
+class ChordCorpus:
+    """
+    Bundles a genre's corpus view with every index derived from it.
+
+    Attributes:
+        main_genre (Optional[str]): The genre the corpus was filtered by, or None for all genres.
+        processor (ChordInputProcessor): The loaded and filtered chord sequences.
+        input_handler (UserInputHandler): Chord validation built on the corpus vocabulary.
+        random_generator (RandomSequenceGenerator): Random seed windows drawn from the corpus.
+        mixed_completer (MixedSequenceCompleter): First-order transition map of the corpus.
+    """
+
+    def __init__(self, main_genre: Optional[str] = None):
+        """
+        Loads the corpus for a genre and builds its derived indexes.
+
+        Args:
+            main_genre (Optional[str]): If provided, filters chord sequences by this genre.
+        """
+        self.main_genre = main_genre
+        self.processor = ChordInputProcessor(main_genre)
+        self.input_handler = UserInputHandler(self.processor)
+        self.random_generator = RandomSequenceGenerator(self.processor)
+        self.mixed_completer = MixedSequenceCompleter(self.processor, self.random_generator)
+
+
+class ChordCorpusRegistry:
+    """
+    Thread-safe, process-wide cache of ChordCorpus objects keyed by genre.
+
+    Each genre is loaded and indexed at most once; concurrent requests for the same genre
+    wait for the first build, while different genres build in parallel.
+
+    Methods:
+        get(main_genre: Optional[str] = None) -> ChordCorpus:
+            Returns the shared corpus for a genre, building it on first use.
+
+        is_loaded(main_genre: Optional[str] = None) -> bool:
+            Reports whether a genre's corpus is already cached.
+
+        invalidate(main_genre: Optional[str] = None):
+            Drops a genre's cached corpus so the next get() rebuilds it.
+
+        invalidate_all():
+            Drops every cached corpus.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty registry.
+        """
+        self._corpora: Dict[Optional[str], ChordCorpus] = {}
+        self._build_locks: Dict[Optional[str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(main_genre: Optional[str]) -> Optional[str]:
+        """
+        Normalizes a genre name into a registry key.
+        """
+        return main_genre.strip().lower() if main_genre else None
+
+    def _build_lock(self, key: Optional[str]) -> threading.Lock:
+        """
+        Returns the lock guarding the build of a single genre.
+        """
+        with self._lock:
+            return self._build_locks.setdefault(key, threading.Lock())
+
+    def get(self, main_genre: Optional[str] = None) -> ChordCorpus:
+        """
+        Returns the shared corpus for a genre, building it on first use.
+
+        Args:
+            main_genre (Optional[str]): The genre to load, or None for the whole dataset.
+
+        Returns:
+            ChordCorpus: The cached corpus and its derived indexes.
+        """
+        key = self._key(main_genre)
+
+        corpus = self._corpora.get(key)
+        if corpus is not None:
+            return corpus
+
+        with self._build_lock(key):
+            # Another thread may have finished the build while we were waiting
+            corpus = self._corpora.get(key)
+            if corpus is None:
+                corpus = ChordCorpus(main_genre)
+                self._corpora[key] = corpus
+
+        return corpus
+
+    def is_loaded(self, main_genre: Optional[str] = None) -> bool:
+        """
+        Reports whether a genre's corpus is already cached.
+
+        Args:
+            main_genre (Optional[str]): The genre to check, or None for the whole dataset.
+
+        Returns:
+            bool: True if the corpus is cached.
+        """
+        return self._key(main_genre) in self._corpora
+
+    def invalidate(self, main_genre: Optional[str] = None):
+        """
+        Drops a genre's cached corpus so the next get() rebuilds it.
+
+        Waits for an in-progress build of the same genre to finish before dropping it.
+
+        Args:
+            main_genre (Optional[str]): The genre to drop, or None for the whole-dataset corpus.
+        """
+        key = self._key(main_genre)
+
+        with self._build_lock(key):
+            self._corpora.pop(key, None)
+
+    def invalidate_all(self):
+        """
+        Drops every cached corpus.
+        """
+        with self._lock:
+            keys = list(self._build_locks.keys())
+
+        for key in keys:
+            with self._build_lock(key):
+                self._corpora.pop(key, None)
+
+
+# Registry shared by every ChordSequenceController in the process
+_default_registry = ChordCorpusRegistry()
+
+
+def get_chord_corpus_registry() -> ChordCorpusRegistry:
+    """
+    Returns the process-wide ChordCorpusRegistry.
+
+    Returns:
+        ChordCorpusRegistry: The shared registry instance.
+    """
+    return _default_registry
@@ -1,5 +1,7 @@
-from typing import List, Optional
-from datasets import load_dataset
+from collections import Counter
+from typing import Dict, List, Optional
+from Utils.Dataset_Utils.load_chord_dataset import load_chord_dataset
+from Utils.chord_vocabulary import canonicalize_chord
 
 
 class ChordInputProcessor:
@@ -8,8 +10,9 @@ class ChordInputProcessor:
 
     Attributes:
         main_genre (Optional[str]): The main genre to filter chord sequences.
-        dataset: The loaded Chordonomicon dataset.
-        chord_sequences (List[List[str]]): Extracted and filtered chord sequences.
+        dataset: The loaded Chordonomicon dataset, or a streamed view of its 'train' split.
+        chord_sequences (List[List[str]]): Extracted and filtered chord sequences, with every
+            chord in its canonical spelling so enharmonic variants count as one chord.
 
     Methods:
         _extract_chord_sequences() -> List[List[str]]:
@@ -18,23 +21,33 @@ class ChordInputProcessor:
         get_available_chords() -> List[str]:
             Returns a sorted list of all unique chords found in the extracted sequences.
 
+        get_chord_frequencies() -> Dict[str, int]:
+            Returns how many times each chord occurs in the extracted sequences.
+
         get_dataset_stats() -> dict:
             Returns statistics about the dataset, including total sequences, total chords,
             number of unique chords, and average sequence length.
     """
 
-    def __init__(self, main_genre: Optional[str] = None):
+    def __init__(self, main_genre: Optional[str] = None, streaming: bool = False,
+                 corpus_path: Optional[str] = None):
         """
         Initializes the ChordInputProcessor.
 
         Args:
             main_genre (Optional[str]): If provided, filters chord sequences by this genre.
+            streaming (bool): If True, only the 'chords' and 'main_genre' columns are streamed in
+                record batches instead of loading the full dataset into memory.
+            corpus_path (Optional[str]): A local Parquet, CSV or JSON Lines file, or a directory of
+                them, read in chunks instead of the Chordonomicon dataset.
         """
-        print("Loading Chordonomicon dataset...")
+        print(f"Loading {corpus_path or "Chordonomicon dataset"}...")
 
-        self.dataset = load_dataset("ailsntua/Chordonomicon")
+        self.dataset = load_chord_dataset(streaming=streaming, corpus_path=corpus_path)
         self.main_genre = main_genre
         self.chord_sequences = self._extract_chord_sequences()
+        self._available_chords = None
+        self._chord_frequencies = None
 
         print(f"Loaded {len(self.chord_sequences)} chord sequences for genre: {self.main_genre or "ALL"}")
 
@@ -43,7 +56,7 @@ class ChordInputProcessor:
         Extracts chord sequences from the dataset, filtering by genre if specified.
 
         Returns:
-            List[List[str]]: A list of chord sequences, each sequence is a list of chord strings.
+            List[List[str]]: A list of chord sequences, each sequence is a list of canonical chord strings.
         """
         sequences = []
 
@@ -57,14 +70,14 @@ class ChordInputProcessor:
 
                 if "chords" in item and item["chords"]:
                     if isinstance(item["chords"], list):
-                        filtered = [ch for ch in item["chords"] if
+                        filtered = [canonicalize_chord(ch) for ch in item["chords"] if
                                     ch and isinstance(ch, str) and not ch.startswith("<") and not ch.endswith(">")]
 
                         sequences.append(filtered)
                     elif isinstance(item["chords"], str):
                         chords = item["chords"].replace(",", " ").split()
 
-                        filtered = [ch for ch in chords if
+                        filtered = [canonicalize_chord(ch) for ch in chords if
                                     ch and isinstance(ch, str) and not ch.startswith("<") and not ch.endswith(">")]
 
                         sequences.append(filtered)
@@ -75,14 +88,34 @@ class ChordInputProcessor:
         """
         Returns a sorted list of all unique chords found in the extracted sequences.
 
+        The list is computed on first use and cached, since the sequences never change
+        after loading.
+
         Returns:
             List[str]: Sorted list of unique chord strings.
         """
-        all_chords = set()
-        for sequence in self.chord_sequences:
-            all_chords.update(sequence)
+        if self._available_chords is None:
+            self._available_chords = sorted(self.get_chord_frequencies().keys())
+
+        return self._available_chords
+
+    def get_chord_frequencies(self) -> Dict[str, int]:
+        """
+        Returns how many times each chord occurs in the extracted sequences.
+
+        The counts are computed on first use and cached.
+
+        Returns:
+            Dict[str, int]: Mapping from chord string to its occurrence count.
+        """
+        if self._chord_frequencies is None:
+            frequencies = Counter()
+            for sequence in self.chord_sequences:
+                frequencies.update(sequence)
+
+            self._chord_frequencies = dict(frequencies)
 
-        return sorted(list(all_chords))
+        return self._chord_frequencies
 
     def get_dataset_stats(self) -> dict:
         """
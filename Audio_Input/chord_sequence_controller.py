@@ -1,9 +1,6 @@
-from typing import List
+from typing import List, Optional
 
-from Audio_Input.chord_input_processor import ChordInputProcessor
-from Audio_Input.user_input_handler import UserInputHandler
-from Audio_Input.random_sequence_generator import RandomSequenceGenerator
-from Audio_Input.mixed_sequence_completer import MixedSequenceCompleter
+from Audio_Input.chord_corpus_registry import ChordCorpusRegistry, get_chord_corpus_registry
 
 from Utils.get_valid_genre import get_valid_genre
 
@@ -27,22 +24,33 @@ class ChordSequenceController:
             Validates user input and completes the sequence if necessary.
     """
 
-    def __init__(self, sequence: List[str], sequence_length: int, main_genre=None):
+    def __init__(self, sequence: List[str], sequence_length: int, main_genre=None,
+                 registry: Optional[ChordCorpusRegistry] = None):
         """
         Initializes the ChordSequenceController.
 
+        The corpus and its derived indexes are taken from the registry, so they are loaded
+        once per genre and shared by every controller in the process.
+
         Args:
             sequence (List[str]): Initial chord sequence.
             sequence_length (int): Desired length of the chord sequence.
             main_genre (str, optional): Main genre to filter chord data.
+            registry (ChordCorpusRegistry, optional): Registry to take the corpus from.
+                Defaults to the process-wide registry.
         """
         if main_genre is not None:
             main_genre = get_valid_genre(main_genre)
 
-        self.processor = ChordInputProcessor(main_genre)
-        self.input_handler = UserInputHandler(self.processor)
-        self.random_generator = RandomSequenceGenerator(self.processor)
-        self.mixed_completer = MixedSequenceCompleter(self.processor)
+        if registry is None:
+            registry = get_chord_corpus_registry()
+
+        corpus = registry.get(main_genre)
+
+        self.processor = corpus.processor
+        self.input_handler = corpus.input_handler
+        self.random_generator = corpus.random_generator
+        self.mixed_completer = corpus.mixed_completer
         self.sequence = sequence
         self.sequence_length = sequence_length
 
@@ -58,7 +66,8 @@ class ChordSequenceController:
             List[str]: Validated and completed chord sequence.
 
         Raises:
-            ValueError: If invalid chords are found in the input sequence.
+            ValueError: If invalid chords are found in the input sequence. The message lists
+                the closest suggestions for each invalid chord.
         """
         if len(self.sequence) == 0 and self.sequence_length > 0:
             return self.random_generator.get_random_sequence(self.sequence_length)
@@ -66,9 +75,26 @@ class ChordSequenceController:
         valid_chords, invalid_chords = self.input_handler.parse_chord_input(" ".join(self.sequence))
 
         if invalid_chords:
-            raise ValueError(f"Invalid chords: {", ".join(invalid_chords)}")
+            raise ValueError(f"Invalid chords: {", ".join(self._describe_invalid_chord(c) for c in invalid_chords)}")
 
         if len(self.sequence) >= self.sequence_length:
             return valid_chords[:self.sequence_length]
 
         return self.mixed_completer.complete_sequence(valid_chords, self.sequence_length)
+
+    def _describe_invalid_chord(self, chord: str) -> str:
+        """
+        Formats an invalid chord together with its closest suggestions.
+
+        Args:
+            chord (str): The invalid chord symbol.
+
+        Returns:
+            str: The chord, followed by "(did you mean ...?)" when suggestions exist.
+        """
+        suggestions = self.input_handler.suggest_similar_chords(chord)
+
+        if not suggestions:
+            return chord
+
+        return f"{chord} (did you mean {" / ".join(suggestions)}?)"
@@ -0,0 +1,217 @@
+from typing import Dict, List, Optional, Tuple
+
+
+def _levenshtein_distance(a: str, b: str) -> int:
+    """
+    Computes the edit distance between two strings.
+
+    Args:
+        a (str): First string.
+        b (str): Second string.
+
+    Returns:
+        int: Minimum number of insertions, deletions and substitutions turning a into b.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+
+    previous = list(range(len(b) + 1))
+
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            ))
+        previous = current
+
+    return previous[-1]
+
+
+def _deletion_variants(key: str, max_deletions: int) -> set:
+    """
+    Returns every string obtained by deleting up to max_deletions characters from key.
+
+    Args:
+        key (str): The string to delete characters from.
+        max_deletions (int): Maximum number of characters to delete.
+
+    Returns:
+        set: All deletion variants, including key itself.
+    """
+    variants = {key}
+    frontier = {key}
+
+    for _ in range(max_deletions):
+        frontier = {word[:i] + word[i + 1:] for word in frontier for i in range(len(word))}
+        variants.update(frontier)
+
+    return variants
+
+
+class _TrieNode:
+    """
+    Prefix trie node holding the most frequent chords below it.
+    """
+    __slots__ = ("children", "top_chords")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.top_chords: List[str] = []
+
+
+class ChordSuggestionIndex:
+    """
+    Ranked, case-insensitive chord suggestions for autocomplete and error messages.
+
+    Combines a prefix trie, whose nodes keep their most frequent completions, with a
+    symmetric-deletion index for edit distance: every key is stored under all its variants
+    with up to max_distance characters deleted, so a query only has to look up its own
+    deletion variants and verify the few candidates found. Chord symbols are short, which
+    keeps both the index and the per-query work small.
+
+    Suggestions are ranked by similarity first (exact match, prefix completions, then
+    increasing edit distance) and corpus frequency second.
+
+    Attributes:
+        frequencies (Dict[str, int]): Occurrence count of every indexed chord.
+        max_completions (int): Number of completions stored per trie node.
+        max_distance (int): Largest edit distance the index can answer.
+
+    Methods:
+        suggest(query: str, max_suggestions: int = 5, max_distance: Optional[int] = None) -> List[str]:
+            Returns up to max_suggestions chords similar to the query, best first.
+    """
+
+    def __init__(self, chord_frequencies: Dict[str, int], max_completions: int = 10, max_distance: int = 2):
+        """
+        Builds the trie and deletion index for a chord vocabulary.
+
+        Args:
+            chord_frequencies (Dict[str, int]): Mapping from chord symbol to occurrence count.
+            max_completions (int, optional): Number of completions stored per trie node.
+                Bounds how many prefix matches a query can return. Defaults to 10.
+            max_distance (int, optional): Largest edit distance the index can answer. Defaults to 2.
+        """
+        self.frequencies = dict(chord_frequencies)
+        self.max_completions = max_completions
+        self.max_distance = max_distance
+
+        # Several spellings may share a lowercase form, keep them most frequent first
+        self._chords_by_key: Dict[str, List[str]] = {}
+        for chord in sorted(self.frequencies, key=self._rank_key):
+            self._chords_by_key.setdefault(chord.lower(), []).append(chord)
+
+        self._trie = self._build_trie()
+        self._deletion_index = self._build_deletion_index()
+
+    def _rank_key(self, chord: str) -> Tuple[int, str]:
+        """
+        Sort key placing frequent chords first, ties broken alphabetically.
+        """
+        return -self.frequencies.get(chord, 0), chord
+
+    def _build_trie(self) -> _TrieNode:
+        """
+        Builds the prefix trie, storing the top completions on every node.
+
+        Returns:
+            _TrieNode: The root node.
+        """
+        root = _TrieNode()
+
+        # Inserting in rank order means each node's list is already sorted
+        for chord in sorted(self.frequencies, key=self._rank_key):
+            node = root
+            if len(node.top_chords) < self.max_completions:
+                node.top_chords.append(chord)
+
+            for char in chord.lower():
+                node = node.children.setdefault(char, _TrieNode())
+                if len(node.top_chords) < self.max_completions:
+                    node.top_chords.append(chord)
+
+        return root
+
+    def _build_deletion_index(self) -> Dict[str, List[str]]:
+        """
+        Maps every deletion variant of every lowercase key to the keys producing it.
+
+        Returns:
+            Dict[str, List[str]]: Deletion variant to lowercase chord keys.
+        """
+        index: Dict[str, List[str]] = {}
+
+        for key in self._chords_by_key:
+            for variant in _deletion_variants(key, self.max_distance):
+                index.setdefault(variant, []).append(key)
+
+        return index
+
+    def _prefix_matches(self, query: str) -> List[str]:
+        """
+        Returns the stored completions of a lowercase prefix.
+        """
+        node = self._trie
+        for char in query:
+            node = node.children.get(char)
+            if node is None:
+                return []
+
+        return node.top_chords
+
+    def _edit_distance_matches(self, query: str, max_distance: int) -> List[Tuple[int, str]]:
+        """
+        Returns (distance, chord) pairs for chords within max_distance of a lowercase query.
+        """
+        candidates = set()
+        for variant in _deletion_variants(query, max_distance):
+            candidates.update(self._deletion_index.get(variant, ()))
+
+        matches = []
+        for key in candidates:
+            # Cheap length bound before the exact distance
+            if abs(len(key) - len(query)) > max_distance:
+                continue
+
+            distance = _levenshtein_distance(query, key)
+            if distance <= max_distance:
+                matches.extend((distance, chord) for chord in self._chords_by_key[key])
+
+        return matches
+
+    def suggest(self, query: str, max_suggestions: int = 5, max_distance: Optional[int] = None) -> List[str]:
+        """
+        Returns chords similar to the query, best first.
+
+        Args:
+            query (str): The (possibly invalid or partial) chord symbol.
+            max_suggestions (int, optional): Maximum number of suggestions to return. Defaults to 5.
+            max_distance (int, optional): Largest edit distance considered, capped at the
+                index's max_distance. Defaults to 1 for queries of up to three characters and
+                2 otherwise.
+
+        Returns:
+            List[str]: Suggested chord symbols ranked by similarity, then corpus frequency.
+        """
+        query = query.strip().lower()
+        if not query or max_suggestions <= 0:
+            return []
+
+        if max_distance is None:
+            max_distance = 1 if len(query) <= 3 else 2
+        max_distance = min(max_distance, self.max_distance)
+
+        # Tiers: 0 exact match, 1 prefix completion, 1 + d for edit distance d
+        best = {chord: 1 for chord in self._prefix_matches(query)}
+
+        for distance, chord in self._edit_distance_matches(query, max_distance):
+            tier = 1 + distance if distance else 0
+            if tier < best.get(chord, tier + 1):
+                best[chord] = tier
+
+        ranked = sorted(best, key=lambda chord: (best[chord], *self._rank_key(chord)))
+
+        return ranked[:max_suggestions]
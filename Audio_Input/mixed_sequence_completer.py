@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 import random
 
 from Audio_Input.chord_input_processor import ChordInputProcessor
@@ -12,21 +12,25 @@ class MixedSequenceCompleter:
     Attributes:
         processor (ChordInputProcessor): Processes chord data from the dataset.
         transition_map (dict): Maps each chord to possible next chords based on dataset transitions.
+        random_generator (RandomSequenceGenerator): Generates sequences when no start sequence is given.
 
     Methods:
         complete_sequence(start_sequence: List[str], target_length: int) -> List[str]:
             Extends the start_sequence to the target_length using learned transitions and random chords.
     """
 
-    def __init__(self, processor: ChordInputProcessor):
+    def __init__(self, processor: ChordInputProcessor, random_generator: Optional[RandomSequenceGenerator] = None):
         """
         Initializes the MixedSequenceCompleter.
 
         Args:
             processor (ChordInputProcessor): The processor containing chord sequences and available chords.
+            random_generator (Optional[RandomSequenceGenerator]): A generator already built on the same
+                processor, so its length index is shared. Defaults to building a new one.
         """
         self.processor = processor
         self.transition_map = self._build_transition_map()
+        self.random_generator = random_generator or RandomSequenceGenerator(processor)
 
     def _build_transition_map(self):
         """
@@ -60,7 +64,7 @@ class MixedSequenceCompleter:
             List[str]: The completed chord sequence of the specified length.
         """
         if not start_sequence:
-            return RandomSequenceGenerator(self.processor).get_random_sequence(target_length)
+            return self.random_generator.get_random_sequence(target_length)
 
         result = list(start_sequence)
 
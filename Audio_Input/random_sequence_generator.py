@@ -1,3 +1,4 @@
+import bisect
 import random
 from typing import List
 
@@ -34,6 +35,10 @@ class RandomSequenceGenerator:
         """
         self.processor = processor
 
+        # Sequences ordered by length, so those long enough for a request are a suffix
+        self._sequences_by_length = sorted(processor.chord_sequences, key=len)
+        self._sequence_lengths = [len(seq) for seq in self._sequences_by_length]
+
     def get_random_sequence(self, length: int) -> List[str]:
         """
         Returns a random chord sequence of the specified length.
@@ -55,15 +60,16 @@ class RandomSequenceGenerator:
         if length <= 0:
             raise ValueError("Length must be positive")
 
-        suitable_sequences = [seq for seq in self.processor.chord_sequences if len(seq) >= length]
+        first_suitable = bisect.bisect_left(self._sequence_lengths, length)
 
-        if not suitable_sequences:
+        if first_suitable == len(self._sequences_by_length):
             return self._concatenate_random_sequences(length)
 
-        chosen_sequence = random.choice(suitable_sequences)
+        chosen_sequence = self._sequences_by_length[random.randrange(first_suitable, len(self._sequences_by_length))]
 
         if len(chosen_sequence) == length:
-            return chosen_sequence
+            # Copy, since the corpus sequences are shared between controllers
+            return list(chosen_sequence)
 
         start_idx = random.randint(0, len(chosen_sequence) - length)
 
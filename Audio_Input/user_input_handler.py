@@ -1,6 +1,8 @@
 from typing import List, Tuple
 
 from Audio_Input.chord_input_processor import ChordInputProcessor
+from Audio_Input.chord_suggestion_index import ChordSuggestionIndex
+from Utils.chord_vocabulary import get_chord_vocabulary
 
 
 class UserInputHandler:
@@ -9,7 +11,9 @@ class UserInputHandler:
 
     Attributes:
         processor (ChordInputProcessor): Provides access to available chords from the dataset.
-        available_chords (set): Set of all valid chord symbols.
+        available_chords (set): Set of all valid (canonical) chord symbols.
+        vocabulary (ChordVocabulary): Interns chords so validation accepts any enharmonic spelling.
+        suggestion_index (ChordSuggestionIndex): Ranked fuzzy index over the available chords.
 
     Methods:
         validate_chord(chord: str) -> Tuple[bool, str]:
@@ -22,7 +26,7 @@ class UserInputHandler:
             Prompts the user for a chord sequence, validates input, and returns a list of valid chords.
 
         suggest_similar_chords(invalid_chord: str, max_suggestions: int = 5) -> List[str]:
-            Suggests similar chord symbols from the dataset for an invalid chord.
+            Suggests similar chord symbols from the dataset, ranked by similarity and frequency.
     """
 
     def __init__(self, processor: ChordInputProcessor):
@@ -34,11 +38,17 @@ class UserInputHandler:
         """
         self.processor = processor
         self.available_chords = set(processor.get_available_chords())
+        self.vocabulary = get_chord_vocabulary()
+        self._available_chord_ids = {self.vocabulary.encode(chord) for chord in self.available_chords}
+        self.suggestion_index = ChordSuggestionIndex(processor.get_chord_frequencies())
 
     def validate_chord(self, chord: str) -> Tuple[bool, str]:
         """
         Validates a single chord symbol.
 
+        Any enharmonic spelling of an available chord is valid ('C#min', 'Csmin' and 'Dbmin'
+        are the same chord).
+
         Args:
             chord (str): The chord symbol to validate.
 
@@ -49,7 +59,7 @@ class UserInputHandler:
         if not chord:
             return False, "Empty chord symbol"
 
-        if chord in self.available_chords:
+        if self.vocabulary.lookup(chord) in self._available_chord_ids:
             return True, "Valid chord"
         else:
             return False, f"Chord '{chord}' not found in dataset"
@@ -62,7 +72,8 @@ class UserInputHandler:
             user_input (str): The input string containing chord symbols.
 
         Returns:
-            Tuple[List[str], List[str]]: Lists of valid and invalid chord symbols.
+            Tuple[List[str], List[str]]: Lists of valid chords in their canonical spelling,
+                and of invalid chord symbols as entered.
         """
         cleaned_input = user_input.replace(",", " ")
         chord_symbols = [chord.strip() for chord in cleaned_input.split() if chord.strip()]
@@ -73,7 +84,7 @@ class UserInputHandler:
         for chord in chord_symbols:
             is_valid, _ = self.validate_chord(chord)
             if is_valid:
-                valid_chords.append(chord)
+                valid_chords.append(self.vocabulary.decode(self.vocabulary.lookup(chord)))
             else:
                 invalid_chords.append(chord)
 
@@ -99,7 +110,10 @@ class UserInputHandler:
 
             if invalid_chords:
                 print(f"Invalid chords found: {", ".join(invalid_chords)}")
-                print(f"Available chords include: {", ".join(sorted(list(self.available_chords))[:20])}...")
+                for chord in invalid_chords:
+                    suggestions = self.suggest_similar_chords(chord)
+                    if suggestions:
+                        print(f"  {chord}: did you mean {", ".join(suggestions)}?")
                 continue
 
             if valid_chords:
@@ -111,20 +125,14 @@ class UserInputHandler:
         """
         Suggests similar chord symbols for an invalid chord.
 
+        Prefix completions come first, then chords within a small edit distance, each group
+        ordered by how often the chord occurs in the dataset.
+
         Args:
             invalid_chord (str): The invalid chord symbol.
             max_suggestions (int, optional): Maximum number of suggestions to return.
 
         Returns:
-            List[str]: List of suggested similar chord symbols.
+            List[str]: List of suggested similar chord symbols, best first.
         """
-        invalid_lower = invalid_chord.lower()
-        suggestions = []
-
-        for chord in self.available_chords:
-            if invalid_lower in chord.lower() or chord.lower().startswith(invalid_lower):
-                suggestions.append(chord)
-                if len(suggestions) >= max_suggestions:
-                    break
-
-        return suggestions
+        return self.suggestion_index.suggest(invalid_chord, max_suggestions)
@@ -0,0 +1,116 @@
+import time
+import tracemalloc
+
+import numpy as np
+
+from Markov_Chains.ngram_matrix_loader import NGramMatrixLoader
+
+
+def benchmark_context_trie(genre, max_order=None, lookups=2000, seed=0):
+    """
+    Benchmarks memory and back-off lookup time of the context trie against the per-order matrices.
+
+    For every loaded order, reports the number of contexts, the memory of the order's CSR
+    matrix plus its chord-id index, the share of the context trie attributed to the order,
+    and the mean time to sample the next chord for contexts of that order, once by looking
+    the context up in the order's matrix and once through the trie.
+
+    Args:
+        genre (str): The genre whose built models are benchmarked.
+        max_order (int, optional): Highest order to load. Defaults to every built order.
+        lookups (int, optional): Number of contexts sampled per order. Defaults to 2000.
+        seed (int, optional): Seed of the context sample. Defaults to 0.
+
+    Returns:
+        dict: {order: stats} where stats holds 'contexts', 'matrix_bytes', 'trie_bytes',
+            'matrix_lookup_us' and 'trie_lookup_us'; plus a 'trie_build_seconds' entry.
+    """
+    rng = np.random.default_rng(seed)
+    loader = NGramMatrixLoader(genre, max_order=max_order)
+    orders = [n for n, matrix in sorted(loader.matrices.items()) if matrix is not None]
+
+    results = {}
+
+    for n in orders:
+        matrix = loader.matrices[n].tocsr()
+
+        # The chord-id index is built lazily, so its memory is measured while it is built
+        tracemalloc.start()
+        id_index = loader.get_id_index(n)
+        index_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        results[n] = {
+            "contexts": int(np.count_nonzero(np.diff(matrix.indptr))),
+            "matrix_bytes": matrix.indptr.nbytes + matrix.indices.nbytes + matrix.data.nbytes + index_bytes,
+            "id_index": id_index,
+            "matrix": matrix
+        }
+
+    start = time.perf_counter()
+    trie = loader.get_context_trie()
+    trie_build_seconds = time.perf_counter() - start
+    trie_bytes = trie.nbytes_by_order()
+
+    for n in orders:
+        stats = results[n]
+        id_index, matrix = stats.pop("id_index"), stats.pop("matrix")
+
+        # Contexts of the order that have transitions, sampled with replacement
+        contexts = [
+            list(ngram_ids) if isinstance(ngram_ids, tuple) else [ngram_ids]
+            for ngram_ids, idx in id_index["ngram_to_idx"].items() if matrix.indptr[idx] < matrix.indptr[idx + 1]
+        ]
+        if not contexts:
+            continue
+        sample = [contexts[i] for i in rng.integers(len(contexts), size=lookups)]
+
+        start = time.perf_counter()
+        for context in sample:
+            _sample_from_matrix(matrix, id_index, context)
+        matrix_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for context in sample:
+            trie.sample_next_chord(context, n)
+        trie_seconds = time.perf_counter() - start
+
+        stats["trie_bytes"] = trie_bytes.get(n, 0)
+        stats["matrix_lookup_us"] = matrix_seconds / lookups * 1e6
+        stats["trie_lookup_us"] = trie_seconds / lookups * 1e6
+
+    results["trie_build_seconds"] = trie_build_seconds
+
+    print(f"Context trie benchmark for {genre} (orders {orders}, {lookups} lookups per order)")
+    print(f"{'order':>5} | {'contexts':>9} | {'matrix + index':>14} | {'trie share':>10} | "
+          f"{'matrix lookup':>13} | {'trie lookup':>11}")
+    for n in orders:
+        stats = results[n]
+        if "trie_bytes" not in stats:
+            continue
+        print(f"{n:>5} | {stats['contexts']:>9} | {stats['matrix_bytes'] / 1024:>11.1f} KB | "
+              f"{stats['trie_bytes'] / 1024:>7.1f} KB | {stats['matrix_lookup_us']:>10.1f} us | "
+              f"{stats['trie_lookup_us']:>8.1f} us")
+    print(f"Trie: {trie.num_nodes} nodes, {trie.nbytes / 1024:.1f} KB, built in {trie_build_seconds:.2f} s")
+
+    return results
+
+
+def _sample_from_matrix(matrix, id_index, context):
+    """
+    Samples the next chord id for a context from one order's matrix, as the generator did
+    before the context trie: index lookup, dense row extraction and weighted choice.
+    """
+    idx = id_index["ngram_to_idx"].get(tuple(context) if len(context) > 1 else context[0])
+
+    if idx is None:
+        return None
+
+    row = matrix.getrow(idx).toarray().flatten()
+    next_idx = np.random.choice(np.arange(len(row)), p=row / row.sum())
+
+    return int(id_index["next_chord_ids"][next_idx])
+
+
+if __name__ == "__main__":
+    benchmark_context_trie("rock")
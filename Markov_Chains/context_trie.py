@@ -0,0 +1,231 @@
+from bisect import bisect_left
+
+import numpy as np
+
+
+class ContextTrie:
+    """
+    Shared trie over the contexts of every n-gram order, with per-node successor arrays.
+
+    Contexts are inserted most recent chord first, so the context of order n is the node at
+    depth n on the path of its reversed chords, and all orders share their common suffixes.
+    The longest context with transitions, i.e. the back-off result, is found in one walk
+    from the root along the most recent chords.
+
+    The trie is stored in flat arrays. Nodes are numbered by depth and then by path, which
+    puts the children of every node in one contiguous run of node ids, sorted by chord:
+
+    - child_offsets[i]:child_offsets[i + 1] are the positions of node i's children, and
+      child_chords[p] is the chord leading to node p + 1.
+    - successor_offsets[i]:successor_offsets[i + 1] are node i's successors, with their
+      chord ids in successor_chords and their cumulative probabilities in
+      successor_cumulative (the last value is the row total).
+
+    Memory therefore grows with the observed contexts and transitions, not with the square
+    of the number of n-gram states.
+
+    Attributes:
+        max_order (int): The deepest context stored.
+        num_nodes (int): Number of nodes, including the root.
+        depths (numpy.ndarray): Depth (context order) of every node.
+
+    Methods:
+        from_ngram_models(ngram_models):
+            Builds the trie from per-order transition matrices and chord-id mappings.
+
+        find_longest_context(context_ids, max_order=None):
+            Returns the successors of the longest stored context that ends the given chords.
+
+        sample_next_chord(context_ids, max_order=None, rng=None):
+            Draws the next chord id from the longest matching context.
+
+        nbytes_by_order():
+            Returns the array memory attributed to each order's contexts.
+    """
+
+    def __init__(self, child_offsets, child_chords, successor_offsets, successor_chords, successor_cumulative,
+                 depths):
+        """
+        Initializes the ContextTrie from its flat arrays (see the class docstring).
+
+        Args:
+            child_offsets (numpy.ndarray): Start of every node's children, plus the end.
+            child_chords (numpy.ndarray): Chord id leading to each non-root node.
+            successor_offsets (numpy.ndarray): Start of every node's successors, plus the end.
+            successor_chords (numpy.ndarray): Successor chord ids.
+            successor_cumulative (numpy.ndarray): Cumulative successor probabilities per node.
+            depths (numpy.ndarray): Depth of every node.
+        """
+        self.child_offsets = child_offsets
+        self.child_chords = child_chords
+        self.successor_offsets = successor_offsets
+        self.successor_chords = successor_chords
+        self.successor_cumulative = successor_cumulative
+        self.depths = depths
+        self.num_nodes = len(depths)
+        self.max_order = int(depths.max()) if len(depths) else 0
+
+    @classmethod
+    def from_ngram_models(cls, ngram_models):
+        """
+        Builds the trie from per-order transition matrices and chord-id mappings.
+
+        Args:
+            ngram_models (iterable): (n, ngram_to_idx, next_chord_ids, matrix) per order, where
+                ngram_to_idx maps chord-id contexts (an id for n=1, a tuple of ids otherwise)
+                to matrix rows, next_chord_ids maps matrix columns to the chord they add, and
+                matrix is the sparse row-stochastic transition matrix.
+
+        Returns:
+            ContextTrie: The trie over every context with at least one transition.
+        """
+        context_successors = {}
+
+        for n, ngram_to_idx, next_chord_ids, matrix in ngram_models:
+            matrix = matrix.tocsr()
+            indptr, indices, data = matrix.indptr, matrix.indices, matrix.data
+
+            for ngram_ids, idx in ngram_to_idx.items():
+                start, end = indptr[idx], indptr[idx + 1]
+
+                if start == end or data[start:end].sum() <= 0:
+                    continue
+
+                context = ngram_ids if isinstance(ngram_ids, tuple) else (ngram_ids,)
+                context_successors[context[::-1]] = (next_chord_ids[indices[start:end]], data[start:end])
+
+        # Every prefix of a reversed context is a node; ordering by (depth, path) keeps siblings together
+        paths = {()}
+        for path in context_successors:
+            paths.update(path[:depth] for depth in range(1, len(path)))
+        paths.update(context_successors)
+        paths = sorted(paths, key=lambda path: (len(path), path))
+
+        node_of = {path: node for node, path in enumerate(paths)}
+        parents = np.fromiter((node_of[path[:-1]] for path in paths[1:]), dtype=np.int64, count=len(paths) - 1)
+
+        child_offsets = np.zeros(len(paths) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(parents, minlength=len(paths)), out=child_offsets[1:])
+        child_chords = np.fromiter((path[-1] for path in paths[1:]), dtype=np.int32, count=len(paths) - 1)
+
+        successor_lengths = np.zeros(len(paths), dtype=np.int64)
+        successor_chords = []
+        successor_cumulative = []
+
+        for node, path in enumerate(paths):
+            successors = context_successors.get(path)
+            if successors is not None:
+                chords, probabilities = successors
+                successor_lengths[node] = len(chords)
+                successor_chords.append(chords)
+                successor_cumulative.append(np.cumsum(probabilities))
+
+        successor_offsets = np.zeros(len(paths) + 1, dtype=np.int64)
+        np.cumsum(successor_lengths, out=successor_offsets[1:])
+
+        return cls(
+            child_offsets,
+            child_chords,
+            successor_offsets,
+            np.concatenate(successor_chords).astype(np.int32) if successor_chords else np.empty(0, dtype=np.int32),
+            np.concatenate(successor_cumulative) if successor_cumulative else np.empty(0, dtype=np.float64),
+            np.fromiter((len(path) for path in paths), dtype=np.int32, count=len(paths))
+        )
+
+    def find_longest_context(self, context_ids, max_order=None):
+        """
+        Returns the successors of the longest stored context that ends the given chords.
+
+        This is the back-off of the n-gram model: the highest order whose context matches the
+        most recent chords and has transitions wins.
+
+        Args:
+            context_ids (list): Chord ids, most recent last.
+            max_order (int, optional): Longest context to consider. Defaults to the trie depth.
+
+        Returns:
+            tuple or None: (order, successor_chords, successor_cumulative), or None if not even
+                the last chord has transitions.
+        """
+        max_order = self.max_order if max_order is None else min(max_order, self.max_order)
+        child_offsets, child_chords, successor_offsets = self.child_offsets, self.child_chords, self.successor_offsets
+
+        node = 0
+        best = None
+
+        for depth in range(1, min(max_order, len(context_ids)) + 1):
+            chord = context_ids[-depth]
+            high = int(child_offsets[node + 1])
+
+            # Binary search among the sorted children of the node
+            position = bisect_left(child_chords, chord, int(child_offsets[node]), high)
+
+            if position == high or child_chords[position] != chord:
+                break
+
+            node = position + 1
+
+            if successor_offsets[node] < successor_offsets[node + 1]:
+                best = node
+
+        if best is None:
+            return None
+
+        start, end = successor_offsets[best], successor_offsets[best + 1]
+        return int(self.depths[best]), self.successor_chords[start:end], self.successor_cumulative[start:end]
+
+    def sample_next_chord(self, context_ids, max_order=None, rng=None):
+        """
+        Draws the next chord id from the longest matching context.
+
+        Args:
+            context_ids (list): Chord ids, most recent last.
+            max_order (int, optional): Longest context to consider. Defaults to the trie depth.
+            rng (numpy.random.Generator, optional): Source of randomness. Defaults to the global
+                numpy random state.
+
+        Returns:
+            int or None: The sampled chord id, or None if no context matches.
+        """
+        match = self.find_longest_context(context_ids, max_order)
+
+        if match is None:
+            return None
+
+        _, chords, cumulative = match
+        draw = (rng.random() if rng is not None else np.random.random()) * cumulative[-1]
+
+        return int(chords[min(np.searchsorted(cumulative, draw, side="right"), len(chords) - 1)])
+
+    def nbytes_by_order(self):
+        """
+        Returns the array memory attributed to each order's contexts.
+
+        Every node is charged its child entry and offsets, and its successor arrays, so the
+        values add up to the memory of the whole trie (the root is charged to order 0).
+
+        Returns:
+            dict: {order: bytes}.
+        """
+        successor_counts = np.diff(self.successor_offsets)
+        per_node = (
+            self.child_offsets.itemsize + self.successor_offsets.itemsize + self.depths.itemsize
+            + self.child_chords.itemsize
+            + successor_counts * (self.successor_chords.itemsize + self.successor_cumulative.itemsize)
+        )
+        per_node[0] -= self.child_chords.itemsize
+
+        totals = np.bincount(self.depths, weights=per_node)
+        totals[0] += self.child_offsets.itemsize + self.successor_offsets.itemsize
+
+        return {order: int(total) for order, total in enumerate(totals)}
+
+    @property
+    def nbytes(self):
+        """
+        Returns the memory of the trie's arrays in bytes.
+        """
+        return sum(
+            array.nbytes for array in (self.child_offsets, self.child_chords, self.successor_offsets,
+                                       self.successor_chords, self.successor_cumulative, self.depths)
+        )
@@ -1,32 +1,46 @@
 import numpy as np
 
+from Utils.key_relative_chords import from_key_relative_tokens, get_chord_root, to_key_relative_tokens
+
 
 class MarkovChainSequenceGenerator:
     """
     Generates chord sequences using a Markov chain model with variable-length n-gram context.
 
+    Generation works on canonical chord ids from the loader's vocabulary; chord strings are
+    only encoded on input and decoded on output. With key-relative models, the input is
+    translated to key-relative tokens and the result is transposed back to the key of the
+    input's first chord.
+
     Attributes:
         ngram_loader: An object that provides n-gram transition matrices and mappings.
+        max_order (int or None): Longest context used for prediction; None uses every loaded order.
 
     Methods:
         generate_sequence(input_sequence, target_length=8):
             Generates a chord sequence of the specified target length, starting from the input_sequence.
-            Uses up to 4-gram context for predicting the next chord. If no prediction is possible,
-            selects a random chord from the unigram mapping.
+            Uses the longest matching context of any loaded order for predicting the next chord. If no
+            prediction is possible, selects a random chord from the unigram mapping.
 
-        _get_next_chord(window):
-            Attempts to predict the next chord using n-gram transition matrices, starting from 4-gram down to unigram.
-            Returns the predicted chord or None if no prediction is possible.
+        _get_next_chord(sequence):
+            Attempts to predict the next chord from the most recent chords, backing off from the highest
+            order down to unigram. Returns the predicted chord id or None if no prediction is possible.
+
+        _get_random_chord():
+            Returns the id of a uniformly random chord from the unigram mapping.
     """
 
-    def __init__(self, ngram_loader):
+    def __init__(self, ngram_loader, max_order=None):
         """
         Initializes the MarkovChainSequenceGenerator.
 
         Args:
             ngram_loader: An object that provides n-gram transition matrices and mappings.
+            max_order (int, optional): Longest context used for prediction. Defaults to every
+                loaded order.
         """
         self.ngram_loader = ngram_loader
+        self.max_order = max_order
 
     def generate_sequence(self, input_sequence, target_length=8):
         """
@@ -37,63 +51,55 @@ class MarkovChainSequenceGenerator:
             target_length (int, optional): Desired length of the output sequence. Defaults to 8.
 
         Returns:
-            list: Generated chord sequence of the specified length.
+            list: Generated chord sequence of the specified length, in canonical chord spelling.
         """
-        sequence = list(input_sequence)
-        window_start = 0
+        vocabulary = self.ngram_loader.vocabulary
+        key_relative = self.ngram_loader.key_relative
+
+        if key_relative:
+            # Generate in the key of the first recognized input chord, C if there is none
+            root = next((r for r in map(get_chord_root, input_sequence) if r is not None), 0)
+            sequence = vocabulary.encode_sequence(to_key_relative_tokens(input_sequence))
+        else:
+            sequence = vocabulary.encode_sequence(input_sequence)
 
         while len(sequence) < target_length:
-            window = sequence[window_start:window_start + 4]
-            next_chord = self._get_next_chord(window)
+            next_chord = self._get_next_chord(sequence)
 
             if next_chord is None:
                 # Fallback: choose a random chord from the unigram mapping
-                _, mapping_1 = self.ngram_loader.get_matrix_and_mapping(1)
-                idx_to_chord = mapping_1.get("idx_to_ngram", {})
-                next_chord = idx_to_chord[np.random.choice(list(idx_to_chord.keys()))]
-            else:
-                pass
+                next_chord = self._get_random_chord()
 
             sequence.append(next_chord)
-            window_start += 1
 
-        return sequence[-target_length:]
+        if key_relative:
+            return from_key_relative_tokens(vocabulary.decode_sequence(sequence), root)[-target_length:]
 
-    def _get_next_chord(self, window):
+        return vocabulary.decode_sequence(sequence[-target_length:])
+
+    def _get_next_chord(self, sequence):
         """
-        Predicts the next chord using n-gram transition matrices.
+        Predicts the next chord from the most recent chords of the sequence.
+
+        The context trie of the loader finds the longest context of any order that ends the
+        sequence and has transitions, which is the back-off from the highest order down to
+        the unigram model in a single lookup.
 
         Args:
-            window (list): The current context window of chords (up to 4).
+            sequence (list): The chord ids generated so far, most recent last.
 
         Returns:
-            str or None: The predicted next chord, or None if no prediction is possible.
+            int or None: The predicted next chord id, or None if no prediction is possible.
         """
-        for n in range(4, 0, -1):
-            if len(window) < n:
-                continue
-
-            context = tuple(window[:n]) if n > 1 else window[0]
-            matrix, mapping = self.ngram_loader.get_matrix_and_mapping(n)
-
-            if matrix is None or mapping is None:
-                continue
+        return self.ngram_loader.get_context_trie().sample_next_chord(sequence, self.max_order)
 
-            ngram_to_idx = mapping.get("ngram_to_idx", {})
-            idx_to_ngram = mapping.get("idx_to_ngram", {})
-            idx = ngram_to_idx.get(context)
-
-            if idx is None:
-                continue
-
-            row = matrix.getrow(idx).toarray().flatten()
-
-            if np.sum(row) == 0:
-                continue
-
-            next_idx = np.random.choice(np.arange(len(row)), p=row/row.sum())
-            next_ngram = idx_to_ngram[next_idx]
+    def _get_random_chord(self):
+        """
+        Picks a uniformly random chord from the unigram mapping.
 
-            return next_ngram[-1] if isinstance(next_ngram, tuple) else next_ngram
+        Returns:
+            int: The id of the chosen chord.
+        """
+        id_index = self.ngram_loader.get_id_index(1)
 
-        return None
+        return int(np.random.choice(id_index["next_chord_ids"]))
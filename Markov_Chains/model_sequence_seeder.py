@@ -0,0 +1,152 @@
+from typing import List
+
+import numpy as np
+
+from Audio_Input.chord_suggestion_index import ChordSuggestionIndex
+from Markov_Chains.markov_chain_sequence_generator import MarkovChainSequenceGenerator
+from Utils.chord_vocabulary import canonicalize_chord
+from Utils.key_relative_chords import from_key_relative_tokens, get_chord_root
+
+
+class ModelSequenceSeeder:
+    """
+    Prepares the initial chord sequence from the loaded n-gram model alone.
+
+    Counterpart of ChordSequenceController that needs no dataset: chords are validated against
+    the 1-gram vocabulary of the model, an empty sequence is seeded from the model's
+    start-state distribution, and short sequences are completed with the Markov chain itself.
+    Key-relative models accept any chord with a root, and their seeds (opening chords
+    transposed to C) are moved to a random key.
+
+    Attributes:
+        ngram_loader (NGramMatrixLoader): The loaded n-gram matrices and mappings.
+        generator (MarkovChainSequenceGenerator): Extends seeds to the requested length.
+        sequence (List[str]): Initial chord sequence provided by the user.
+        sequence_length (int): Desired length of the chord sequence.
+
+    Methods:
+        get_sequence() -> List[str]:
+            Returns a valid chord sequence of the specified length.
+            If no sequence is provided, seeds one from the start-state distribution.
+            Validates user input and completes the sequence if necessary.
+    """
+
+    def __init__(self, ngram_loader, sequence: List[str], sequence_length: int):
+        """
+        Initializes the ModelSequenceSeeder.
+
+        Args:
+            ngram_loader (NGramMatrixLoader): The loaded n-gram matrices and mappings.
+            sequence (List[str]): Initial chord sequence.
+            sequence_length (int): Desired length of the chord sequence.
+        """
+        self.ngram_loader = ngram_loader
+        self.generator = MarkovChainSequenceGenerator(ngram_loader)
+        self.sequence = sequence
+        self.sequence_length = sequence_length
+        self._suggestion_index = None
+
+    def get_sequence(self) -> List[str]:
+        """
+        Returns a valid chord sequence of the specified length.
+
+        If the initial sequence is empty and a length is specified, draws the opening chord
+        from the start-state distribution and extends it with the Markov chain.
+        Validates the provided sequence against the model vocabulary and raises an error if
+        invalid chords are found. If the sequence is shorter than the desired length, completes
+        it with the Markov chain.
+
+        Returns:
+            List[str]: Validated and completed chord sequence, in canonical chord spelling.
+
+        Raises:
+            ValueError: If the model has no 1-gram matrix, or invalid chords are found in the
+                input sequence. The message lists the closest suggestions for each invalid chord.
+        """
+        id_index = self.ngram_loader.get_id_index(1)
+
+        if id_index is None:
+            raise ValueError(f"No 1-gram model available for genre '{self.ngram_loader.genre}'")
+
+        vocabulary = self.ngram_loader.vocabulary
+
+        if len(self.sequence) == 0 and self.sequence_length > 0:
+            chord_ids, probabilities = self.ngram_loader.get_start_distribution()
+            opening_chord = vocabulary.decode(int(np.random.choice(chord_ids, p=probabilities)))
+
+            if self.ngram_loader.key_relative:
+                opening_chord = from_key_relative_tokens([opening_chord], int(np.random.randint(12)))[0]
+
+            return self.generator.generate_sequence([opening_chord], self.sequence_length)
+
+        known_chord_ids = id_index["ngram_to_idx"]
+        valid_chords = []
+        invalid_chords = []
+
+        for chord in self.sequence:
+            if self.ngram_loader.key_relative:
+                # Every transposition is covered, so any chord with a root is valid
+                if get_chord_root(chord) is not None:
+                    valid_chords.append(canonicalize_chord(chord))
+                else:
+                    invalid_chords.append(chord)
+                continue
+
+            chord_id = vocabulary.lookup(chord)
+            if chord_id is not None and chord_id in known_chord_ids:
+                valid_chords.append(vocabulary.decode(chord_id))
+            else:
+                invalid_chords.append(chord)
+
+        if invalid_chords:
+            raise ValueError(f"Invalid chords: {", ".join(self._describe_invalid_chord(c) for c in invalid_chords)}")
+
+        if len(self.sequence) >= self.sequence_length:
+            return valid_chords[:self.sequence_length]
+
+        return self.generator.generate_sequence(valid_chords, self.sequence_length)
+
+    def _describe_invalid_chord(self, chord: str) -> str:
+        """
+        Formats an invalid chord together with its closest suggestions from the model vocabulary.
+
+        Args:
+            chord (str): The invalid chord symbol.
+
+        Returns:
+            str: The chord, followed by "(did you mean ...?)" when suggestions exist.
+        """
+        # The vocabulary of key-relative models holds tokens, not chords to suggest
+        if self.ngram_loader.key_relative:
+            return chord
+
+        if self._suggestion_index is None:
+            self._suggestion_index = self._build_suggestion_index()
+
+        suggestions = self._suggestion_index.suggest(chord)
+
+        if not suggestions:
+            return chord
+
+        return f"{chord} (did you mean {" / ".join(suggestions)}?)"
+
+    def _build_suggestion_index(self) -> ChordSuggestionIndex:
+        """
+        Builds a suggestion index over the 1-gram vocabulary of the model.
+
+        Chords are ranked by the number of distinct chords leading into them, the closest
+        stand-in for corpus frequency that the model keeps.
+
+        Returns:
+            ChordSuggestionIndex: Index over the canonical model chords.
+        """
+        matrix, _ = self.ngram_loader.get_matrix_and_mapping(1)
+        next_chord_ids = self.ngram_loader.get_id_index(1)["next_chord_ids"]
+        predecessor_counts = np.diff(matrix.tocsc().indptr)
+
+        frequencies = {}
+        for column, chord_id in enumerate(next_chord_ids):
+            chord = self.ngram_loader.vocabulary.decode(int(chord_id))
+            frequencies[chord] = frequencies.get(chord, 0) + int(predecessor_counts[column])
+
+        return ChordSuggestionIndex(frequencies)
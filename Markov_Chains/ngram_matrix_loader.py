@@ -1,8 +1,16 @@
 import os
 import pickle
+import numpy as np
 from scipy.sparse import load_npz
 
-from Utils.path_constants import MATRICES_1_GRAM_PATH, MATRICES_2_GRAM_PATH, MATRICES_3_GRAM_PATH, MATRICES_4_GRAM_PATH
+from Markov_Chains.context_trie import ContextTrie
+from Transition_Matrices.Matrix_Builder.derive_transition_matrix_from_counts import derive_transition_matrix_from_counts
+from Transition_Matrices.Matrix_Updater.is_model_files_pair import is_model_files_pair
+from Transition_Matrices.Matrix_Updater.load_transition_counts import load_transition_counts
+from Utils.chord_vocabulary import get_chord_vocabulary
+from Utils.key_relative_chords import get_key_relative_vocabulary
+from Utils.ngram_matrices_paths import get_ngram_matrices_path, list_ngram_orders
+from Utils.path_constants import KEY_RELATIVE_MATRICES_PATH
 
 
 class NGramMatrixLoader:
@@ -11,47 +19,111 @@ class NGramMatrixLoader:
 
     Attributes:
         genre (str): The genre for which matrices and mappings are loaded.
-        ngram_paths (dict): Maps n-gram order (1-4) to their respective directory paths.
+        ngram_paths (dict): Maps every built n-gram order (up to max_order) to its directory path.
+        max_order (int): The highest order with a loaded matrix, 0 if none was found.
         matrices (dict): Stores loaded transition matrices for each n-gram order.
         mappings (dict): Stores loaded n-gram mappings for each n-gram order.
+        vocabulary (ChordVocabulary): Interns the chords of the loaded mappings as integer ids; the
+            key-relative models use their own vocabulary (see get_key_relative_vocabulary).
+        from_counts (bool): Whether matrices are derived from the count tables at load time.
+        min_count (int or None): Filtering threshold used when deriving from counts.
+        smoothing (float or None): Additive smoothing used when deriving from counts.
+        key_relative (bool): Whether the models are over key-relative tokens (see to_key_relative_tokens).
 
     Methods:
         get_matrix_and_mapping(n):
             Returns the transition matrix and mapping for the specified n-gram order.
+
+        get_id_index(n):
+            Returns the chord-id view of the mapping for the specified n-gram order.
+
+        get_start_distribution():
+            Returns the distribution of opening chords used to seed generation.
+
+        get_context_trie():
+            Returns the context trie shared by all loaded orders, used for back-off lookups.
+            Building it releases the matrices and mappings of the orders above 1.
     """
 
-    def __init__(self, genre):
+    def __init__(self, genre, from_counts=False, min_count=None, smoothing=None, max_order=None, matrices_path=None,
+                 key_relative=False):
         """
         Initializes the NGramMatrixLoader for a specific genre.
 
         Args:
             genre (str): The genre to load matrices and mappings for.
+            from_counts (bool, optional): If True, each order is normalized at load time from its
+                count table, so one stored count file serves every filtering and smoothing
+                variant. Orders without a count table fall back to the saved model. Defaults to False.
+            min_count (int, optional): Filtering threshold when deriving from counts. Defaults to
+                the threshold stored in each count table.
+            smoothing (float, optional): Additive smoothing when deriving from counts. Defaults to
+                the value stored in each count table.
+            max_order (int, optional): Highest order to load. Defaults to every built order.
+            matrices_path (str, optional): Root of a model variant with one Matrices_{n}_Gram
+                directory per order, e.g. a pruned copy. Defaults to the built models, or to
+                KEY_RELATIVE_MATRICES_PATH with key_relative.
+            key_relative (bool, optional): If True, loads the transposition-invariant models built
+                with generate_ngram_transition_matrices(key_relative=True). Their states are
+                key-relative tokens; the sequence generator translates chords in and out.
+                Defaults to False.
         """
         self.genre = genre
+        self.key_relative = key_relative
+        if key_relative and matrices_path is None:
+            matrices_path = KEY_RELATIVE_MATRICES_PATH
         self.ngram_paths = {
-            1: MATRICES_1_GRAM_PATH,
-            2: MATRICES_2_GRAM_PATH,
-            3: MATRICES_3_GRAM_PATH,
-            4: MATRICES_4_GRAM_PATH
+            n: get_ngram_matrices_path(n, matrices_path)
+            for n in list_ngram_orders(matrices_path) if max_order is None or n <= max_order
         }
+        self.from_counts = from_counts
+        self.min_count = min_count
+        self.smoothing = smoothing
         self.matrices = {}
         self.mappings = {}
+        self.vocabulary = get_key_relative_vocabulary() if key_relative else get_chord_vocabulary()
+        self._id_indexes = {}
+        self._start_distribution = None
+        self._context_trie = None
         self._load_all_matrices()
+        self.max_order = max((n for n, matrix in self.matrices.items() if matrix is not None), default=0)
 
     def _load_all_matrices(self):
         """
         Loads all available n-gram transition matrices and mappings for the specified genre.
-        If a matrix or mapping file does not exist, sets the corresponding entry to None.
+        With from_counts, matrices are derived from the count tables where one exists.
+        If a matrix or mapping file does not exist, or the mappings record the hash of a different
+        matrix file (see write_model_files_atomically), sets the corresponding entry to None.
         """
-        for n in range(1, 5):
-            matrices_path = self.ngram_paths[n]
+        for n, matrices_path in self.ngram_paths.items():
             matrix_file = os.path.join(matrices_path, f"transition_matrix_{self.genre}.npz")
             mappings_file = os.path.join(matrices_path, f"ngram_mappings_{self.genre}.pkl")
 
-            if os.path.exists(matrix_file) and os.path.exists(mappings_file):
-                self.matrices[n] = load_npz(matrix_file)
+            count_table = load_transition_counts(matrices_path, self.genre) if self.from_counts else None
+
+            if count_table is not None:
+                matrix, ngram_to_idx, idx_to_ngram = derive_transition_matrix_from_counts(
+                    count_table, self.min_count, self.smoothing
+                )
+                self.matrices[n] = matrix
+                self.mappings[n] = {
+                    "ngram_to_idx": ngram_to_idx,
+                    "idx_to_ngram": idx_to_ngram,
+                    "start_counts": count_table["start_counts"],
+                    "n": n
+                }
+            elif os.path.exists(matrix_file) and os.path.exists(mappings_file):
                 with open(mappings_file, "rb") as f:
-                    self.mappings[n] = pickle.load(f)
+                    mappings = pickle.load(f)
+
+                if is_model_files_pair(matrix_file, mappings):
+                    self.matrices[n] = load_npz(matrix_file)
+                    self.mappings[n] = mappings
+                else:
+                    print(f"✗ {self.genre} {n}-gram matrix and mappings are from different writes; "
+                          "skipping the order")
+                    self.matrices[n] = None
+                    self.mappings[n] = None
             else:
                 self.matrices[n] = None
                 self.mappings[n] = None
@@ -61,9 +133,158 @@ class NGramMatrixLoader:
         Retrieves the transition matrix and mapping for the specified n-gram order.
 
         Args:
-            n (int): The n-gram order (1, 2, 3, or 4).
+            n (int): The n-gram order.
 
         Returns:
             tuple: (matrix, mapping) for the given n-gram order, or (None, None) if not available.
         """
         return self.matrices.get(n), self.mappings.get(n)
+
+    def get_id_index(self, n):
+        """
+        Retrieves the chord-id view of the mapping for the specified n-gram order.
+
+        The view is built on first use. N-grams are keyed by canonical chord ids, so any
+        enharmonic spelling of a context finds its row. If an older artifact stores several
+        spellings of the same n-gram, the first one in index order is used.
+
+        Args:
+            n (int): The n-gram order.
+
+        Returns:
+            dict or None: None if the order is not available, otherwise a dict with:
+                - 'ngram_to_idx': Mapping from chord-id n-grams (an id for n=1, a tuple of
+                  ids for n>1) to matrix indices.
+                - 'next_chord_ids': numpy array mapping each matrix column to the id of the
+                  last chord of its n-gram, i.e. the chord a transition into it adds.
+        """
+        if n not in self._id_indexes:
+            self._id_indexes[n] = self._build_id_index(n)
+
+        return self._id_indexes[n]
+
+    def _build_id_index(self, n):
+        """
+        Returns the chord-id view of an order's mapping (see get_id_index), building it without
+        caching it unless get_id_index already did.
+        """
+        if n in self._id_indexes:
+            return self._id_indexes[n]
+
+        mapping = self.mappings.get(n)
+
+        if mapping is None:
+            return None
+
+        idx_to_ngram = mapping.get("idx_to_ngram", {})
+        ngram_to_idx = {}
+        next_chord_ids = np.empty(len(idx_to_ngram), dtype=np.int64)
+
+        for idx in sorted(idx_to_ngram):
+            ngram_ids = self.vocabulary.encode_ngram(idx_to_ngram[idx])
+            ngram_to_idx.setdefault(ngram_ids, idx)
+            next_chord_ids[idx] = ngram_ids[-1] if isinstance(ngram_ids, tuple) else ngram_ids
+
+        return {
+            "ngram_to_idx": ngram_to_idx,
+            "next_chord_ids": next_chord_ids
+        }
+
+    def get_start_distribution(self):
+        """
+        Retrieves the distribution of opening chords used to seed generation.
+
+        Uses the start-state counts recorded in the 1-gram mapping at build time. Artifacts
+        built without them fall back to the stationary distribution of the 1-gram chain,
+        estimated by power iteration. The result is computed on first use and cached.
+
+        Returns:
+            tuple or None: (chord_ids, probabilities) as numpy arrays, or None if no 1-gram
+                model is available.
+        """
+        if self._start_distribution is None:
+            matrix, mapping = self.get_matrix_and_mapping(1)
+
+            if matrix is None or mapping is None:
+                return None
+
+            start_counts = mapping.get("start_counts")
+
+            if start_counts:
+                # Merge enharmonic spellings by summing over canonical ids
+                weights_by_id = {}
+                for chord, count in start_counts.items():
+                    chord_id = self.vocabulary.encode(chord)
+                    weights_by_id[chord_id] = weights_by_id.get(chord_id, 0) + count
+
+                chord_ids = np.fromiter(weights_by_id.keys(), dtype=np.int64)
+                weights = np.fromiter(weights_by_id.values(), dtype=np.float64)
+            else:
+                chord_ids = self.get_id_index(1)["next_chord_ids"]
+                weights = self._stationary_distribution(matrix)
+
+            self._start_distribution = (chord_ids, weights / weights.sum())
+
+        return self._start_distribution
+
+    def get_context_trie(self):
+        """
+        Retrieves the context trie shared by all loaded orders, used for back-off lookups.
+
+        The trie holds every context with transitions, most recent chord first, so the longest
+        matching context of any order is found in a single walk. It is built on first use from
+        the loaded matrices and their chord-id mappings, and cached.
+
+        The trie holds everything generation needs from the orders above 1, so their matrices,
+        mappings and chord-id indexes are released once it is built, and memory grows with the
+        observed contexts only. The 1-gram model stays loaded for seeding and validation; the
+        other orders then read as not available.
+
+        Returns:
+            ContextTrie: The trie over the loaded orders.
+        """
+        if self._context_trie is None:
+            self._context_trie = ContextTrie.from_ngram_models(
+                (n, id_index["ngram_to_idx"], id_index["next_chord_ids"], matrix)
+                for n, matrix, id_index in (
+                    (n, matrix, self._build_id_index(n)) for n, matrix in sorted(self.matrices.items())
+                    if matrix is not None
+                )
+                if id_index is not None
+            )
+
+            for n in self.matrices:
+                if n > 1:
+                    self.matrices[n] = self.mappings[n] = self._id_indexes[n] = None
+
+        return self._context_trie
+
+    @staticmethod
+    def _stationary_distribution(matrix, iterations=50):
+        """
+        Estimates the stationary distribution of a transition matrix by power iteration.
+
+        Probability mass lost through rows without transitions is redistributed by
+        renormalizing after every step.
+
+        Args:
+            matrix: Row-stochastic transition matrix (sparse or dense).
+            iterations (int, optional): Number of power-iteration steps. Defaults to 50.
+
+        Returns:
+            numpy.ndarray: Probability of each state.
+        """
+        size = matrix.shape[0]
+        distribution = np.full(size, 1.0 / size)
+        transposed = matrix.T
+
+        for _ in range(iterations):
+            stepped = np.asarray(transposed @ distribution).ravel()
+            total = stepped.sum()
+
+            if total == 0:
+                break
+
+            distribution = stepped / total
+
+        return distribution
@@ -0,0 +1,236 @@
+import argparse
+import json
+import os
+import pickle
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+from scipy.sparse import load_npz
+
+from Markov_Chains.ngram_matrix_loader import NGramMatrixLoader
+from Utils.ngram_matrices_paths import get_ngram_matrices_path, list_ngram_orders
+
+# Parts of a loaded order, in report order
+MEMORY_PARTS = ("indptr", "indices", "data", "mapping_dicts", "key_objects", "index_objects", "other_mappings",
+                "id_index", "trie")
+
+
+def report_model_memory(genres=None, max_order=None, repeats=3):
+    """
+    Reports the memory a loaded NGramMatrixLoader holds and how long its models take to load.
+
+    For every genre and order, the memory is broken down into the CSR arrays (indptr, indices,
+    data), the two mapping dicts themselves, the objects they hold (the n-gram keys with their
+    chord strings, and the row index integers), the other mapping entries, the chord-id index
+    and the order's share of the context trie that the generator builds on first use. Objects
+    shared between the dicts, such as the n-gram tuples, are counted once. Building the trie
+    releases the matrices, mappings and chord-id indexes of the orders above 1, so an order's
+    total counts only the parts the loader still holds afterwards.
+
+    Load times are measured per order: cold after asking the operating system to drop the
+    files from its page cache (where posix_fadvise is available), and warm as the fastest of
+    `repeats` further loads. The whole loader is timed warm and its allocations traced, as a
+    check on the breakdown.
+
+    Args:
+        genres (list of str, optional): Genres to report. Defaults to every genre with a built model.
+        max_order (int, optional): Highest order to report. Defaults to every built order.
+        repeats (int, optional): Number of warm loads per order. Defaults to 3.
+
+    Returns:
+        dict: {genre: report} where report holds 'orders' ({n: stats} with the bytes of every
+            part in MEMORY_PARTS, 'released' (whether the trie replaced the order's other parts),
+            'total_bytes', 'file_bytes', 'cold_seconds' and 'warm_seconds'),
+            'total_bytes', 'loader_seconds', 'loader_traced_bytes' and 'held_traced_bytes' (traced
+            once the trie is built).
+
+    Raises:
+        ValueError: If `repeats` is below 1.
+    """
+    if repeats < 1:
+        raise ValueError("repeats must be at least 1")
+
+    orders = [n for n in list_ngram_orders() if max_order is None or n <= max_order]
+
+    if genres is None:
+        genres = sorted({
+            filename[len("transition_matrix_"):-len(".npz")]
+            for n in orders for filename in os.listdir(get_ngram_matrices_path(n))
+            if filename.startswith("transition_matrix_") and filename.endswith(".npz")
+        })
+
+    reports = {}
+
+    for genre in genres:
+        order_stats = {}
+
+        for n in orders:
+            files = [
+                os.path.join(get_ngram_matrices_path(n), file_name)
+                for file_name in (f"transition_matrix_{genre}.npz", f"ngram_mappings_{genre}.pkl")
+            ]
+            if not all(os.path.exists(path) for path in files):
+                continue
+
+            _drop_from_page_cache(files)
+            start = time.perf_counter()
+            matrix, mappings = _load_order(files)
+            cold_seconds = time.perf_counter() - start
+
+            warm_seconds = float("inf")
+            for _ in range(repeats):
+                start = time.perf_counter()
+                _load_order(files)
+                warm_seconds = min(warm_seconds, time.perf_counter() - start)
+
+            stats = {"indptr": matrix.indptr.nbytes, "indices": matrix.indices.nbytes, "data": matrix.data.nbytes}
+            stats.update(_get_mapping_sizes(mappings))
+            stats.update(file_bytes=sum(os.path.getsize(path) for path in files), cold_seconds=cold_seconds,
+                         warm_seconds=warm_seconds)
+            order_stats[n] = stats
+
+        if not order_stats:
+            print(f"✗ No built models found for {genre}")
+            continue
+
+        # The whole loader, timed warm and traced, then its lazily built indexes
+        tracemalloc.start()
+        start = time.perf_counter()
+        loader = NGramMatrixLoader(genre, max_order=max_order)
+        loader_seconds = time.perf_counter() - start
+        loader_traced_bytes = tracemalloc.get_traced_memory()[0]
+
+        for n, stats in order_stats.items():
+            before = tracemalloc.get_traced_memory()[0]
+            loader.get_id_index(n)
+            stats["id_index"] = tracemalloc.get_traced_memory()[0] - before
+
+        # What the loader still holds once the trie has replaced the higher orders
+        trie_bytes = loader.get_context_trie().nbytes_by_order()
+        held_traced_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        for n, stats in order_stats.items():
+            stats["trie"] = trie_bytes.get(n, 0)
+            stats["released"] = loader.get_matrix_and_mapping(n)[1] is None
+            stats["total_bytes"] = stats["trie"] if stats["released"] else sum(stats[part] for part in MEMORY_PARTS)
+
+        reports[genre] = {
+            "orders": order_stats,
+            "total_bytes": sum(stats["total_bytes"] for stats in order_stats.values()),
+            "loader_seconds": loader_seconds,
+            "loader_traced_bytes": loader_traced_bytes,
+            "held_traced_bytes": held_traced_bytes
+        }
+
+        _print_genre_report(genre, reports[genre])
+
+    return reports
+
+
+def _load_order(files):
+    """
+    Loads one order's matrix and mappings the way NGramMatrixLoader does.
+    """
+    matrix_file, mappings_file = files
+    matrix = load_npz(matrix_file).tocsr()
+
+    with open(mappings_file, "rb") as f:
+        mappings = pickle.load(f)
+
+    return matrix, mappings
+
+
+def _drop_from_page_cache(files):
+    """
+    Asks the operating system to evict the files from its page cache, so the next read is cold.
+
+    Only clean pages are dropped; where posix_fadvise is unavailable the load is merely the
+    first one in this process.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+
+    for path in files:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+
+def _get_mapping_sizes(mappings):
+    """
+    Returns the bytes held by an order's mappings, split into the dicts and the objects they hold.
+
+    Args:
+        mappings (dict): The order's mappings, with 'ngram_to_idx' and 'idx_to_ngram'.
+
+    Returns:
+        dict: 'mapping_dicts', 'key_objects' (n-gram tuples and chord strings), 'index_objects'
+            (row index integers) and 'other_mappings' (every other entry) in bytes.
+    """
+    ngram_to_idx = mappings.get("ngram_to_idx", {})
+    idx_to_ngram = mappings.get("idx_to_ngram", {})
+    seen = set()
+
+    def size_once(obj):
+        # Small integers are interned by the interpreter and cost nothing per use
+        if id(obj) in seen or (isinstance(obj, int) and -5 <= obj <= 256):
+            return 0
+        seen.add(id(obj))
+        return sys.getsizeof(obj)
+
+    key_objects = 0
+    for ngram in (*ngram_to_idx.keys(), *idx_to_ngram.values()):
+        key_objects += size_once(ngram)
+        if isinstance(ngram, tuple):
+            key_objects += sum(size_once(chord) for chord in ngram)
+
+    index_objects = sum(size_once(idx) for idx in (*ngram_to_idx.values(), *idx_to_ngram.keys()))
+
+    other_mappings = 0
+    for key, value in mappings.items():
+        if key not in ("ngram_to_idx", "idx_to_ngram"):
+            other_mappings += value.nbytes if isinstance(value, np.ndarray) else sys.getsizeof(value)
+
+    return {
+        "mapping_dicts": sys.getsizeof(ngram_to_idx) + sys.getsizeof(idx_to_ngram),
+        "key_objects": key_objects,
+        "index_objects": index_objects,
+        "other_mappings": other_mappings
+    }
+
+
+def _print_genre_report(genre, report):
+    """
+    Prints one genre's memory breakdown and load times, in MB and milliseconds.
+    """
+    print(f"\n{genre.upper()} - {report['total_bytes'] / 1024 ** 2:.1f} MB held, loader built in "
+          f"{report['loader_seconds'] * 1000:.0f} ms ({report['loader_traced_bytes'] / 1024 ** 2:.1f} MB traced, "
+          f"{report['held_traced_bytes'] / 1024 ** 2:.1f} MB once the trie is built)")
+    print(f"{'order':>5} | " + " | ".join(f"{part:>14}" for part in MEMORY_PARTS)
+          + f" | {'held':>8} | {'on disk':>8} | {'cold':>8} | {'warm':>8}")
+
+    for n, stats in report["orders"].items():
+        print(f"{n:>5} | " + " | ".join(f"{stats[part] / 1024 ** 2:>11.2f} MB" for part in MEMORY_PARTS)
+              + f" | {stats['total_bytes'] / 1024 ** 2:>5.1f} MB | {stats['file_bytes'] / 1024 ** 2:>5.1f} MB | "
+              f"{stats['cold_seconds'] * 1000:>5.0f} ms | {stats['warm_seconds'] * 1000:>5.0f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report the memory and load time of the built n-gram models.")
+    parser.add_argument("genres", nargs="*", help="Genres to report (default: every built genre)")
+    parser.add_argument("--max-order", type=int, help="Highest order to report (default: every built order)")
+    parser.add_argument("--repeats", type=int, default=3, help="Warm loads per order (default: 3)")
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    model_reports = report_model_memory(args.genres or None, args.max_order, args.repeats)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(model_reports, f, indent=2)
+        print(f"\n✓ Saved model memory report to {args.json_path}")
@@ -0,0 +1,75 @@
+import ast
+import hashlib
+import os
+
+from Utils.path_constants import DATA_PROCESSOR_PATH, MATRIX_BUILDER_PATH, MATRIX_GENERATOR_PATH, MATRIX_UPDATER_PATH, \
+    ROOT_PATH, UTILS_PATH
+
+
+def get_build_code_version():
+    """
+    Returns a version of the code that counts, builds and saves the matrices.
+
+    The version is a hash of the Python sources of the Data_Processor, Matrix_Builder,
+    Matrix_Generator and Matrix_Updater packages and of the chord vocabulary, together with
+    every module of the repository they import, directly or not (e.g. the chord quality
+    aliases in variable_constants and the key-relative tokenization). Any change to them
+    marks previously built artifacts as out of date.
+
+    Returns:
+        str: The hex digest of the build sources.
+    """
+    source_files = [os.path.join(UTILS_PATH, "chord_vocabulary.py")]
+
+    for package_path in (DATA_PROCESSOR_PATH, MATRIX_BUILDER_PATH, MATRIX_GENERATOR_PATH, MATRIX_UPDATER_PATH):
+        source_files.extend(
+            os.path.join(package_path, file_name) for file_name in os.listdir(package_path)
+            if file_name.endswith(".py")
+        )
+
+    source_files = _add_imported_source_files(source_files)
+
+    digest = hashlib.blake2b(digest_size=16)
+
+    # Hash relative paths with the contents, in a fixed order, so the version is stable across machines
+    for file_path in sorted(source_files):
+        with open(file_path, "rb") as f:
+            digest.update(os.path.relpath(file_path, ROOT_PATH).encode("utf-8"))
+            digest.update(f.read())
+
+    return digest.hexdigest()
+
+
+def _add_imported_source_files(source_files):
+    """
+    Returns the source files together with every repository module they import, transitively.
+
+    Imports are read from the syntax tree, including the ones inside functions, and resolved
+    against the repository root; modules of other packages are ignored.
+    """
+    found = set()
+    pending = list(source_files)
+
+    while pending:
+        file_path = pending.pop()
+        if file_path in found:
+            continue
+        found.add(file_path)
+
+        with open(file_path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=file_path)
+
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                module_names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                module_names = [node.module]
+            else:
+                continue
+
+            for module_name in module_names:
+                module_path = os.path.join(ROOT_PATH, *module_name.split(".")) + ".py"
+                if os.path.exists(module_path):
+                    pending.append(module_path)
+
+    return list(found)
@@ -0,0 +1,22 @@
+import hashlib
+
+
+def hash_artifact_file(file_path):
+    """
+    Computes the content hash recorded for a model artifact in its metadata sidecar.
+
+    The file is read in 1 MB blocks, so large matrices are hashed without loading them.
+
+    Args:
+        file_path (str): Path of the artifact file.
+
+    Returns:
+        str: The hex digest (BLAKE2b, 16 bytes) of the file content.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
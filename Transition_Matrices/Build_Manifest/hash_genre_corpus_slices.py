@@ -0,0 +1,36 @@
+import hashlib
+
+
+def hash_genre_corpus_slices(dataset, main_genres=None):
+    """
+    Computes a content hash of the songs each genre model is built from.
+
+    Songs are hashed in corpus order with the same filtering as the counting pass (a genre
+    and a non-empty chord string are required), so a genre's hash changes exactly when its
+    slice of the corpus changes.
+
+    Args:
+        dataset (dict): A dictionary containing song data under a 'train' key, each entry with
+            'main_genre' and 'chords' fields.
+        main_genres (list or tuple, optional): Genres to hash. If None, every genre is hashed.
+
+    Returns:
+        dict: A mapping from each genre to the hex digest of its songs.
+    """
+    genre_hashes = {}
+
+    for entry in dataset["train"]:
+        genre = entry["main_genre"]
+        chord_string = entry.get("chords", "")
+
+        if not genre or (main_genres is not None and genre not in main_genres) or not chord_string:
+            continue
+
+        if genre not in genre_hashes:
+            genre_hashes[genre] = hashlib.blake2b(digest_size=16)
+
+        # Terminate every song, so song boundaries are part of the hash
+        genre_hashes[genre].update(str(chord_string).encode("utf-8"))
+        genre_hashes[genre].update(b"\n")
+
+    return {genre: digest.hexdigest() for genre, digest in genre_hashes.items()}
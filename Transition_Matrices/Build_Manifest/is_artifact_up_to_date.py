@@ -0,0 +1,26 @@
+import os
+
+
+def is_artifact_up_to_date(manifest, matrices_path, genre, entry):
+    """
+    Checks whether a genre model was built from the same inputs and is still on disk.
+
+    Args:
+        manifest (dict): The order's build manifest, as returned by load_build_manifest.
+        matrices_path (str): Directory of the n-gram order.
+        genre (str): The genre of the model.
+        entry (dict): The build entry the model would be recorded with now: the corpus hash,
+            the build parameters and the code version.
+
+    Returns:
+        bool: True if the recorded entry matches `entry` and every artifact it lists exists.
+    """
+    recorded = manifest.get(genre)
+
+    if recorded is None:
+        return False
+
+    if any(recorded.get(key) != value for key, value in entry.items()):
+        return False
+
+    return all(os.path.exists(os.path.join(matrices_path, file_name)) for file_name in recorded.get("artifacts", []))
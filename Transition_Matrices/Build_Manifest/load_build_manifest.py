@@ -0,0 +1,23 @@
+import json
+import os
+
+from Utils.variable_constants import BUILD_MANIFEST_FILE_NAME
+
+
+def load_build_manifest(matrices_path):
+    """
+    Loads the build manifest of an n-gram order.
+
+    Args:
+        matrices_path (str): Directory of the n-gram order, e.g. MATRICES_2_GRAM_PATH.
+
+    Returns:
+        dict: A mapping from each genre to its build entry, empty if there is no manifest yet.
+    """
+    manifest_file = os.path.join(matrices_path, BUILD_MANIFEST_FILE_NAME)
+
+    if not os.path.exists(manifest_file):
+        return {}
+
+    with open(manifest_file, "r", encoding="utf-8") as f:
+        return json.load(f)
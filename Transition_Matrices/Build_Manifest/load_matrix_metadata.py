@@ -0,0 +1,42 @@
+import json
+import os
+
+from Transition_Matrices.Build_Manifest.hash_artifact_file import hash_artifact_file
+
+
+def load_matrix_metadata(matrices_path, genre):
+    """
+    Loads the sidecar metadata of one genre model if it still describes the artifacts.
+
+    The metadata is trusted only if every file it lists still has the recorded size and
+    checksum. Hashing reads the files but neither decompresses nor unpickles them, and unlike
+    modification times the checksums survive a git checkout or copy of the models. Models
+    written without a sidecar, or changed since, return None so that callers fall back to
+    loading the files.
+
+    Args:
+        matrices_path (str): Directory of the n-gram order.
+        genre (str): The genre of the model.
+
+    Returns:
+        dict or None: The metadata written by write_matrix_metadata, or None if it is
+            missing, unreadable or stale.
+    """
+    metadata_file = os.path.join(matrices_path, f"matrix_metadata_{genre}.json")
+
+    try:
+        with open(metadata_file, "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+
+        for file_name, recorded in metadata["files"].items():
+            file_path = os.path.join(matrices_path, file_name)
+            if os.path.getsize(file_path) != recorded["bytes"] or hash_artifact_file(file_path) != recorded["blake2b"]:
+                return None
+
+        if f"transition_matrix_{genre}.npz" not in metadata["files"]:
+            return None
+
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    return metadata
@@ -0,0 +1,31 @@
+import json
+import os
+
+from Transition_Matrices.Build_Manifest.load_build_manifest import load_build_manifest
+from Transition_Matrices.Matrix_Updater.write_file_atomically import write_file_atomically
+from Utils.variable_constants import BUILD_MANIFEST_FILE_NAME
+
+
+def record_build_manifest_entry(matrices_path, genre, entry):
+    """
+    Records (or removes) the build entry of one genre model in its order's manifest.
+
+    The manifest is rewritten atomically after every model, so an interrupted build keeps
+    the entries of every model completed before the interruption.
+
+    Args:
+        matrices_path (str): Directory of the n-gram order, e.g. MATRICES_2_GRAM_PATH.
+        genre (str): The genre of the model.
+        entry (dict or None): The build entry, or None to mark the model as out of date.
+    """
+    manifest = load_build_manifest(matrices_path)
+
+    if entry is None:
+        if genre not in manifest:
+            return
+        del manifest[genre]
+    else:
+        manifest[genre] = entry
+
+    content = json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8")
+    write_file_atomically(os.path.join(matrices_path, BUILD_MANIFEST_FILE_NAME), lambda f: f.write(content))
@@ -0,0 +1,63 @@
+import json
+import os
+
+import numpy as np
+
+from Transition_Matrices.Build_Manifest.hash_artifact_file import hash_artifact_file
+from Transition_Matrices.Matrix_Updater.write_file_atomically import write_file_atomically
+
+
+def write_matrix_metadata(matrices_path, genre, n, matrix, mappings, build_parameters=None):
+    """
+    Writes the sidecar metadata of one genre model, so analyzers can skip loading it.
+
+    The sidecar (matrix_metadata_{genre}.json) holds the matrix shape, stored transitions,
+    active rows and vocabulary size, the build parameters, and the size and checksum of every
+    artifact of the model present in the directory. Neither depends on file timestamps, so a
+    sidecar committed with the models stays valid in a fresh checkout. It is written after the
+    artifacts, from the objects that were just saved or loaded.
+
+    Args:
+        matrices_path (str): Directory of the n-gram order.
+        genre (str): The genre of the model.
+        n (int): The n-gram order.
+        matrix (scipy.sparse.spmatrix or numpy.ndarray): The saved transition matrix.
+        mappings (dict): The saved mappings, with 'ngram_to_idx'.
+        build_parameters (dict, optional): Settings the model was built with, e.g. min_count
+            and smoothing. Defaults to None, for a model whose settings are unknown.
+
+    Returns:
+        dict: The written metadata.
+    """
+    if hasattr(matrix, "tocsr"):
+        indptr = matrix.tocsr().indptr
+        nnz = int(matrix.nnz)
+    else:
+        indptr = np.concatenate([[0], np.cumsum(np.count_nonzero(matrix, axis=1))])
+        nnz = int(np.count_nonzero(matrix))
+
+    files = {}
+    artifact_names = (f"transition_matrix_{genre}.npz", f"ngram_mappings_{genre}.pkl", f"transition_counts_{genre}.npz")
+
+    for file_name in artifact_names:
+        file_path = os.path.join(matrices_path, file_name)
+        if not os.path.exists(file_path):
+            continue
+
+        files[file_name] = {"bytes": os.path.getsize(file_path), "blake2b": hash_artifact_file(file_path)}
+
+    metadata = {
+        "genre": genre,
+        "n": n,
+        "shape": [int(size) for size in matrix.shape],
+        "nnz": nnz,
+        "active_rows": int(np.count_nonzero(np.diff(indptr))),
+        "vocabulary_size": len(mappings.get("ngram_to_idx", mappings.get("chord_to_idx", {}))),
+        "build_parameters": build_parameters or {},
+        "files": files
+    }
+
+    content = json.dumps(metadata, indent=2, sort_keys=True).encode("utf-8")
+    write_file_atomically(os.path.join(matrices_path, f"matrix_metadata_{genre}.json"), lambda f: f.write(content))
+
+    return metadata
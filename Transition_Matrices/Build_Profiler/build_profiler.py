@@ -0,0 +1,220 @@
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from Transition_Matrices.Matrix_Updater.write_file_atomically import write_file_atomically
+
+
+class BuildProfiler:
+    """
+    Records the time, memory and data sizes of every stage of a matrix build.
+
+    Each stage is measured with wall time, process CPU time, the peak of Python and NumPy
+    allocations (tracemalloc) and the peak resident set size of the process (resource),
+    and carries the sizes of the structures it produced. Stages can be nested; every stage
+    reports the peak reached while it was open, including its inner stages. A disabled
+    profiler measures nothing, so the build code can call it unconditionally.
+
+    With a report path, the report is rewritten whenever an outermost stage completes, so a
+    build killed by the operating system (e.g. out of memory) still leaves the stages it
+    finished on disk.
+
+    Attributes:
+        enabled (bool): Whether stages are measured.
+        report_path (str or None): Where the report is kept up to date, if anywhere.
+        records (list): One dict per completed stage, in completion order.
+
+    Methods:
+        stage(name, genre=None, n=None, **sizes):
+            Context manager measuring one stage; yields its sizes dict to be filled in.
+
+        extend(records):
+            Adds stage records measured elsewhere, e.g. in a worker process.
+
+        summarize():
+            Returns the totals of every stage name and the most expensive (genre, order) stages.
+
+        write_report(report_path=None):
+            Writes the records and the summary as JSON and prints the summary.
+    """
+
+    def __init__(self, enabled=True, report_path=None):
+        """
+        Initializes the BuildProfiler.
+
+        Args:
+            enabled (bool, optional): Whether stages are measured. Defaults to True.
+            report_path (str, optional): JSON report kept up to date after every outermost
+                stage. Defaults to None, writing only on write_report.
+        """
+        self.enabled = enabled
+        self.report_path = report_path
+        self.records = []
+        self._open_stages = []
+        self._started_tracemalloc = False
+
+    @contextmanager
+    def stage(self, name, genre=None, n=None, **sizes):
+        """
+        Measures one build stage.
+
+        Tracing allocations slows Python-level code down; NumPy buffers are traced at little cost.
+
+        Args:
+            name (str): Stage name, e.g. 'load', 'count', 'filter', 'build' or 'save'.
+            genre (str, optional): The genre the stage works on, if any.
+            n (int, optional): The n-gram order the stage works on, if any.
+            **sizes: Sizes known when the stage starts.
+
+        Yields:
+            dict: The stage's sizes, to be completed by the caller (counts or bytes).
+        """
+        if not self.enabled:
+            yield sizes
+            return
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+        # Carry the peak reached so far into the enclosing stages before it is reset
+        current_peak = tracemalloc.get_traced_memory()[1]
+        for open_stage in self._open_stages:
+            open_stage["peak"] = max(open_stage["peak"], current_peak)
+        tracemalloc.reset_peak()
+
+        frame = {"peak": 0}
+        self._open_stages.append(frame)
+        start_traced = tracemalloc.get_traced_memory()[0]
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+
+        try:
+            yield sizes
+        finally:
+            wall_seconds = time.perf_counter() - start_wall
+            cpu_seconds = time.process_time() - start_cpu
+            traced, peak = tracemalloc.get_traced_memory()
+
+            self._open_stages.pop()
+            frame["peak"] = max(frame["peak"], peak)
+            for open_stage in self._open_stages:
+                open_stage["peak"] = max(open_stage["peak"], frame["peak"])
+
+            self.records.append({
+                "stage": name,
+                "genre": genre,
+                "n": n,
+                "wall_seconds": wall_seconds,
+                "cpu_seconds": cpu_seconds,
+                "traced_peak_bytes": frame["peak"],
+                "traced_retained_bytes": traced - start_traced,
+                "peak_rss_bytes": self._get_peak_rss(),
+                "pid": os.getpid(),
+                "sizes": sizes
+            })
+
+            if not self._open_stages:
+                if self._started_tracemalloc:
+                    tracemalloc.stop()
+                    self._started_tracemalloc = False
+
+                if self.report_path is not None:
+                    self._dump_report(self.report_path)
+
+    def extend(self, records):
+        """
+        Adds stage records measured elsewhere, e.g. by a profiler in a worker process.
+
+        Args:
+            records (list): Records as found in another profiler's `records`.
+        """
+        if self.enabled:
+            self.records.extend(records)
+
+    def summarize(self, top=10):
+        """
+        Returns the totals of every stage name and the most expensive (genre, order) stages.
+
+        Args:
+            top (int, optional): Number of stages listed by time and by memory. Defaults to 10.
+
+        Returns:
+            dict: 'stages' maps each stage name to its summed wall and CPU seconds, maximum
+                traced peak and count; 'slowest' and 'largest' list the top records by wall
+                time and by traced peak; 'peak_rss_bytes' is the highest resident set size.
+        """
+        stages = {}
+        for record in self.records:
+            totals = stages.setdefault(record["stage"], {
+                "count": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0, "traced_peak_bytes": 0
+            })
+            totals["count"] += 1
+            totals["wall_seconds"] += record["wall_seconds"]
+            totals["cpu_seconds"] += record["cpu_seconds"]
+            totals["traced_peak_bytes"] = max(totals["traced_peak_bytes"], record["traced_peak_bytes"])
+
+        return {
+            "stages": stages,
+            "slowest": sorted(self.records, key=lambda r: r["wall_seconds"], reverse=True)[:top],
+            "largest": sorted(self.records, key=lambda r: r["traced_peak_bytes"], reverse=True)[:top],
+            "peak_rss_bytes": max((record["peak_rss_bytes"] or 0 for record in self.records), default=0)
+        }
+
+    def write_report(self, report_path=None):
+        """
+        Writes the stage records and their summary as JSON and prints the summary.
+
+        Args:
+            report_path (str, optional): Path of the report file. Defaults to `report_path`.
+        """
+        report_path = report_path or self.report_path
+
+        if not self.enabled or report_path is None:
+            return
+
+        summary = self._dump_report(report_path)
+
+        print(f"\n✓ Saved build profile to {report_path}")
+        for name, totals in summary["stages"].items():
+            print(f"  {name:>8}: {totals['wall_seconds']:8.2f} s wall, {totals['cpu_seconds']:8.2f} s CPU, "
+                  f"peak {totals['traced_peak_bytes'] / 1024 ** 2:8.1f} MB traced ({totals['count']} stages)")
+        for record in summary["largest"][:3]:
+            label = " ".join(str(part) for part in (record["genre"], record["n"] and f"{record['n']}-gram") if part)
+            print(f"  Largest: {record['stage']} {label} - {record['traced_peak_bytes'] / 1024 ** 2:.1f} MB traced")
+
+    def _dump_report(self, report_path):
+        """
+        Writes the report atomically and returns its summary.
+        """
+        summary = self.summarize()
+        report = {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "summary": summary,
+            "records": self.records
+        }
+
+        write_file_atomically(report_path, lambda f: f.write(json.dumps(report, indent=2).encode("utf-8")))
+
+        return summary
+
+    @staticmethod
+    def _get_peak_rss():
+        """
+        Returns the peak resident set size of the process in bytes, or None if unavailable.
+        """
+        if resource is None:
+            return None
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
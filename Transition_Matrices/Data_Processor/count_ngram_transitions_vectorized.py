@@ -0,0 +1,92 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+_MAX_PACKED_KEY = np.iinfo(np.int64).max
+
+
+def count_ngram_transitions_vectorized(tokens, lengths, n=1):
+    """
+    Counts transitions between consecutive n-grams of a token array without a Python loop.
+
+    Every window of n + 1 tokens that lies inside one song is one transition
+    (window[:n] -> window[1:]). Windows are packed into mixed-radix int64 keys (radix = number
+    of distinct chord ids) and counted with np.unique. When the packed keys would overflow
+    int64, the windows are counted row-wise with np.unique(axis=0) instead.
+
+    Args:
+        tokens (numpy.ndarray): 1-D integer array of the concatenated chord ids of all songs.
+        lengths (numpy.ndarray): 1-D integer array of the length of each song in `tokens`.
+        n (int, optional): The n-gram order. Defaults to 1.
+
+    Returns:
+        tuple: A 4-tuple in COO form:
+            - states (numpy.ndarray): (num_states, n) int64 array; row k holds the chord ids of state k.
+            - rows (numpy.ndarray): Index of the current state of each distinct transition.
+            - cols (numpy.ndarray): Index of the next state of each distinct transition.
+            - counts (numpy.ndarray): Number of occurrences of each distinct transition.
+
+    Raises:
+        ValueError: If `n` is below 1 or `lengths` does not add up to the number of tokens.
+    """
+    if n < 1:
+        raise ValueError("n must be >= 1")
+
+    tokens = np.asarray(tokens, dtype=np.int64)
+    lengths = np.asarray(lengths, dtype=np.int64)
+
+    if int(lengths.sum()) != tokens.size:
+        raise ValueError("Song lengths must add up to the number of tokens")
+
+    num_windows = tokens.size - n
+
+    if num_windows <= 0:
+        empty = np.empty(0, dtype=np.int64)
+        return np.empty((0, n), dtype=np.int64), empty, empty, empty
+
+    # A window starting at position i stays inside its song if the song has n more tokens after i
+    song_ends = np.repeat(np.cumsum(lengths), lengths)
+    valid = (song_ends[:num_windows] - np.arange(num_windows)) > n
+
+    # Compact the ids, so the radix is the number of distinct chords rather than the largest id
+    token_values, codes = np.unique(tokens, return_inverse=True)
+    radix = max(len(token_values), 1)
+
+    if radix ** (n + 1) <= _MAX_PACKED_KEY:
+        # Rolling mixed-radix key over the n + 1 tokens of every window
+        keys = np.zeros(num_windows, dtype=np.int64)
+        for offset in range(n + 1):
+            keys = keys * radix + codes[offset:offset + num_windows]
+
+        transition_keys, counts = np.unique(keys[valid], return_counts=True)
+
+        # Window key -> (context key, next key): drop the last digit / the first digit
+        context_keys = transition_keys // radix
+        next_keys = transition_keys % (radix ** n)
+
+        state_keys, state_inverse = np.unique(np.concatenate([context_keys, next_keys]), return_inverse=True)
+
+        # Unpack the state keys back into n chord codes, least significant digit last
+        state_codes = np.empty((len(state_keys), n), dtype=np.int64)
+        remaining = state_keys.copy()
+        for position in range(n - 1, -1, -1):
+            state_codes[:, position] = remaining % radix
+            remaining //= radix
+    else:
+        windows = sliding_window_view(codes, n + 1)[valid]
+        transition_windows, counts = np.unique(windows, axis=0, return_counts=True)
+
+        state_codes, state_inverse = np.unique(
+            np.concatenate([transition_windows[:, :n], transition_windows[:, 1:]]),
+            axis=0,
+            return_inverse=True
+        )
+
+    state_inverse = state_inverse.reshape(-1)
+    num_transitions = len(counts)
+
+    return (
+        token_values[state_codes],
+        state_inverse[:num_transitions].astype(np.int64),
+        state_inverse[num_transitions:].astype(np.int64),
+        counts.astype(np.int64)
+    )
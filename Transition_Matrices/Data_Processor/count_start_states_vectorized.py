@@ -0,0 +1,22 @@
+import numpy as np
+
+
+def count_start_states_vectorized(tokens, lengths):
+    """
+    Counts the opening chord of every song in a token array.
+
+    Args:
+        tokens (numpy.ndarray): 1-D integer array of the concatenated chord ids of all songs.
+        lengths (numpy.ndarray): 1-D integer array of the length of each song in `tokens`.
+
+    Returns:
+        dict: {opening_chord_id: count}.
+    """
+    lengths = np.asarray(lengths, dtype=np.int64)
+    lengths = lengths[lengths > 0]
+
+    # The opening chord of every song sits at the song's offset in the token array
+    song_starts = np.cumsum(lengths) - lengths
+    opening_chords, opening_counts = np.unique(np.asarray(tokens)[song_starts], return_counts=True)
+
+    return dict(zip(opening_chords.tolist(), opening_counts.tolist()))
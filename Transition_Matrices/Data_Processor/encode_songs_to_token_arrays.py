@@ -0,0 +1,68 @@
+from array import array
+
+import numpy as np
+
+from Transition_Matrices.Data_Processor.extract_chord_sequence import extract_chord_sequence
+
+
+def encode_songs_to_token_arrays(dataset, vocabulary, main_genres=None):
+    """
+    Encodes the songs of a dataset as flat integer token arrays, one per genre.
+
+    Every song is tokenized once and its chord ids are appended to a compact per-genre
+    buffer, together with the song length, so vectorized counting can later recover song
+    boundaries without any per-song Python objects.
+
+    Args:
+        dataset (dict): A dictionary containing song data. It must have a 'train' key with a list of song entries.
+                        Each song entry should include:
+                        - 'main_genre' (str): The genre of the song.
+                        - 'chords' (str): A string of chords separated by spaces.
+        vocabulary (ChordVocabulary): Vocabulary used to intern chords as canonical ids.
+        main_genres (list or tuple, optional): Genres to encode. If None, every genre found in
+            the dataset is encoded.
+
+    Returns:
+        dict: {genre: (tokens, lengths)} where tokens is an int64 array of the concatenated chord
+            ids of the genre's songs and lengths is an int64 array of each song's length.
+
+    Raises:
+        ValueError: If `main_genres` is given but is not a non-empty list or tuple.
+    """
+    if main_genres is not None and (not main_genres or not isinstance(main_genres, (list, tuple))):
+        raise ValueError("main_genres must be a non-empty list or tuple")
+
+    genre_tokens = {genre: array("q") for genre in main_genres or ()}
+    genre_lengths = {genre: array("q") for genre in main_genres or ()}
+
+    # Iterate through the training dataset
+    for entry in dataset["train"]:
+        try:
+            # Extract the genre and chord string from the current entry
+            genre = entry["main_genre"]
+            chord_string = entry.get("chords", "")
+
+            # Skip entries with invalid or missing data
+            if not genre or (main_genres is not None and genre not in main_genres) or not chord_string:
+                continue
+
+            chord_sequence = extract_chord_sequence(chord_string, vocabulary)
+
+            if not chord_sequence:
+                continue
+
+            if genre not in genre_tokens:
+                genre_tokens[genre] = array("q")
+                genre_lengths[genre] = array("q")
+
+            genre_tokens[genre].extend(chord_sequence)
+            genre_lengths[genre].append(len(chord_sequence))
+
+        # Handle potential errors in the dataset entry
+        except (KeyError, TypeError, AttributeError):
+            continue
+
+    return {
+        genre: (np.frombuffer(genre_tokens[genre], dtype=np.int64), np.frombuffer(genre_lengths[genre], dtype=np.int64))
+        for genre in genre_tokens
+    }
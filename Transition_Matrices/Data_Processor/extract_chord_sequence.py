@@ -1,4 +1,4 @@
-def extract_chord_sequence(chord_string):
+def extract_chord_sequence(chord_string, vocabulary=None):
     """
     Extracts a sequence of chords from a given chord string.
 
@@ -8,9 +8,11 @@ def extract_chord_sequence(chord_string):
 
     Args:
         chord_string (str): A string containing chord tokens separated by spaces.
+        vocabulary (ChordVocabulary, optional): If provided, chords are returned as
+            canonical integer ids from this vocabulary instead of strings.
 
     Returns:
-        list: A list of chord tokens that are not enclosed in angle brackets.
+        list: A list of chord tokens (or ids) that are not enclosed in angle brackets.
     """
     chord_sequence = []
 
@@ -20,4 +22,7 @@ def extract_chord_sequence(chord_string):
         if not (token.startswith('<') or token.endswith('>')):
             chord_sequence.append(token)
 
+    if vocabulary is not None:
+        chord_sequence = vocabulary.encode_sequence(chord_sequence)
+
     return chord_sequence
@@ -1,4 +1,4 @@
-def extract_ngram_sequences(chord_string, n=1):
+def extract_ngram_sequences(chord_string, n=1, vocabulary=None):
     """
     Extracts n-gram sequences from a given chord string.
 
@@ -9,6 +9,8 @@ def extract_ngram_sequences(chord_string, n=1):
     Args:
         chord_string (str): A string containing chord tokens separated by spaces.
         n (int): The size of the n-gram (1 for unigrams, 2 for bigrams, etc.).
+        vocabulary (ChordVocabulary, optional): If provided, chords are replaced by their
+            canonical integer ids from this vocabulary.
 
     Returns:
         list: A list of n-gram tuples. For n=1, returns individual chords.
@@ -22,6 +24,9 @@ def extract_ngram_sequences(chord_string, n=1):
         if not (token.startswith('<') or token.endswith('>')):
             chord_sequence.append(token)
 
+    if vocabulary is not None:
+        chord_sequence = vocabulary.encode_sequence(chord_sequence)
+
     # Return empty list if not enough chords for n-gram
     if len(chord_sequence) < n:
         return []
@@ -0,0 +1,77 @@
+import numpy as np
+
+_MAX_PACKED_KEY = np.iinfo(np.int64).max
+
+
+def merge_ngram_transition_counts(parts, n):
+    """
+    Merges several COO transition counts of the same n-gram order into one.
+
+    Each part may index its own states; transitions are matched on their chord ids, so the
+    same transition counted in different parts is summed. As in the counting engine, the
+    n + 1 chord windows are packed into mixed-radix int64 keys when they fit, and matched
+    row-wise with np.unique(axis=0) otherwise.
+
+    Args:
+        parts (list): (states, rows, cols, counts) tuples as returned by
+            count_ngram_transitions_vectorized, with chord-id states.
+        n (int): The n-gram order of every part.
+
+    Returns:
+        tuple: The merged (states, rows, cols, counts).
+    """
+    parts = [part for part in parts if len(part[3])]
+
+    if not parts:
+        empty = np.empty(0, dtype=np.int64)
+        return np.empty((0, n), dtype=np.int64), empty, empty, empty
+
+    # A transition is the n + 1 chord window (context followed by the added chord)
+    windows = np.concatenate([
+        np.hstack([states[rows], states[cols][:, -1:]]) for states, rows, cols, counts in parts
+    ])
+    weights = np.concatenate([part[3] for part in parts])
+
+    # Compact the ids, so the radix is the number of distinct chords rather than the largest id
+    chord_values, codes = np.unique(windows, return_inverse=True)
+    codes = codes.reshape(windows.shape)
+    radix = max(len(chord_values), 1)
+
+    if radix ** (n + 1) <= _MAX_PACKED_KEY:
+        keys = np.zeros(len(codes), dtype=np.int64)
+        for position in range(n + 1):
+            keys = keys * radix + codes[:, position]
+
+        transition_keys, transition_inverse = np.unique(keys, return_inverse=True)
+
+        # Window key -> (context key, next key): drop the last digit / the first digit
+        state_keys, state_inverse = np.unique(
+            np.concatenate([transition_keys // radix, transition_keys % (radix ** n)]),
+            return_inverse=True
+        )
+
+        # Unpack the state keys back into n chord codes, least significant digit last
+        state_codes = np.empty((len(state_keys), n), dtype=np.int64)
+        for position in range(n - 1, -1, -1):
+            state_codes[:, position] = state_keys % radix
+            state_keys = state_keys // radix
+    else:
+        transition_windows, transition_inverse = np.unique(codes, axis=0, return_inverse=True)
+        state_codes, state_inverse = np.unique(
+            np.concatenate([transition_windows[:, :n], transition_windows[:, 1:]]),
+            axis=0,
+            return_inverse=True
+        )
+
+    transition_inverse = transition_inverse.reshape(-1)
+    state_inverse = state_inverse.reshape(-1)
+    num_transitions = len(state_inverse) // 2
+
+    counts = np.bincount(transition_inverse, weights=weights, minlength=num_transitions).astype(np.int64)
+
+    return (
+        chord_values[state_codes].astype(np.int64),
+        state_inverse[:num_transitions].astype(np.int64),
+        state_inverse[num_transitions:].astype(np.int64),
+        counts
+    )
@@ -0,0 +1,65 @@
+from Transition_Matrices.Data_Processor.merge_ngram_transition_counts import merge_ngram_transition_counts
+from Transition_Matrices.Data_Processor.process_songs_and_count_multi_order_transitions_vectorized import \
+    process_songs_and_count_multi_order_transitions_vectorized
+
+
+def process_song_batches_and_count_multi_order_transitions_vectorized(song_batches, vocabulary, main_genres=None,
+                                                                      ngram_sizes=(1, 2, 3, 4)):
+    """
+    Counts n-gram transitions of several orders over a stream of song batches.
+
+    Every batch is encoded and counted with the vectorized engine, and its COO counts are
+    merged into running totals. Memory therefore depends on the batch size and the number
+    of distinct transitions, not on the size of the corpus. Batch results are merged once
+    they outgrow the running totals, which keeps the total merge cost near linear.
+
+    Args:
+        song_batches (iterable): Lists of song records with 'main_genre' and 'chords' fields.
+        vocabulary (ChordVocabulary): Vocabulary used to intern chords as canonical ids.
+        main_genres (list or tuple, optional): Genres to process. If None, every genre found in
+            the stream is counted.
+        ngram_sizes (list or tuple, optional): The n-gram orders to count. Defaults to (1, 2, 3, 4).
+
+    Returns:
+        tuple: The same (genre_ngram_coo, genre_start_counts) structure as
+            process_songs_and_count_multi_order_transitions_vectorized.
+    """
+    ngram_sizes = sorted(set(ngram_sizes))
+
+    running_counts = {n: {} for n in ngram_sizes}
+    pending_counts = {n: {} for n in ngram_sizes}
+    genre_start_counts = {}
+
+    for song_batch in song_batches:
+        batch_counts, batch_start_counts = process_songs_and_count_multi_order_transitions_vectorized(
+            {"train": song_batch}, vocabulary, main_genres, ngram_sizes
+        )
+
+        for genre, start_counts in batch_start_counts.items():
+            genre_totals = genre_start_counts.setdefault(genre, {})
+            for chord, count in start_counts.items():
+                genre_totals[chord] = genre_totals.get(chord, 0) + count
+
+        for n, genre_counts in batch_counts.items():
+            for genre, coo in genre_counts.items():
+                pending = pending_counts[n].setdefault(genre, [])
+                pending.append(coo)
+
+                running = running_counts[n].get(genre)
+                running_size = len(running[3]) if running is not None else 0
+
+                # Merge once the pending batches outgrow the running totals
+                if sum(len(part[3]) for part in pending) >= running_size:
+                    parts = ([running] if running is not None else []) + pending
+                    running_counts[n][genre] = merge_ngram_transition_counts(parts, n)
+                    pending.clear()
+
+    # Fold in whatever is still pending
+    for n, genre_pending in pending_counts.items():
+        for genre, pending in genre_pending.items():
+            if pending:
+                running = running_counts[n].get(genre)
+                parts = ([running] if running is not None else []) + pending
+                running_counts[n][genre] = merge_ngram_transition_counts(parts, n)
+
+    return running_counts, genre_start_counts
@@ -0,0 +1,92 @@
+from collections import defaultdict
+
+from Transition_Matrices.Data_Processor.extract_chord_sequence import extract_chord_sequence
+
+
+def process_songs_and_count_multi_order_transitions(dataset, main_genres=None, ngram_sizes=(1, 2, 3, 4),
+                                                    vocabulary=None):
+    """
+    Processes a dataset of songs and counts n-gram transitions of several orders in one pass.
+
+    Each song is tokenized once, and the transition counters of every requested n-gram order
+    for its genre are updated from that single chord sequence. The opening chord of every song
+    is counted as well, giving each genre's start-state distribution. This replaces one full
+    dataset scan per (order, genre batch) with a single scan.
+
+    Args:
+        dataset (dict): A dictionary containing song data. It must have a 'train' key with a list of song entries.
+                        Each song entry should include:
+                        - 'main_genre' (str): The genre of the song.
+                        - 'chords' (str): A string of chords separated by spaces.
+        main_genres (list or tuple, optional): Genres to process. Only songs belonging to these genres are
+                                               counted. If None, every genre found in the dataset is counted.
+        ngram_sizes (list or tuple, optional): The n-gram orders to count. Defaults to (1, 2, 3, 4).
+        vocabulary (ChordVocabulary, optional): If provided, n-grams are keyed by canonical chord ids
+            (an id for n=1, a tuple of ids for n>1) instead of chord strings.
+
+    Returns:
+        tuple: A 2-tuple containing:
+            - genre_ngram_transitions (dict): {n: {genre: {current_ngram: {next_ngram: count}}}}, the same
+              per-order structure returned by process_songs_and_count_ngram_transitions.
+            - genre_start_counts (dict): {genre: {opening_chord: count}}.
+
+    Raises:
+        ValueError: If `main_genres` is given but is not a non-empty list or tuple, or if
+            `ngram_sizes` is empty or contains an order below 1.
+    """
+    if main_genres is not None and (not main_genres or not isinstance(main_genres, (list, tuple))):
+        raise ValueError("main_genres must be a non-empty list or tuple")
+
+    if not ngram_sizes or min(ngram_sizes) < 1:
+        raise ValueError("ngram_sizes must be a non-empty collection of orders >= 1")
+
+    ngram_sizes = sorted(set(ngram_sizes))
+
+    genre_ngram_transitions = {n: defaultdict(lambda: defaultdict(lambda: defaultdict(int))) for n in ngram_sizes}
+    genre_start_counts = defaultdict(lambda: defaultdict(int))
+
+    # Pre-create the requested genres, so genres without songs still appear in the result
+    for genre in main_genres or ():
+        genre_start_counts[genre]
+        for n in ngram_sizes:
+            genre_ngram_transitions[n][genre]
+
+    # Iterate through the training dataset once
+    for entry in dataset["train"]:
+        try:
+            # Extract the genre and chord string from the current entry
+            genre = entry["main_genre"]
+            chord_string = entry.get("chords", "")
+
+            # Skip entries with invalid or missing data
+            if not genre or (main_genres is not None and genre not in main_genres) or not chord_string:
+                continue
+
+            # Tokenize the song once for all orders
+            chord_sequence = extract_chord_sequence(chord_string, vocabulary)
+
+            if not chord_sequence:
+                continue
+
+            genre_start_counts[genre][chord_sequence[0]] += 1
+
+            for n in ngram_sizes:
+                # Need at least n + 1 chords for one transition between consecutive n-grams
+                if len(chord_sequence) < n + 1:
+                    break
+
+                transitions = genre_ngram_transitions[n][genre]
+
+                if n == 1:
+                    for i in range(len(chord_sequence) - 1):
+                        transitions[chord_sequence[i]][chord_sequence[i + 1]] += 1
+                else:
+                    ngrams = [tuple(chord_sequence[i:i + n]) for i in range(len(chord_sequence) - n + 1)]
+                    for i in range(len(ngrams) - 1):
+                        transitions[ngrams[i]][ngrams[i + 1]] += 1
+
+        # Handle potential errors in the dataset entry
+        except (KeyError, TypeError, AttributeError):
+            continue
+
+    return genre_ngram_transitions, genre_start_counts
@@ -0,0 +1,48 @@
+from Transition_Matrices.Data_Processor.count_ngram_transitions_vectorized import count_ngram_transitions_vectorized
+from Transition_Matrices.Data_Processor.count_start_states_vectorized import count_start_states_vectorized
+from Transition_Matrices.Data_Processor.encode_songs_to_token_arrays import encode_songs_to_token_arrays
+
+
+def process_songs_and_count_multi_order_transitions_vectorized(dataset, vocabulary, main_genres=None,
+                                                               ngram_sizes=(1, 2, 3, 4)):
+    """
+    Vectorized counterpart of process_songs_and_count_multi_order_transitions.
+
+    The dataset is scanned once to encode each genre as a flat array of chord ids; every
+    requested order is then counted on that array with NumPy, and the counts are returned in
+    COO form, ready for build_ngram_transition_matrices_from_coo.
+
+    Args:
+        dataset (dict): A dictionary containing song data. It must have a 'train' key with a list of song entries.
+                        Each song entry should include:
+                        - 'main_genre' (str): The genre of the song.
+                        - 'chords' (str): A string of chords separated by spaces.
+        vocabulary (ChordVocabulary): Vocabulary used to intern chords as canonical ids.
+        main_genres (list or tuple, optional): Genres to process. If None, every genre found in
+            the dataset is counted.
+        ngram_sizes (list or tuple, optional): The n-gram orders to count. Defaults to (1, 2, 3, 4).
+
+    Returns:
+        tuple: A 2-tuple containing:
+            - genre_ngram_coo (dict): {n: {genre: (states, rows, cols, counts)}}.
+            - genre_start_counts (dict): {genre: {opening_chord_id: count}}.
+
+    Raises:
+        ValueError: If `main_genres` is given but is not a non-empty list or tuple, or if
+            `ngram_sizes` is empty or contains an order below 1.
+    """
+    if not ngram_sizes or min(ngram_sizes) < 1:
+        raise ValueError("ngram_sizes must be a non-empty collection of orders >= 1")
+
+    genre_token_arrays = encode_songs_to_token_arrays(dataset, vocabulary, main_genres)
+
+    genre_ngram_coo = {n: {} for n in sorted(set(ngram_sizes))}
+    genre_start_counts = {}
+
+    for genre, (tokens, lengths) in genre_token_arrays.items():
+        genre_start_counts[genre] = count_start_states_vectorized(tokens, lengths)
+
+        for n in genre_ngram_coo:
+            genre_ngram_coo[n][genre] = count_ngram_transitions_vectorized(tokens, lengths, n)
+
+    return genre_ngram_coo, genre_start_counts
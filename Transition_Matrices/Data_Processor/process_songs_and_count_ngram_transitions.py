@@ -2,7 +2,7 @@ from Transition_Matrices.Data_Processor.extract_ngram_sequences import extract_n
 from Transition_Matrices.Data_Processor.initialize_ngram_data_structures import initialize_ngram_data_structures
 
 
-def process_songs_and_count_ngram_transitions(dataset, main_genres, n=1):
+def process_songs_and_count_ngram_transitions(dataset, main_genres, n=1, vocabulary=None):
     """
     Processes a dataset of songs and counts n-gram transitions for specified genres.
 
@@ -18,6 +18,8 @@ def process_songs_and_count_ngram_transitions(dataset, main_genres, n=1):
         main_genres (list or tuple): A list or tuple of genres to process. Only songs belonging to these genres
                                     will be included in the transition counting.
         n (int): The size of the n-gram (1 for unigrams, 2 for bigrams, etc.). Defaults to 1.
+        vocabulary (ChordVocabulary, optional): If provided, n-grams are keyed by canonical
+            chord ids (an id for n=1, a tuple of ids for n>1) instead of chord strings.
 
     Returns:
         dict: A nested dictionary where:
@@ -50,7 +52,7 @@ def process_songs_and_count_ngram_transitions(dataset, main_genres, n=1):
                 continue
 
             # Extract the sequence of n-grams from the chord string
-            ngram_sequence = extract_ngram_sequences(chord_string, n)
+            ngram_sequence = extract_ngram_sequences(chord_string, n, vocabulary)
 
             # Skip sequences with fewer than two n-grams (need at least 2 for transitions)
             if len(ngram_sequence) < 2:
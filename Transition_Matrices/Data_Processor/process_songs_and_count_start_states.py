@@ -0,0 +1,57 @@
+from collections import defaultdict
+
+from Transition_Matrices.Data_Processor.extract_chord_sequence import extract_chord_sequence
+
+
+def process_songs_and_count_start_states(dataset, main_genres, vocabulary=None):
+    """
+    Processes a dataset of songs and counts the opening chord of each song for specified genres.
+
+    The counts form the start-state distribution of a genre, which lets generation seed a
+    sequence from the model alone instead of sampling a window from the dataset.
+
+    Args:
+        dataset (dict): A dictionary containing song data. It must have a 'train' key with a list of song entries.
+                        Each song entry should include:
+                        - 'main_genre' (str): The genre of the song.
+                        - 'chords' (str): A string of chords separated by spaces.
+        main_genres (list or tuple): A list or tuple of genres to process. Only songs belonging to these genres
+                                     will be counted.
+        vocabulary (ChordVocabulary, optional): If provided, chords are keyed by their canonical
+            ids instead of strings.
+
+    Returns:
+        dict: A nested dictionary where:
+            - The first key is the genre.
+            - The second key is the opening chord.
+            - The value is the number of songs starting with that chord.
+
+    Raises:
+        ValueError: If `main_genres` is not a non-empty list or tuple.
+    """
+    if not main_genres or not isinstance(main_genres, (list, tuple)):
+        raise ValueError("main_genres must be a non-empty list or tuple")
+
+    genre_start_counts = {genre: defaultdict(int) for genre in main_genres}
+
+    # Iterate through the training dataset
+    for entry in dataset["train"]:
+        try:
+            # Extract the genre and chord string from the current entry
+            genre = entry["main_genre"]
+            chord_string = entry.get("chords", "")
+
+            # Skip entries with invalid or missing data
+            if not genre or genre not in main_genres or not chord_string:
+                continue
+
+            chord_sequence = extract_chord_sequence(chord_string, vocabulary)
+
+            if chord_sequence:
+                genre_start_counts[genre][chord_sequence[0]] += 1
+
+        # Handle potential errors in the dataset entry
+        except (KeyError, TypeError, AttributeError):
+            continue
+
+    return genre_start_counts
@@ -2,7 +2,7 @@ from Transition_Matrices.Data_Processor.extract_chord_sequence import extract_ch
 from Transition_Matrices.Data_Processor.initialize_genre_data_structures import initialize_genre_data_structures
 
 
-def process_songs_and_count_transitions(dataset, main_genres):
+def process_songs_and_count_transitions(dataset, main_genres, vocabulary=None):
     """
     Processes a dataset of songs and counts chord transitions for specified genres.
 
@@ -17,6 +17,8 @@ def process_songs_and_count_transitions(dataset, main_genres):
                         - 'chords' (str): A string of chords separated by spaces.
         main_genres (list or tuple): A list or tuple of genres to process. Only songs belonging to these genres
                                      will be included in the transition counting.
+        vocabulary (ChordVocabulary, optional): If provided, chords are keyed by their canonical
+            ids instead of strings.
 
     Returns:
         dict: A nested dictionary where:
@@ -46,7 +48,7 @@ def process_songs_and_count_transitions(dataset, main_genres):
                 continue
 
             # Extract the sequence of chords from the chord string
-            chord_sequence = extract_chord_sequence(chord_string)
+            chord_sequence = extract_chord_sequence(chord_string, vocabulary)
 
             # Skip sequences with fewer than two chords
             if len(chord_sequence) < 2:
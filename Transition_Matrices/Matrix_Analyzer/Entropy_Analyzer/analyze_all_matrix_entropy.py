@@ -0,0 +1,100 @@
+import os
+
+from Markov_Chains.ngram_matrix_loader import NGramMatrixLoader
+from Transition_Matrices.Matrix_Analyzer.Entropy_Analyzer.analyze_matrix_entropy import analyze_matrix_entropy
+from Transition_Matrices.Matrix_Analyzer.run_analysis_tasks import run_analysis_tasks
+from Transition_Matrices.Matrix_Optimizer.evaluate_held_out_log_likelihood import evaluate_held_out_log_likelihood
+from Utils.ngram_matrices_paths import get_ngram_matrices_path, list_ngram_orders
+
+
+def analyze_all_matrix_entropy(ngram_sizes=None, held_out_songs=None, workers=None):
+    """
+    Analyze the row entropy and branching factor of every genre and n-gram matrix.
+
+    This function scans the directory of each n-gram size for genre matrices, computes their
+    entropy statistics with analyze_matrix_entropy and prints one table per genre with a row
+    per order, to weigh what each order adds against the memory it takes. With held-out songs,
+    each order is also scored by the perplexity of the back-off model truncated at that order,
+    i.e. the model the generator samples from with that order as its highest.
+
+    Args:
+        ngram_sizes (list of int, optional): List of n-gram sizes to analyze. Defaults to every
+            order with a matrices directory.
+        held_out_songs (list, optional): Song records with 'chords' and 'main_genre' fields that
+            were not used to build the models. Defaults to None, skipping perplexity.
+        workers (int, optional): Number of worker processes analyzing matrices in parallel.
+            Defaults to None, analyzing them one after another.
+
+    Returns:
+        dict: Dictionary mapping each genre (str) to its list of statistics dictionaries, one per
+            order, as returned by analyze_matrix_entropy. With held-out songs, each also has the
+            'perplexity' and 'coverage' of the truncated model and the number of 'held_out_chords'.
+
+    Raises:
+        ValueError: If `workers` is below 1.
+    """
+    if ngram_sizes is None:
+        ngram_sizes = list_ngram_orders()
+
+    # Find the genres with a matrix for each n-gram size
+    tasks = []
+    for n in sorted(ngram_sizes):
+        matrices_path = get_ngram_matrices_path(n)
+
+        if not os.path.exists(matrices_path):
+            print(f"Warning: {n}-gram matrices directory not found, skipping...")
+            continue
+
+        for filename in sorted(os.listdir(matrices_path)):
+            if filename.startswith("transition_matrix_") and filename.endswith(".npz"):
+                tasks.append((filename[len("transition_matrix_"):-len(".npz")], n))
+
+    # Analyze every (genre, n-gram size) pair, in parallel if requested
+    all_stats = {}
+    for stats in run_analysis_tasks(analyze_matrix_entropy, tasks, workers):
+        if stats:
+            all_stats.setdefault(stats["genre"], []).append(stats)
+
+    if held_out_songs is not None:
+        for genre, genre_stats in all_stats.items():
+            _add_held_out_perplexity(genre, genre_stats, held_out_songs)
+
+    # Print report header
+    print("=" * 80)
+    print("N-GRAM MATRIX ENTROPY REPORT")
+    print("=" * 80)
+
+    for genre in sorted(all_stats):
+        print(f"\n🎵 {genre.upper()}")
+        print(f"{'order':>5} | {'contexts':>15} | {'branching':>9} | {'H mean':>6} | {'H p50':>6} | {'H p90':>6} | "
+              f"{'eff. br.':>8} | {'size':>9} | {'perplexity':>10} | {'coverage':>8}")
+
+        for stats in all_stats[genre]:
+            perplexity = f"{stats['perplexity']:>10.2f}" if "perplexity" in stats else f"{'-':>10}"
+            coverage = f"{stats['coverage']:>8.1%}" if "coverage" in stats else f"{'-':>8}"
+
+            print(f"{stats['n']:>5} | {stats['active_contexts']:>7}/{stats['states']:<7} | "
+                  f"{stats['mean_branching']:>9.2f} | {stats['mean_entropy']:>6.2f} | "
+                  f"{stats['entropy_percentiles'][50]:>6.2f} | {stats['entropy_percentiles'][90]:>6.2f} | "
+                  f"{stats['mean_effective_branching']:>8.2f} | {stats['matrix_bytes'] / 1024 ** 2:>6.2f} MB | "
+                  f"{perplexity} | {coverage}")
+
+    return all_stats
+
+
+def _add_held_out_perplexity(genre, genre_stats, held_out_songs):
+    """
+    Scores a genre's held-out songs with the model truncated at each analyzed order.
+
+    Args:
+        genre (str): The genre whose models are scored.
+        genre_stats (list): The genre's statistics dictionaries, updated in place.
+        held_out_songs (list): Song records; songs of other genres are skipped.
+    """
+    songs = [song for song in held_out_songs if song.get("main_genre", genre) == genre]
+    ngram_loader = NGramMatrixLoader(genre, max_order=max(stats["n"] for stats in genre_stats))
+    context_trie = ngram_loader.get_context_trie()
+
+    for stats in genre_stats:
+        scores = evaluate_held_out_log_likelihood(context_trie, ngram_loader.vocabulary, songs, max_order=stats["n"])
+        stats.update(perplexity=scores["perplexity"], coverage=scores["coverage"], held_out_chords=scores["chords"])
@@ -1,16 +1,18 @@
 import os
 import numpy as np
-import pickle
-from scipy.sparse import load_npz
 
-from Utils.path_constants import MATRICES_1_GRAM_PATH, MATRICES_2_GRAM_PATH, MATRICES_3_GRAM_PATH, MATRICES_4_GRAM_PATH
+from Transition_Matrices.Build_Manifest.load_matrix_metadata import load_matrix_metadata
+from Transition_Matrices.Build_Manifest.write_matrix_metadata import write_matrix_metadata
+from Transition_Matrices.Matrix_Analyzer.matrix_artifact_cache import get_matrix_artifact_cache
+from Utils.ngram_matrices_paths import get_ngram_matrices_path, list_ngram_orders
 
 def compare_matrix_versions(genre, n1=1, n2=2):
     """
     Compares two n-gram transition matrices for a given genre and n-gram sizes.
 
-    Loads the matrices and their mappings, calculates metrics such as size, density,
-    and element counts, and returns a summary dictionary.
+    Reads the shape, stored transitions and element counts from the models' metadata
+    sidecars (loading the matrices and mappings only for models without one), calculates
+    metrics such as size, density, and element counts, and returns a summary dictionary.
 
     Args:
         genre (str): The genre to compare matrices for.
@@ -20,36 +22,23 @@ def compare_matrix_versions(genre, n1=1, n2=2):
     Returns:
         dict or None: Dictionary containing comparison metrics, or None if an error occurs.
     """
-    ngram_paths = {
-        1: MATRICES_1_GRAM_PATH,
-        2: MATRICES_2_GRAM_PATH,
-        3: MATRICES_3_GRAM_PATH,
-        4: MATRICES_4_GRAM_PATH
-    }
-
-    if n1 not in ngram_paths or n2 not in ngram_paths:
+    try:
+        get_ngram_matrices_path(n1)
+        get_ngram_matrices_path(n2)
+    except ValueError:
         print(f"Error: Unsupported n-gram sizes {n1} or {n2}")
         return None
 
     try:
-        # Load matrices and mappings
-        matrix1, mappings1 = _load_matrix_and_mappings(genre, n1, ngram_paths)
-        matrix2, mappings2 = _load_matrix_and_mappings(genre, n2, ngram_paths)
+        # Read shapes, transition and element counts, from the metadata when possible
+        shape1, nnz1, elements1_count = _load_matrix_summary(genre, n1)
+        shape2, nnz2, elements2_count = _load_matrix_summary(genre, n2)
 
         # Calculate metrics
-        size1 = matrix1.shape[0] * matrix1.shape[1]
-        size2 = matrix2.shape[0] * matrix2.shape[1]
-
-        # Handle both dense and sparse matrices for density calculation
-        if hasattr(matrix1, "nnz"):
-            density1 = matrix1.nnz / size1
-        else:
-            density1 = np.count_nonzero(matrix1) / size1
-
-        if hasattr(matrix2, "nnz"):
-            density2 = matrix2.nnz / size2
-        else:
-            density2 = np.count_nonzero(matrix2) / size2
+        size1 = shape1[0] * shape1[1]
+        size2 = shape2[0] * shape2[1]
+        density1 = nnz1 / size1
+        density2 = nnz2 / size2
 
         element_type1 = "chords" if n1 == 1 else f"{n1}-grams"
         element_type2 = "chords" if n2 == 1 else f"{n2}-grams"
@@ -64,8 +53,8 @@ def compare_matrix_versions(genre, n1=1, n2=2):
             "density1": density1,
             "density2": density2,
             "density_change": (density2 - density1) / density1 if density1 > 0 else 0,
-            "elements1_count": len(mappings1.get("ngram_to_idx", mappings1.get("chord_to_idx", {}))),
-            "elements2_count": len(mappings2.get("ngram_to_idx", mappings2.get("chord_to_idx", {}))),
+            "elements1_count": elements1_count,
+            "elements2_count": elements2_count,
             "element_type1": element_type1,
             "element_type2": element_type2
         }
@@ -77,10 +66,11 @@ def compare_matrix_versions(genre, n1=1, n2=2):
 
 def compare_all_adjacent_ngrams(genre):
     """
-    Compares all adjacent n-gram sizes (1-gram to 4-gram) for a given genre.
+    Compares all adjacent n-gram sizes (1-gram up to the highest built order) for a given genre.
 
     Finds available n-gram sizes for the genre, then compares each adjacent pair
-    using `compare_matrix_versions`.
+    using `compare_matrix_versions`. An order compared with both of its neighbours is read
+    once; the genre's matrices are released from the artifact cache when it is done.
 
     Args:
         genre (str): The genre to compare matrices for.
@@ -88,19 +78,11 @@ def compare_all_adjacent_ngrams(genre):
     Returns:
         list: List of comparison dictionaries for each adjacent n-gram pair.
     """
-    ngram_sizes = [1, 2, 3, 4]
     available_sizes = []
 
-    ngram_paths = {
-        1: MATRICES_1_GRAM_PATH,
-        2: MATRICES_2_GRAM_PATH,
-        3: MATRICES_3_GRAM_PATH,
-        4: MATRICES_4_GRAM_PATH
-    }
-
     # Find which n-gram sizes are available for this genre
-    for n in ngram_sizes:
-        matrix_file = os.path.join(ngram_paths[n], f"transition_matrix_{genre}.npz")
+    for n in list_ngram_orders():
+        matrix_file = os.path.join(get_ngram_matrices_path(n), f"transition_matrix_{genre}.npz")
         if os.path.exists(matrix_file):
             available_sizes.append(n)
 
@@ -114,39 +96,66 @@ def compare_all_adjacent_ngrams(genre):
         if comparison:
             comparisons.append(comparison)
 
+    get_matrix_artifact_cache().release()
+
     return comparisons
 
 
-def _load_matrix_and_mappings(genre, n, ngram_paths):
+def _load_matrix_summary(genre, n):
     """
-    Loads the transition matrix and mappings for a given genre and n-gram size.
+    Returns the shape, number of non-zero elements and number of elements of a genre model.
 
-    Handles both sparse (.npz) and dense (.npy) matrix formats.
+    Reads the model's metadata sidecar, and loads the matrix and mappings only if the model
+    has no up-to-date sidecar, writing the sidecar of a sparse model for the next run.
 
     Args:
         genre (str): The genre to load data for.
         n (int): The n-gram size.
-        ngram_paths (dict): Mapping of n-gram sizes to their directory paths.
 
     Returns:
-        tuple: (matrix, mappings) where matrix is the transition matrix and mappings is the n-gram mapping dictionary.
+        tuple: (shape, nnz, elements_count).
+    """
+    matrices_path = get_ngram_matrices_path(n)
+    metadata = load_matrix_metadata(matrices_path, genre)
+
+    if metadata is not None:
+        return tuple(metadata["shape"]), metadata["nnz"], metadata["vocabulary_size"]
+
+    matrix, mappings = _load_matrix_and_mappings(genre, n)
+
+    if hasattr(matrix, "nnz"):
+        write_matrix_metadata(matrices_path, genre, n, matrix, mappings)
+
+    # Handle both dense and sparse matrices
+    nnz = matrix.nnz if hasattr(matrix, "nnz") else np.count_nonzero(matrix)
+
+    return matrix.shape, nnz, len(mappings.get("ngram_to_idx", mappings.get("chord_to_idx", {})))
+
+
+def _load_matrix_and_mappings(genre, n):
     """
-    matrices_path = ngram_paths[n]
+    Loads the transition matrix and mappings for a given genre and n-gram size.
+
+    Handles both sparse (.npz) and dense (.npy) matrix formats. The files are read through
+    the shared artifact cache, so an order compared with both of its neighbours is read once.
+
+    Args:
+        genre (str): The genre to load data for.
+        n (int): The n-gram size.
 
-    # Try .npz first (sparse format)
-    matrix_file = os.path.join(matrices_path, f"transition_matrix_{genre}.npz")
+    Returns:
+        tuple: (matrix, mappings) where matrix is the transition matrix and mappings is the n-gram mapping dictionary.
 
-    if os.path.exists(matrix_file):
-        matrix = load_npz(matrix_file)
-    else:
-        # Fallback to .npy (dense format)
-        matrix_file = os.path.join(matrices_path, f"transition_matrix_{genre}.npy")
-        matrix = np.load(matrix_file)
+    Raises:
+        FileNotFoundError: If the matrix or the mappings file does not exist.
+    """
+    cache = get_matrix_artifact_cache()
 
-    # Load mappings
-    mappings_file = os.path.join(matrices_path, f"ngram_mappings_{genre}.pkl")
+    # The cache tries .npz first (sparse format), then .npy (dense format)
+    matrix = cache.load_matrix(genre, n)
+    mappings = cache.load_mappings(genre, n)
 
-    with open(mappings_file, "rb") as f:
-        mappings = pickle.load(f)
+    if matrix is None or mappings is None:
+        raise FileNotFoundError(f"No {n}-gram matrix and mappings found for {genre}")
 
     return matrix, mappings
@@ -3,21 +3,27 @@ import numpy as np
 
 from Transition_Matrices.Matrix_Analyzer.Matrix_Comparison.compare_matrix_versions import compare_matrix_versions, \
     compare_all_adjacent_ngrams
-from Utils.path_constants import MATRICES_1_GRAM_PATH, MATRICES_2_GRAM_PATH, MATRICES_3_GRAM_PATH, MATRICES_4_GRAM_PATH
+from Transition_Matrices.Matrix_Analyzer.matrix_artifact_cache import get_matrix_artifact_cache
+from Transition_Matrices.Matrix_Analyzer.run_analysis_tasks import run_analysis_tasks
+from Utils.ngram_matrices_paths import get_ngram_matrices_path, list_ngram_orders
 
 
-def generate_comparison_report(ngram_sizes=None):
+def generate_comparison_report(ngram_sizes=None, workers=None):
     """
     Generate a unified comparison report for transition matrices across multiple n-gram sizes.
 
     This function scans directories for each n-gram size, identifies genres that have matrices
     for multiple n-gram sizes, and compares adjacent n-gram matrices (e.g., 1-gram vs 2-gram,
     2-gram vs 3-gram) for each genre. It provides detailed analysis of how matrix properties
-    change as n-gram order increases.
+    change as n-gram order increases. With `workers`, the genres are compared in a process
+    pool; the report is printed and returned in the same order as a serial run, and the
+    artifact cache counters of every worker are summed into its cache line.
 
     Args:
         ngram_sizes (list of int, optional): List of n-gram sizes to include in the comparison.
-            Must be values from [1, 2, 3, 4]. Defaults to [1, 2, 3, 4].
+            Must be positive integers. Defaults to every order with a matrices directory.
+        workers (int, optional): Number of worker processes comparing genres in parallel.
+            Defaults to None, comparing them one after another.
 
     Returns:
         dict: Dictionary mapping each comparable genre (str) to its list of comparison results.
@@ -27,17 +33,15 @@ def generate_comparison_report(ngram_sizes=None):
             - 'density_change': Percentage change in matrix density
             - 'element_type1', 'element_type2': Type of elements in each matrix
             - 'elements1_count', 'elements2_count': Number of elements in each matrix
+
+    Raises:
+        ValueError: If `workers` is below 1.
     """
     if ngram_sizes is None:
-        ngram_sizes = [1, 2, 3, 4]
+        ngram_sizes = list_ngram_orders()
 
-    # Map n-gram sizes to their corresponding directory paths
-    ngram_paths = {
-        1: MATRICES_1_GRAM_PATH,
-        2: MATRICES_2_GRAM_PATH,
-        3: MATRICES_3_GRAM_PATH,
-        4: MATRICES_4_GRAM_PATH
-    }
+    # Map n-gram sizes to their corresponding directory paths, skipping unsupported sizes
+    ngram_paths = {n: get_ngram_matrices_path(n) for n in ngram_sizes if isinstance(n, int) and n >= 1}
 
     # Track which n-gram sizes are available for each genre
     genre_availability = {}
@@ -69,14 +73,21 @@ def generate_comparison_report(ngram_sizes=None):
 
     all_comparisons = {}
 
-    # Generate comparisons for each genre
-    for genre in sorted(comparable_genres.keys()):
+    # Compare all adjacent n-gram pairs of every genre, in parallel if requested
+    genres = sorted(comparable_genres.keys())
+    genre_results = run_analysis_tasks(_compare_genre_with_cache_stats, [(genre,) for genre in genres], workers)
+
+    # Sum the artifact cache counters of every genre, wherever it was compared
+    cache_stats = {}
+    for _, genre_cache_stats in genre_results:
+        for key, value in genre_cache_stats.items():
+            cache_stats[key] = cache_stats.get(key, 0) + value
+
+    # Report the comparisons of each genre
+    for genre, (genre_comparisons, _) in zip(genres, genre_results):
         print(f"\n🎵 {genre.upper()}")
         print("-" * 40)
 
-        # Compare all adjacent n-gram pairs for this genre
-        genre_comparisons = compare_all_adjacent_ngrams(genre)
-
         if genre_comparisons:
             all_comparisons[genre] = genre_comparisons
 
@@ -116,9 +127,30 @@ def generate_comparison_report(ngram_sizes=None):
             print(f"Total genres analyzed: {len(all_comparisons)}")
             print(f"Total comparisons: {len(all_size_changes)}")
 
+    # Report the I/O the artifact caches saved, then reset this process's cache
+    cache = get_matrix_artifact_cache()
+    cache.report(cache_stats)
+    cache.clear()
+
     return all_comparisons
 
 
+def _compare_genre_with_cache_stats(genre):
+    """
+    Compares the adjacent n-gram sizes of a genre, in this process or a worker.
+
+    Returns:
+        tuple: (comparisons, cache_stats) where cache_stats holds the artifact cache counters
+            the genre added, since a worker's cache is not visible to the parent process.
+    """
+    cache = get_matrix_artifact_cache()
+    before = cache.get_stats()
+    comparisons = compare_all_adjacent_ngrams(genre)
+    after = cache.get_stats()
+
+    return comparisons, {key: after[key] - before[key] for key in after}
+
+
 def generate_specific_comparison_report(n1=1, n2=2):
     """
     Generate a comparison report between two specific n-gram sizes for all available genres.
@@ -128,9 +160,9 @@ def generate_specific_comparison_report(n1=1, n2=2):
     differences in matrix properties.
 
     Args:
-        n1 (int, optional): The first n-gram size to compare. Must be in [1, 2, 3, 4].
+        n1 (int, optional): The first n-gram size to compare. Must be a positive integer.
             Defaults to 1.
-        n2 (int, optional): The second n-gram size to compare. Must be in [1, 2, 3, 4].
+        n2 (int, optional): The second n-gram size to compare. Must be a positive integer.
             Defaults to 2.
 
     Returns:
@@ -145,16 +177,10 @@ def generate_specific_comparison_report(n1=1, n2=2):
             - 'element_type1', 'element_type2': Type of elements in each matrix
             - 'elements1_count', 'elements2_count': Number of elements in each matrix
     """
-    # Map n-gram sizes to their corresponding directory paths
-    ngram_paths = {
-        1: MATRICES_1_GRAM_PATH,
-        2: MATRICES_2_GRAM_PATH,
-        3: MATRICES_3_GRAM_PATH,
-        4: MATRICES_4_GRAM_PATH
-    }
-
-    # Validate input n-gram sizes
-    if n1 not in ngram_paths or n2 not in ngram_paths:
+    # Validate input n-gram sizes and map them to their directory paths
+    try:
+        ngram_paths = {n: get_ngram_matrices_path(n) for n in (n1, n2)}
+    except ValueError:
         print(f"Error: Unsupported n-gram sizes {n1} or {n2}")
         return []
 
@@ -165,7 +191,7 @@ def generate_specific_comparison_report(n1=1, n2=2):
     # Scan directory for first n-gram size
     if os.path.exists(ngram_paths[n1]):
         for f in os.listdir(ngram_paths[n1]):
-            if f.startswith("transition_matrix_") and f.endswith(".npy"):
+            if f.startswith("transition_matrix_") and f.endswith(".npz"):
                 # Extract genre name from filename
                 genre = f.replace("transition_matrix_", "").replace(".npz", "")
                 genres1.add(genre)
@@ -192,9 +218,11 @@ def generate_specific_comparison_report(n1=1, n2=2):
 
     comparisons = []
 
-    # Generate comparison for each common genre
+    # Generate comparison for each common genre, releasing its matrices before the next one
+    cache = get_matrix_artifact_cache()
     for genre in sorted(common_genres):
         comparison = compare_matrix_versions(genre, n1, n2)
+        cache.release()
         if comparison:
             comparisons.append(comparison)
 
@@ -219,4 +247,8 @@ def generate_specific_comparison_report(n1=1, n2=2):
         print(f"Average density change: {avg_density_change:+.1%}")
         print(f"Genres compared: {len(comparisons)}")
 
+    # Report the I/O the shared artifact cache saved and reset it
+    cache.report()
+    cache.clear()
+
     return comparisons
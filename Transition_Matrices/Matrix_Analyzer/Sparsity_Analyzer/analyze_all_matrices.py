@@ -2,21 +2,25 @@ import os
 import numpy as np
 
 from Transition_Matrices.Matrix_Analyzer.Sparsity_Analyzer.analyze_matrix_sparsity import analyze_matrix_sparsity
-from Utils.path_constants import MATRICES_1_GRAM_PATH, MATRICES_2_GRAM_PATH, MATRICES_3_GRAM_PATH, MATRICES_4_GRAM_PATH
+from Transition_Matrices.Matrix_Analyzer.run_analysis_tasks import run_analysis_tasks
+from Utils.ngram_matrices_paths import get_ngram_matrices_path, list_ngram_orders
 
 
-def analyze_all_matrices(ngram_sizes=None):
+def analyze_all_matrices(ngram_sizes=None, workers=None):
     """
     Analyze sparsity characteristics of all available transition matrices across n-gram sizes.
 
     This function scans directories for each specified n-gram size, identifies available genre
     matrices, and performs sparsity analysis on each one. It provides a comprehensive report
     showing matrix dimensions, density percentages, and active element counts for each genre
-    and n-gram size combination.
+    and n-gram size combination. With `workers`, the (genre, order) analyses run in a process
+    pool; the report is printed and returned in the same order as a serial run.
 
     Args:
-        ngram_sizes (list of int, optional): List of n-gram sizes to analyze. Must be values
-            from [1, 2, 3, 4]. Defaults to [1, 2, 3, 4] if not specified.
+        ngram_sizes (list of int, optional): List of n-gram sizes to analyze. Must be positive
+            integers. Defaults to every order with a matrices directory if not specified.
+        workers (int, optional): Number of worker processes analyzing matrices in parallel.
+            Defaults to None, analyzing them one after another.
 
     Returns:
         dict: Dictionary mapping n-gram sizes (int) to lists of statistics dictionaries.
@@ -27,36 +31,31 @@ def analyze_all_matrices(ngram_sizes=None):
             - 'active_ngrams': Number of n-grams with at least one transition
             - 'total_ngrams': Total number of possible n-grams in the matrix
             - 'sparsity': Float representing the percentage of zero elements (0.0-1.0)
+
+    Raises:
+        ValueError: If `workers` is below 1.
     """
     # Set default n-gram sizes if none provided
     if ngram_sizes is None:
-        ngram_sizes = [1, 2, 3, 4]
-
-    # Map n-gram sizes to their corresponding directory paths
-    ngram_paths = {
-        1: MATRICES_1_GRAM_PATH,
-        2: MATRICES_2_GRAM_PATH,
-        3: MATRICES_3_GRAM_PATH,
-        4: MATRICES_4_GRAM_PATH
-    }
+        ngram_sizes = list_ngram_orders()
 
     # Print report header
     print("=" * 80)
     print("UNIFIED N-GRAM MATRIX ANALYSIS REPORT")
     print("=" * 80)
 
-    # Dictionary to store all statistics organized by n-gram size
-    all_stats = {}
+    # Genres with a matrix for every available n-gram size
+    genres_by_size = {}
 
-    # Process each requested n-gram size
+    # Scan each requested n-gram size
     for n in ngram_sizes:
         # Validate that we have a path defined for this n-gram size
-        if n not in ngram_paths:
+        try:
+            matrices_path = get_ngram_matrices_path(n)
+        except ValueError:
             print(f"Warning: No path defined for {n}-gram matrices, skipping...")
             continue
 
-        matrices_path = ngram_paths[n]
-
         # Check if the directory exists
         if not os.path.exists(matrices_path):
             print(f"Warning: {n}-gram matrices directory not found, skipping...")
@@ -75,15 +74,26 @@ def analyze_all_matrices(ngram_sizes=None):
             print(f"No {n}-gram matrices found in {matrices_path}")
             continue
 
+        genres_by_size[n] = sorted(available_genres)
+
+    # Analyze every (genre, n-gram size) pair, in parallel if requested
+    tasks = [(genre, n) for n, genres in genres_by_size.items() for genre in genres]
+    task_stats = dict(zip(tasks, run_analysis_tasks(analyze_matrix_sparsity, tasks, workers)))
+
+    # Dictionary to store all statistics organized by n-gram size
+    all_stats = {}
+
+    # Report each n-gram size
+    for n, genres in genres_by_size.items():
         # Print section header for this n-gram size
         print(f"\n{n}-GRAM MATRICES ANALYSIS")
         print("-" * 50)
 
         # Collect statistics for all genres in this n-gram size
         ngram_stats = []
-        for genre in sorted(available_genres):
-            # Analyze sparsity for this specific genre and n-gram size
-            stats = analyze_matrix_sparsity(genre, n)
+        for genre in genres:
+            # Sparsity statistics of this specific genre and n-gram size
+            stats = task_stats[genre, n]
             if stats:
                 ngram_stats.append(stats)
 
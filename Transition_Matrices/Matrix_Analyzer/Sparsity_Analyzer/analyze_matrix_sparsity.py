@@ -2,7 +2,9 @@ import os
 import numpy as np
 import pickle
 
-from Utils.path_constants import MATRICES_1_GRAM_PATH, MATRICES_2_GRAM_PATH, MATRICES_3_GRAM_PATH, MATRICES_4_GRAM_PATH
+from Transition_Matrices.Build_Manifest.load_matrix_metadata import load_matrix_metadata
+from Transition_Matrices.Build_Manifest.write_matrix_metadata import write_matrix_metadata
+from Utils.ngram_matrices_paths import get_ngram_matrices_path
 
 
 def analyze_matrix_sparsity(genre, n=1):
@@ -12,12 +14,14 @@ def analyze_matrix_sparsity(genre, n=1):
     This function loads a transition matrix for the specified genre and n-gram size, calculates
     various sparsity metrics including density, active elements count, and matrix dimensions.
     It supports both sparse (.npz) and dense (.npy) matrix formats and provides comprehensive
-    statistics about the matrix structure.
+    statistics about the matrix structure. When the model has an up-to-date metadata sidecar,
+    the statistics are read from it and the matrix and mappings are not loaded at all;
+    otherwise the sidecar of a sparse model is written once the files are loaded.
 
     Args:
         genre (str): The musical genre to analyze (e.g., 'blues', 'jazz', 'rock').
             Must correspond to an existing matrix file in the appropriate directory.
-        n (int, optional): The n-gram size to analyze. Must be in [1, 2, 3, 4].
+        n (int, optional): The n-gram size to analyze. Must be a positive integer.
             Defaults to 1 (unigram/chord-level analysis).
 
     Returns:
@@ -32,26 +36,34 @@ def analyze_matrix_sparsity(genre, n=1):
             - 'active_ngrams': Number of n-grams that have at least one outgoing transition
             - 'total_ngrams': Total number of possible n-grams in the vocabulary
     """
-    # Map n-gram sizes to their corresponding directory paths
-    ngram_paths = {
-        1: MATRICES_1_GRAM_PATH,
-        2: MATRICES_2_GRAM_PATH,
-        3: MATRICES_3_GRAM_PATH,
-        4: MATRICES_4_GRAM_PATH
-    }
-
-    # Validate the requested n-gram size
-    if n not in ngram_paths:
+    # Validate the requested n-gram size and find its directory
+    try:
+        matrices_path = get_ngram_matrices_path(n)
+    except ValueError:
         print(f"Error: Unsupported n-gram size {n}")
         return None
 
-    matrices_path = ngram_paths[n]
-
     # Check if the directory exists for this n-gram size
     if not os.path.exists(matrices_path):
         print(f"Error: Matrices directory not found for {n}-gram: {matrices_path}")
         return None
 
+    # Every metric is recorded in the metadata sidecar written with the model
+    metadata = load_matrix_metadata(matrices_path, genre)
+    if metadata is not None:
+        total_elements = metadata["shape"][0] * metadata["shape"][1]
+
+        return {
+            "genre": genre,
+            "n": n,
+            "matrix_shape": tuple(metadata["shape"]),
+            "density": metadata["nnz"] / total_elements if total_elements else 0.0,
+            "non_zero_elements": metadata["nnz"],
+            "total_elements": total_elements,
+            "active_ngrams": metadata["active_rows"],
+            "total_ngrams": metadata["vocabulary_size"]
+        }
+
     try:
         # Attempt to load sparse matrix format (.npz) first
         matrix_file = os.path.join(matrices_path, f"transition_matrix_{genre}.npz")
@@ -74,6 +86,10 @@ def analyze_matrix_sparsity(genre, n=1):
         with open(mappings_file, "rb") as f:
             mappings = pickle.load(f)
 
+        # Record the sidecar, so the next analysis of the model skips loading it
+        if hasattr(matrix, "todense"):
+            write_matrix_metadata(matrices_path, genre, n, matrix, mappings)
+
         # Calculate sparsity metrics - handle both sparse and dense matrices
         if hasattr(matrix, "todense"):
             # Sparse matrix - use efficient sparse operations
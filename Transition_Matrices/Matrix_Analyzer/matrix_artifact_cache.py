@@ -0,0 +1,172 @@
+import os
+import pickle
+import threading
+
+import numpy as np
+from scipy.sparse import load_npz
+
+from Utils.ngram_matrices_paths import get_ngram_matrices_path
+
+
+class MatrixArtifactCache:
+    """
+    Process-wide cache of the transition matrices and mappings read by the matrix comparisons.
+
+    Every file is read and decompressed at most once while it is unchanged: entries are keyed
+    by path and checked against the file's size and modification time on every request, so a
+    model rebuilt during the session is read again. The cache counts the bytes it read and the
+    bytes it saved by answering repeated requests from memory. Worker processes of a parallel
+    analysis each hold their own cache.
+
+    Only analyses that read a file more than once should load through the cache, and they
+    should release it as soon as those repeats are over (e.g. after each genre), since every
+    cached matrix stays in memory until then.
+
+    Methods:
+        load_matrix(genre, n):
+            Returns a genre's transition matrix, sparse (.npz) or dense (.npy), or None.
+
+        load_mappings(genre, n):
+            Returns a genre's n-gram mappings, or None.
+
+        get_stats():
+            Returns the request, read and hit counts and the bytes read and saved.
+
+        report(stats=None):
+            Prints how much redundant I/O the cache, or the caches given stats, saved.
+
+        release():
+            Drops every cached artifact, keeping the counters.
+
+        clear():
+            Drops every cached artifact and resets the counters.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty cache.
+        """
+        self._artifacts = {}
+        self._lock = threading.Lock()
+        self.clear()
+
+    def load_matrix(self, genre, n):
+        """
+        Returns a genre's transition matrix, trying the sparse (.npz) file before the dense (.npy) one.
+
+        Args:
+            genre (str): The genre of the model.
+            n (int): The n-gram size.
+
+        Returns:
+            scipy.sparse.spmatrix or numpy.ndarray or None: The matrix, or None if neither file exists.
+        """
+        matrices_path = get_ngram_matrices_path(n)
+
+        matrix = self._load(os.path.join(matrices_path, f"transition_matrix_{genre}.npz"), load_npz)
+        if matrix is None:
+            matrix = self._load(os.path.join(matrices_path, f"transition_matrix_{genre}.npy"), np.load)
+
+        return matrix
+
+    def load_mappings(self, genre, n):
+        """
+        Returns a genre's n-gram mappings.
+
+        Args:
+            genre (str): The genre of the model.
+            n (int): The n-gram size.
+
+        Returns:
+            dict or None: The mappings, or None if the file does not exist.
+        """
+        def read_pickle(path):
+            with open(path, "rb") as f:
+                return pickle.load(f)
+
+        return self._load(os.path.join(get_ngram_matrices_path(n), f"ngram_mappings_{genre}.pkl"), read_pickle)
+
+    def get_stats(self):
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: 'requests', 'reads' and 'hits' counts, and 'bytes_read' and 'bytes_saved'.
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def report(self, stats=None):
+        """
+        Prints how much redundant I/O the cache saved, if it answered any request.
+
+        Args:
+            stats (dict, optional): Counters to report instead of this cache's, e.g. the
+                counters of worker processes summed by the caller. Defaults to None.
+        """
+        if stats is None:
+            stats = self.get_stats()
+
+        if not stats["requests"]:
+            return
+
+        print(f"\n✓ Artifact cache: {stats['reads']} files read ({stats['bytes_read'] / 1024 ** 2:.1f} MB), "
+              f"{stats['hits']} repeated loads avoided ({stats['bytes_saved'] / 1024 ** 2:.1f} MB not re-read)")
+
+    def release(self):
+        """
+        Drops every cached artifact, keeping the counters for the report.
+        """
+        with self._lock:
+            self._artifacts.clear()
+
+    def clear(self):
+        """
+        Drops every cached artifact and resets the counters.
+        """
+        with self._lock:
+            self._artifacts.clear()
+            self._stats = {"requests": 0, "reads": 0, "hits": 0, "bytes_read": 0, "bytes_saved": 0}
+
+    def _load(self, path, reader):
+        """
+        Returns the artifact at a path, reading it only if it is not cached or changed on disk.
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+
+        signature = (stat.st_size, stat.st_mtime_ns)
+
+        with self._lock:
+            self._stats["requests"] += 1
+            cached = self._artifacts.get(path)
+
+            if cached is not None and cached[0] == signature:
+                self._stats["hits"] += 1
+                self._stats["bytes_saved"] += stat.st_size
+                return cached[1]
+
+        artifact = reader(path)
+
+        with self._lock:
+            self._artifacts[path] = (signature, artifact)
+            self._stats["reads"] += 1
+            self._stats["bytes_read"] += stat.st_size
+
+        return artifact
+
+
+# Cache shared by every analyzer in the process
+_default_cache = MatrixArtifactCache()
+
+
+def get_matrix_artifact_cache():
+    """
+    Returns the process-wide MatrixArtifactCache.
+
+    Returns:
+        MatrixArtifactCache: The shared cache instance.
+    """
+    return _default_cache
@@ -0,0 +1,33 @@
+from concurrent.futures import ProcessPoolExecutor
+
+
+def run_analysis_tasks(function, tasks, workers=None):
+    """
+    Runs an analysis function over a list of tasks, optionally in a process pool.
+
+    Each task is a tuple of positional arguments, e.g. (genre, n). The results are returned
+    in the order of the tasks whatever order the workers finish in, so the parallel and the
+    serial runs build identical reports.
+
+    Args:
+        function (callable): Module-level analysis function, picklable for the workers.
+        tasks (list of tuple): Positional arguments of every call.
+        workers (int, optional): Number of worker processes. Defaults to None, running the
+            tasks one after another in this process.
+
+    Returns:
+        list: The result of every task, in task order.
+
+    Raises:
+        ValueError: If `workers` is below 1.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    if not workers or len(tasks) < 2:
+        return [function(*task) for task in tasks]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+        futures = [executor.submit(function, *task) for task in tasks]
+
+        return [future.result() for future in futures]
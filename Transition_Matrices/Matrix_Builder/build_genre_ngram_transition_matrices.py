@@ -1,8 +1,10 @@
 from Transition_Matrices.Data_Processor.process_songs_and_count_ngram_transitions import process_songs_and_count_ngram_transitions
-from Transition_Matrices.Matrix_Builder.create_transition_matrix import create_transition_matrix
+from Transition_Matrices.Matrix_Builder.build_ngram_transition_matrices_from_counts import \
+    build_ngram_transition_matrices_from_counts
+from Utils.chord_vocabulary import get_chord_vocabulary
 
 
-def build_genre_ngram_transition_matrices(dataset, main_genres, n=1, min_count=1):
+def build_genre_ngram_transition_matrices(dataset, main_genres, n=1, min_count=1, vocabulary=None):
     """
     Build n-gram transition matrices for multiple musical genres from a dataset.
 
@@ -25,6 +27,10 @@ def build_genre_ngram_transition_matrices(dataset, main_genres, n=1, min_count=1
         min_count (int, optional): Minimum transition count threshold for inclusion
             in the matrix. Transitions occurring fewer than this many times are
             filtered out to reduce noise. Defaults to 1.
+        vocabulary (ChordVocabulary, optional): Vocabulary used to intern chords while
+            counting. Enharmonic spellings are merged into one canonical chord, and the
+            returned mappings use canonical chord strings. Defaults to the process-wide
+            vocabulary.
 
     Returns:
         dict: Dictionary mapping genre names to their transition matrix data structures.
@@ -48,36 +54,12 @@ def build_genre_ngram_transition_matrices(dataset, main_genres, n=1, min_count=1
     if n < 1:
         raise ValueError("n must be at least 1")
 
-    # Extract n-gram transition counts for all specified genres from the dataset
-    # This processes the entire dataset and groups transitions by genre
-    genre_ngram_transitions = process_songs_and_count_ngram_transitions(dataset, main_genres, n)
-
-    # Dictionary to store successfully created transition matrices for each genre
-    transition_matrices = {}
-
-    # Process each genre's transition data to create normalized probability matrices
-    for genre, transitions in genre_ngram_transitions.items():
-        try:
-            # Create transition matrix with sparse format for memory efficiency
-            # min_count filtering removes rare transitions to reduce noise
-            matrix, ngram_to_idx, idx_to_ngram = create_transition_matrix(
-                transitions,
-                use_sparse=True,
-                min_count=min_count
-            )
+    if vocabulary is None:
+        vocabulary = get_chord_vocabulary()
 
-            # Store complete matrix data structure for this genre
-            # Includes matrix and both direction mappings for easy access
-            transition_matrices[genre] = {
-                "matrix": matrix,
-                "ngram_to_idx": ngram_to_idx,
-                "idx_to_ngram": idx_to_ngram
-            }
-
-        except ValueError as e:
-            # Handle genres with insufficient data gracefully
-            # Print warning but continue processing other genres
-            print(f"Warning: Could not create matrix for genre '{genre}': {e}")
-            continue
+    # Extract n-gram transition counts for all specified genres from the dataset
+    # This processes the entire dataset and groups transitions by genre, keyed by chord ids
+    genre_ngram_transitions = process_songs_and_count_ngram_transitions(dataset, main_genres, n, vocabulary)
 
-    return transition_matrices
+    # Create normalized probability matrices from the counts
+    return build_ngram_transition_matrices_from_counts(genre_ngram_transitions, vocabulary, min_count)
@@ -1,8 +1,11 @@
+from Transition_Matrices.Data_Processor.process_songs_and_count_start_states import process_songs_and_count_start_states
 from Transition_Matrices.Data_Processor.process_songs_and_count_transitions import process_songs_and_count_transitions
 from Transition_Matrices.Matrix_Builder.create_transition_matrix import create_transition_matrix
+from Transition_Matrices.Matrix_Builder.flatten_transition_counts import flatten_transition_counts
+from Utils.chord_vocabulary import get_chord_vocabulary
 
 
-def build_genre_transition_matrices(dataset, main_genres):
+def build_genre_transition_matrices(dataset, main_genres, vocabulary=None):
     """
     Builds transition matrices for each genre based on a dataset of songs.
 
@@ -17,15 +20,26 @@ def build_genre_transition_matrices(dataset, main_genres):
                         - 'chords' (str): A string of chords separated by spaces.
         main_genres (list or tuple): A list or tuple of genres to process. Only songs belonging to these genres
                                      will be included in the transition counting.
+        vocabulary (ChordVocabulary, optional): Vocabulary used to intern chords while counting,
+            merging enharmonic spellings. Defaults to the process-wide vocabulary.
 
     Returns:
         dict: A dictionary where each key is a genre, and the value is another dictionary containing:
               - 'matrix' (numpy.ndarray): The transition matrix for the genre.
-              - 'chord_to_idx' (dict): A mapping from chords to their indices in the matrix.
-              - 'idx_to_chord' (dict): A mapping from indices to their corresponding chords.
+              - 'chord_to_idx' (dict): A mapping from canonical chords to their indices in the matrix.
+              - 'idx_to_chord' (dict): A mapping from indices to their corresponding canonical chords.
+              - 'start_counts' (dict): How many songs open with each canonical chord.
+              - 'counts' (tuple): The raw transition counts as (states, rows, cols, counts) COO
+                triples over canonical chords, for persisting a count table.
     """
-    # Count chord transitions for each genre
-    genre_transitions = process_songs_and_count_transitions(dataset, main_genres)
+    if vocabulary is None:
+        vocabulary = get_chord_vocabulary()
+
+    # Count chord transitions for each genre, keyed by chord ids
+    genre_transitions = process_songs_and_count_transitions(dataset, main_genres, vocabulary)
+
+    # Count opening chords, recorded as the start-state distribution of each genre
+    genre_start_counts = process_songs_and_count_start_states(dataset, main_genres, vocabulary)
 
     # Initialize a dictionary to store transition matrices
     transition_matrices = {}
@@ -33,13 +47,17 @@ def build_genre_transition_matrices(dataset, main_genres):
     # Create a transition matrix for each genre
     for genre, transitions in genre_transitions.items():
         # Generate the transition matrix and chord mappings
-        matrix, chord_to_idx, idx_to_chord = create_transition_matrix(transitions)
+        matrix, chord_to_idx, idx_to_chord = create_transition_matrix(transitions, sort_key=vocabulary.decode)
+
+        states, rows, cols, counts = flatten_transition_counts(transitions)
 
-        # Store the results in the dictionary
+        # Store the results in the dictionary, decoding chord ids back to strings
         transition_matrices[genre] = {
             "matrix": matrix,
-            "chord_to_idx": chord_to_idx,
-            "idx_to_chord": idx_to_chord
+            "chord_to_idx": {vocabulary.decode(chord): idx for chord, idx in chord_to_idx.items()},
+            "idx_to_chord": {idx: vocabulary.decode(chord) for idx, chord in idx_to_chord.items()},
+            "start_counts": {vocabulary.decode(chord): count for chord, count in genre_start_counts[genre].items()},
+            "counts": ([vocabulary.decode(chord) for chord in states], rows, cols, counts)
         }
 
     return transition_matrices
@@ -0,0 +1,53 @@
+from Transition_Matrices.Matrix_Builder.create_transition_matrix_from_coo import create_transition_matrix_from_coo
+
+
+def build_ngram_transition_matrices_from_coo(genre_ngram_coo, vocabulary, min_count=1, genre_start_counts=None):
+    """
+    Build normalized n-gram transition matrices from transition counts in COO form.
+
+    Matrix construction step of the vectorized counting engine; mirrors
+    build_ngram_transition_matrices_from_counts for the dict-based counter.
+
+    Args:
+        genre_ngram_coo (dict): {genre: (states, rows, cols, counts)} as returned by
+            count_ngram_transitions_vectorized, with states holding chord ids from `vocabulary`.
+        vocabulary (ChordVocabulary): Vocabulary the chord ids belong to. Used to order and
+            decode the n-grams into canonical chord strings.
+        min_count (int, optional): Minimum transition count threshold for inclusion in the
+            matrix. Defaults to 1.
+        genre_start_counts (dict, optional): {genre: {opening_chord_id: count}}. If provided, the
+            decoded counts are stored under 'start_counts' for each genre.
+
+    Returns:
+        dict: Dictionary mapping genre names to their transition matrix data structures, in the
+            same structure as build_ngram_transition_matrices_from_counts.
+            Genres that fail matrix creation are excluded from the returned dictionary.
+    """
+    transition_matrices = {}
+
+    for genre, (states, rows, cols, counts) in genre_ngram_coo.items():
+        try:
+            matrix, ngram_to_idx, idx_to_ngram = create_transition_matrix_from_coo(
+                states, rows, cols, counts,
+                min_count=min_count,
+                sort_key=vocabulary.decode_ngram
+            )
+
+            # Store complete matrix data structure for this genre, decoded back to chord strings
+            transition_matrices[genre] = {
+                "matrix": matrix,
+                "ngram_to_idx": {vocabulary.decode_ngram(ngram): idx for ngram, idx in ngram_to_idx.items()},
+                "idx_to_ngram": {idx: vocabulary.decode_ngram(ngram) for idx, ngram in idx_to_ngram.items()}
+            }
+
+            if genre_start_counts is not None:
+                transition_matrices[genre]["start_counts"] = {
+                    vocabulary.decode(chord): count for chord, count in genre_start_counts.get(genre, {}).items()
+                }
+
+        except ValueError as e:
+            # Handle genres with insufficient data gracefully
+            print(f"Warning: Could not create matrix for genre '{genre}': {e}")
+            continue
+
+    return transition_matrices
@@ -0,0 +1,66 @@
+from Transition_Matrices.Matrix_Builder.create_transition_matrix import create_transition_matrix
+
+
+def build_ngram_transition_matrices_from_counts(genre_ngram_transitions, vocabulary, min_count=1,
+                                                genre_start_counts=None):
+    """
+    Build normalized n-gram transition matrices from already counted transitions.
+
+    Shared by the per-order builder and the single-pass multi-order pipeline, which count
+    transitions first and then build every genre's matrix from those counts.
+
+    Args:
+        genre_ngram_transitions (dict): {genre: {current_ngram: {next_ngram: count}}} with n-grams
+            keyed by chord ids from `vocabulary`.
+        vocabulary (ChordVocabulary): Vocabulary the chord ids belong to. Used to order and
+            decode the n-grams into canonical chord strings.
+        min_count (int, optional): Minimum transition count threshold for inclusion in the
+            matrix. Defaults to 1.
+        genre_start_counts (dict, optional): {genre: {opening_chord_id: count}}. If provided, the
+            decoded counts are stored under 'start_counts' for each genre.
+
+    Returns:
+        dict: Dictionary mapping genre names to their transition matrix data structures.
+            Structure: {
+                'genre_name': {
+                    'matrix': numpy.ndarray or scipy.sparse matrix - normalized transition matrix,
+                    'ngram_to_idx': dict - mapping from canonical n-grams to matrix indices,
+                    'idx_to_ngram': dict - mapping from matrix indices to canonical n-grams,
+                    'start_counts': dict - opening chord counts (only if genre_start_counts is given)
+                },
+                ...
+            }
+            Genres that fail matrix creation are excluded from the returned dictionary.
+    """
+    transition_matrices = {}
+
+    for genre, transitions in genre_ngram_transitions.items():
+        try:
+            # min_count filtering removes rare transitions to reduce noise
+            matrix, ngram_to_idx, idx_to_ngram = create_transition_matrix(
+                transitions,
+                use_sparse=True,
+                min_count=min_count,
+                sort_key=vocabulary.decode_ngram
+            )
+
+            # Store complete matrix data structure for this genre
+            # Includes matrix and both direction mappings, decoded back to chord strings
+            transition_matrices[genre] = {
+                "matrix": matrix,
+                "ngram_to_idx": {vocabulary.decode_ngram(ngram): idx for ngram, idx in ngram_to_idx.items()},
+                "idx_to_ngram": {idx: vocabulary.decode_ngram(ngram) for idx, ngram in idx_to_ngram.items()}
+            }
+
+            if genre_start_counts is not None:
+                transition_matrices[genre]["start_counts"] = {
+                    vocabulary.decode(chord): count for chord, count in genre_start_counts.get(genre, {}).items()
+                }
+
+        except ValueError as e:
+            # Handle genres with insufficient data gracefully
+            # Print warning but continue processing other genres
+            print(f"Warning: Could not create matrix for genre '{genre}': {e}")
+            continue
+
+    return transition_matrices
@@ -0,0 +1,79 @@
+import numpy as np
+from scipy.sparse import coo_matrix
+
+
+def create_transition_matrix_from_coo(states, rows, cols, counts, min_count=1, sort_key=None):
+    """
+    Create a probabilistic transition matrix from n-gram transition counts in COO form.
+
+    Shared construction path of create_transition_matrix and the vectorized counting engine:
+    the counts arrive as (row, col, count) triples over a list of states, so filtering,
+    re-indexing and row normalization are done with array operations and the CSR matrix is
+    built in a single conversion. Memory stays proportional to the number of transitions.
+
+    Args:
+        states (numpy.ndarray or list): Either a (num_states, n) integer array whose row k holds
+            the chord ids of state k, or a list whose item k is the n-gram key of state k.
+        rows (numpy.ndarray): Index of the current state of each transition.
+        cols (numpy.ndarray): Index of the next state of each transition.
+        counts (numpy.ndarray): Number of occurrences of each transition.
+        min_count (int, optional): Minimum transition count threshold for inclusion.
+            Transitions with counts below this value are filtered out to reduce noise.
+            Defaults to 1.
+        sort_key (callable, optional): Key used to order n-grams when assigning indices.
+            Pass the vocabulary's decode function, so indices follow the chord names rather
+            than the id order. Defaults to natural ordering.
+
+    Returns:
+        tuple: A 3-tuple containing:
+            - matrix (scipy.sparse.csr_matrix): The normalized transition matrix where
+              matrix[i,j] represents P(ngram_j | ngram_i). Each non-empty row sums to 1.0.
+            - ngram_to_idx (dict): Mapping from n-grams (a chord id for n=1, a tuple of chord
+              ids for n>1, or the keys given in `states`) to matrix row/column indices.
+            - idx_to_ngram (dict): Mapping from matrix indices back to n-grams.
+
+    Raises:
+        ValueError: If no transitions remain after filtering.
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    counts = np.asarray(counts)
+
+    # Apply minimum count filtering to reduce noise from rare transitions
+    keep = counts >= min_count
+    rows, cols, counts = rows[keep], cols[keep], counts[keep]
+
+    if rows.size == 0:
+        raise ValueError("No valid n-gram transitions found after filtering")
+
+    # Only states that take part in a surviving transition get an index
+    used_states, state_inverse = np.unique(np.concatenate([rows, cols]), return_inverse=True)
+
+    if not isinstance(states, np.ndarray):
+        ngrams = [states[i] for i in used_states.tolist()]
+    elif states.shape[1] == 1:
+        ngrams = states[used_states, 0].tolist()
+    else:
+        ngrams = [tuple(state) for state in states[used_states].tolist()]
+
+    # Sort n-grams for consistent indexing across runs
+    order = sorted(range(len(ngrams)), key=lambda i: ngrams[i] if sort_key is None else sort_key(ngrams[i]))
+    positions = np.empty(len(ngrams), dtype=np.int64)
+    positions[order] = np.arange(len(ngrams))
+
+    matrix_size = len(ngrams)
+    print(f"Creating matrix of size {matrix_size}x{matrix_size}")
+
+    matrix_rows = positions[state_inverse[:rows.size]]
+    matrix_cols = positions[state_inverse[rows.size:]]
+
+    # Normalize count to probability: P(ngram2 | ngram1) = count / row total
+    row_totals = np.bincount(matrix_rows, weights=counts, minlength=matrix_size)
+    probabilities = counts / row_totals[matrix_rows]
+
+    matrix = coo_matrix((probabilities, (matrix_rows, matrix_cols)), shape=(matrix_size, matrix_size)).tocsr()
+
+    idx_to_ngram = {idx: ngrams[i] for idx, i in enumerate(order)}
+    ngram_to_idx = {ngram: idx for idx, ngram in idx_to_ngram.items()}
+
+    return matrix, ngram_to_idx, idx_to_ngram
@@ -0,0 +1,68 @@
+import numpy as np
+from scipy.sparse import coo_matrix
+
+from Transition_Matrices.Matrix_Updater.split_ngram_state_keys import split_ngram_state_keys
+
+
+def derive_transition_matrix_from_counts(count_table, min_count=None, smoothing=None):
+    """
+    Derive a normalized transition matrix from a persisted count table.
+
+    With the table's own `min_count` and `smoothing` the result equals the saved model, so a
+    single count file serves every filtering and smoothing variant without recounting the
+    dataset. Only array operations over the non-zero counts are involved.
+
+    Args:
+        count_table (dict): A count table as returned by load_transition_counts.
+        min_count (int, optional): Minimum transition count threshold for inclusion. Defaults
+            to the threshold stored in the table.
+        smoothing (float, optional): Additive (Lidstone) smoothing constant added to every kept
+            transition count before normalization. It is applied over the observed successors
+            only, so the matrix stays as sparse as the counts. Defaults to the value stored in
+            the table.
+
+    Returns:
+        tuple: A 3-tuple containing:
+            - matrix (scipy.sparse.csr_matrix): The normalized transition matrix.
+            - ngram_to_idx (dict): Mapping from n-grams to matrix row/column indices.
+            - idx_to_ngram (dict): Mapping from matrix indices back to n-grams.
+
+    Raises:
+        ValueError: If `smoothing` is negative or no transitions remain after filtering.
+    """
+    if min_count is None:
+        min_count = count_table["min_count"]
+
+    if smoothing is None:
+        smoothing = count_table.get("smoothing", 0.0)
+
+    if smoothing < 0:
+        raise ValueError("smoothing must be non-negative")
+
+    counts = count_table["counts"].tocoo()
+
+    # Apply minimum count filtering to reduce noise from rare transitions
+    keep = counts.data >= min_count
+    rows, cols = counts.row[keep], counts.col[keep]
+    values = counts.data[keep] + smoothing
+
+    if rows.size == 0:
+        raise ValueError("No valid n-gram transitions found after filtering")
+
+    # Keep only the states of surviving transitions; the table order is already sorted
+    used_states, state_inverse = np.unique(np.concatenate([rows, cols]), return_inverse=True)
+    matrix_size = len(used_states)
+    matrix_rows = state_inverse[:rows.size]
+    matrix_cols = state_inverse[rows.size:]
+
+    # Normalize to probabilities: P(ngram2 | ngram1) = value / row total
+    row_totals = np.bincount(matrix_rows, weights=values, minlength=matrix_size)
+    matrix = coo_matrix(
+        (values / row_totals[matrix_rows], (matrix_rows, matrix_cols)),
+        shape=(matrix_size, matrix_size)
+    ).tocsr()
+
+    idx_to_ngram = dict(enumerate(split_ngram_state_keys(count_table["states"][used_states], count_table["n"])))
+    ngram_to_idx = {ngram: idx for idx, ngram in idx_to_ngram.items()}
+
+    return matrix, ngram_to_idx, idx_to_ngram
@@ -0,0 +1,36 @@
+import numpy as np
+
+
+def flatten_transition_counts(transitions):
+    """
+    Flattens nested transition counts into COO triples over a list of states.
+
+    Args:
+        transitions (dict): Dictionary mapping n-grams to their successor counts.
+            Structure: {ngram1: {ngram2: count, ngram3: count, ...}, ...}
+
+    Returns:
+        tuple: A 4-tuple containing:
+            - states (list): The n-grams, in first-seen order; triples refer to them by index.
+            - rows (numpy.ndarray): Index of the current state of each transition.
+            - cols (numpy.ndarray): Index of the next state of each transition.
+            - counts (numpy.ndarray): Number of occurrences of each transition.
+    """
+    state_to_position = {}
+    rows, cols, counts = [], [], []
+
+    for ngram1, next_ngrams in transitions.items():
+        # Skip malformed entries that don't have proper successor dictionaries
+        if not isinstance(next_ngrams, dict):
+            continue
+
+        rows.extend([state_to_position.setdefault(ngram1, len(state_to_position))] * len(next_ngrams))
+        cols.extend([state_to_position.setdefault(ngram2, len(state_to_position)) for ngram2 in next_ngrams])
+        counts.extend(next_ngrams.values())
+
+    return (
+        list(state_to_position),
+        np.array(rows, dtype=np.int64),
+        np.array(cols, dtype=np.int64),
+        np.array(counts, dtype=np.int64)
+    )
@@ -0,0 +1,102 @@
+import os
+
+from Transition_Matrices.Build_Manifest.record_build_manifest_entry import record_build_manifest_entry
+from Transition_Matrices.Build_Manifest.write_matrix_metadata import write_matrix_metadata
+from Transition_Matrices.Matrix_Builder.derive_transition_matrix_from_counts import derive_transition_matrix_from_counts
+from Transition_Matrices.Matrix_Updater.load_transition_counts import load_transition_counts
+from Transition_Matrices.Matrix_Updater.save_transition_counts import save_transition_counts
+from Transition_Matrices.Matrix_Updater.write_model_files_atomically import write_model_files_atomically
+from Utils.ngram_matrices_paths import get_ngram_matrices_path, list_ngram_orders
+
+
+def derive_transition_matrices_from_counts(ngram_sizes=None, genres_subset=None, min_count=None, smoothing=None,
+                                           output_path=None):
+    """
+    Re-derives the probability models from the persisted count tables, without the dataset.
+
+    Every genre with a count table is renormalized with the requested filtering and smoothing,
+    which takes seconds instead of a full recount. Models are written atomically.
+
+    Args:
+        ngram_sizes (list, optional): N-gram orders to derive. Defaults to every order with a
+            matrices directory.
+        genres_subset (list, optional): Genres to derive. Defaults to every genre with a count table.
+        min_count (int or dict, optional): Minimum transition count threshold, either one value
+            for every order or a dict mapping each order to its threshold. Defaults to the
+            threshold stored in each count table.
+        smoothing (float, optional): Additive smoothing constant added to every kept count.
+            Defaults to the value stored in each count table.
+        output_path (str, optional): Directory to write the derived variant into, using one
+            Matrices_{n}_Gram subdirectory per order. Defaults to None, replacing the models in
+            place; the count tables then record the new settings, so incremental updates keep
+            producing the same variant.
+
+    Returns:
+        dict: {n: [derived genres]}.
+    """
+    if ngram_sizes is None:
+        ngram_sizes = list_ngram_orders()
+
+    derived_models = {}
+
+    for n in ngram_sizes:
+        matrices_path = get_ngram_matrices_path(n)
+        target_path = matrices_path
+        if output_path is not None:
+            target_path = os.path.join(output_path, os.path.basename(matrices_path))
+        order_min_count = min_count.get(n) if isinstance(min_count, dict) else min_count
+
+        if not os.path.exists(matrices_path):
+            continue
+
+        genres = [
+            filename[len("transition_counts_"):-len(".npz")]
+            for filename in sorted(os.listdir(matrices_path))
+            if filename.startswith("transition_counts_") and filename.endswith(".npz")
+        ]
+
+        if genres_subset:
+            genres = [genre for genre in genres if genre in genres_subset]
+
+        os.makedirs(target_path, exist_ok=True)
+
+        for genre in genres:
+            table = load_transition_counts(matrices_path, genre)
+
+            try:
+                matrix, ngram_to_idx, idx_to_ngram = derive_transition_matrix_from_counts(
+                    table, order_min_count, smoothing
+                )
+            except ValueError as e:
+                print(f"Warning: Could not derive {genre} {n}-gram matrix: {e}")
+                continue
+
+            mappings = {"ngram_to_idx": ngram_to_idx, "idx_to_ngram": idx_to_ngram, "n": n}
+            if n == 1:
+                mappings["start_counts"] = table["start_counts"]
+
+            write_model_files_atomically(os.path.join(target_path, f"transition_matrix_{genre}.npz"),
+                                         os.path.join(target_path, f"ngram_mappings_{genre}.pkl"), matrix, mappings)
+
+            if output_path is None:
+                # Record the settings the in-place model now uses
+                counts = table["counts"].tocoo()
+                save_transition_counts(
+                    matrices_path, genre, n, table["states"], counts.row, counts.col, counts.data,
+                    start_counts=table["start_counts"] if n == 1 else None,
+                    min_count=table["min_count"] if order_min_count is None else order_min_count,
+                    smoothing=table["smoothing"] if smoothing is None else smoothing
+                )
+
+                # The model no longer has its build settings, so the next build must not skip it
+                record_build_manifest_entry(matrices_path, genre, None)
+
+            write_matrix_metadata(target_path, genre, n, matrix, mappings, {
+                "min_count": table["min_count"] if order_min_count is None else order_min_count,
+                "smoothing": table["smoothing"] if smoothing is None else smoothing
+            })
+
+            derived_models.setdefault(n, []).append(genre)
+            print(f"✓ Derived {genre} {n}-gram matrix ({matrix.shape}) from counts")
+
+    return derived_models
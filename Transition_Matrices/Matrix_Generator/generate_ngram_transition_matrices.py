@@ -1,58 +1,479 @@
 import os
 import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
-from datasets import load_dataset
+import numpy as np
 
-from Transition_Matrices.Matrix_Builder.build_genre_ngram_transition_matrices import \
-    build_genre_ngram_transition_matrices
-from Utils.path_constants import MATRICES_1_GRAM_PATH, MATRICES_2_GRAM_PATH, MATRICES_3_GRAM_PATH, MATRICES_4_GRAM_PATH
+from Transition_Matrices.Build_Manifest.get_build_code_version import get_build_code_version
+from Transition_Matrices.Build_Manifest.hash_genre_corpus_slices import hash_genre_corpus_slices
+from Transition_Matrices.Build_Manifest.is_artifact_up_to_date import is_artifact_up_to_date
+from Transition_Matrices.Build_Manifest.load_build_manifest import load_build_manifest
+from Transition_Matrices.Build_Manifest.record_build_manifest_entry import record_build_manifest_entry
+from Transition_Matrices.Build_Manifest.write_matrix_metadata import write_matrix_metadata
+from Transition_Matrices.Build_Profiler.build_profiler import BuildProfiler
+from Transition_Matrices.Data_Processor.count_ngram_transitions_vectorized import count_ngram_transitions_vectorized
+from Transition_Matrices.Data_Processor.count_start_states_vectorized import count_start_states_vectorized
+from Transition_Matrices.Data_Processor.encode_songs_to_token_arrays import encode_songs_to_token_arrays
+from Transition_Matrices.Data_Processor.process_song_batches_and_count_multi_order_transitions_vectorized import \
+    process_song_batches_and_count_multi_order_transitions_vectorized
+from Transition_Matrices.Data_Processor.process_songs_and_count_multi_order_transitions import \
+    process_songs_and_count_multi_order_transitions
+from Transition_Matrices.Data_Processor.process_songs_and_count_multi_order_transitions_vectorized import \
+    process_songs_and_count_multi_order_transitions_vectorized
+from Transition_Matrices.Matrix_Builder.build_ngram_transition_matrices_from_coo import \
+    build_ngram_transition_matrices_from_coo
+from Transition_Matrices.Matrix_Builder.build_ngram_transition_matrices_from_counts import \
+    build_ngram_transition_matrices_from_counts
+from Transition_Matrices.Matrix_Builder.flatten_transition_counts import flatten_transition_counts
+from Transition_Matrices.Matrix_Updater.save_transition_counts import save_transition_counts
+from Utils.Dataset_Utils.key_relative_split import KeyRelativeSplit
+from Utils.Dataset_Utils.load_chord_dataset import load_chord_dataset
+from Utils.chord_vocabulary import ChordVocabulary, get_chord_vocabulary
+from Utils.key_relative_chords import get_key_relative_vocabulary
+from Utils.ngram_matrices_paths import get_ngram_matrices_path
+from Utils.path_constants import KEY_RELATIVE_MATRICES_PATH, MATRICES_PATH
+from Utils.variable_constants import BUILD_PROFILE_FILE_NAME
 
 
-def generate_ngram_transition_matrices(genres_subset=None, ngram_sizes=None, batch_size=5, min_count=2):
+def generate_ngram_transition_matrices(genres_subset=None, ngram_sizes=None, batch_size=None, min_count=2,
+                                       engine="numpy", workers=None, streaming=False, chunk_size=10000,
+                                       corpus_path=None, force=False, key_relative=False, profile=False):
     """
     Generates n-gram transition matrices for specified n-gram sizes with filtering support.
+
+    The dataset is scanned once: every song is tokenized a single time and counted for all
+    requested orders (and, for 1-grams, its opening chord) before any matrix is built.
+
+    Every saved (genre, order) model is recorded in its order's build manifest with a hash of
+    the genre's songs, its build parameters and the build code version. Models whose entry
+    still matches are skipped, so an unchanged rebuild only makes the hashing scan, and a
+    build that was interrupted resumes with the models it had not completed.
+
+    Args:
+        genres_subset (list, optional): Genres to process. Defaults to every genre in the dataset.
+        ngram_sizes (list, optional): N-gram orders to generate. May include 1. Defaults to [2, 3, 4].
+        batch_size (int, optional): If set, genres are counted in batches of this size to bound
+            memory, at the cost of one dataset scan per batch.
+            Defaults to None, counting all genres in a single scan.
+        min_count (int or dict, optional): Minimum transition count threshold, either one value
+            for every order or a dict mapping each order to its threshold. Defaults to 2.
+        engine (str, optional): Counting engine. "numpy" encodes each genre as an integer token
+            array and counts every order with array operations; "python" uses the dict-based
+            counter. Both produce identical matrices. Defaults to "numpy".
+        workers (int, optional): If set, the corpus is partitioned by genre once and every
+            (genre, order) model is built and saved in a pool of this many worker processes,
+            always with the numpy engine. `batch_size` is not used in this mode. The saved
+            artifacts are the same as in the serial path. Defaults to None (serial).
+        streaming (bool, optional): If True, only the 'chords' and 'main_genre' columns are
+            streamed in record batches of `chunk_size` songs instead of loading the full dataset.
+            The numpy engine counts batch by batch and merges the counts, so memory depends on
+            the chunk size and the number of distinct transitions, not on the corpus size. With
+            `workers`, the genre partitions are still held as int32 token arrays. Defaults to False.
+        chunk_size (int, optional): Songs per streamed batch. Defaults to 10000.
+        corpus_path (str, optional): A local Parquet, CSV or JSON Lines file with 'chords' and
+            'main_genre' columns, or a directory of them, used instead of the Hugging Face
+            dataset. Files are read with pyarrow in chunks of `chunk_size` songs, fully offline.
+            Defaults to None.
+        force (bool, optional): If True, every model is rebuilt even if the build manifest marks
+            it as up to date. Defaults to False.
+        key_relative (bool, optional): If True, songs are encoded as key-relative tokens (see
+            to_key_relative_tokens), so the 12 transpositions of a progression share their
+            counts, and the models are saved under KEY_RELATIVE_MATRICES_PATH instead of
+            replacing the absolute ones. Load them with NGramMatrixLoader(key_relative=True).
+            Defaults to False.
+        profile (bool, optional): If True, the wall time, CPU time, traced and resident peak
+            memory and data sizes of every stage (load, hash, count, filter, build, save) and
+            every (genre, order) are recorded with a BuildProfiler and written to
+            build_profile.json next to the Matrices_{n}_Gram directories. The report is
+            updated after every stage, so a build killed for running out of memory still
+            shows how far it got. Tracing allocations slows the build down. Defaults to False.
+
+    Raises:
+        ValueError: If `engine` is not "numpy" or "python", or `workers` is below 1.
     """
     if ngram_sizes is None:
         ngram_sizes = [2, 3, 4]
+
+    if engine not in ("numpy", "python"):
+        raise ValueError(f"Unknown counting engine: {engine!r} (expected 'numpy' or 'python')")
+
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    # Key-relative models are a separate variant with its own directories and manifests
+    matrices_root = KEY_RELATIVE_MATRICES_PATH if key_relative else None
+    profiler = BuildProfiler(
+        enabled=profile,
+        report_path=os.path.join(matrices_root or MATRICES_PATH, BUILD_PROFILE_FILE_NAME) if profile else None
+    )
+
     try:
         print("Loading dataset...")
-        dataset = load_dataset("ailsntua/Chordonomicon")
+        with profiler.stage("load", streaming=streaming) as sizes:
+            dataset = load_chord_dataset(streaming=streaming, batch_size=chunk_size, corpus_path=corpus_path)
+            if not streaming and corpus_path is None:
+                sizes["songs"] = len(dataset["train"])
+        vocabulary = get_key_relative_vocabulary() if key_relative else get_chord_vocabulary()
 
-        print("Extracting genres...")
-        main_genres = set(entry["main_genre"] for entry in dataset["train"] if entry["main_genre"])
-        main_genres = list(main_genres)
+        if key_relative:
+            dataset = {"train": KeyRelativeSplit(dataset["train"])}
 
-        if genres_subset:
-            main_genres = [g for g in main_genres if g in genres_subset]
+        print("Hashing corpus slices...")
+        with profiler.stage("hash") as sizes:
+            genre_hashes = hash_genre_corpus_slices(dataset, list(genres_subset) if genres_subset else None)
+            sizes["genres"] = len(genre_hashes)
+        build_entries = _plan_ngram_builds(genre_hashes, ngram_sizes, min_count, force, matrices_root)
 
-        print(f"Found {len(main_genres)} genres to process")
+        if not build_entries:
+            print("✓ All matrices are up to date")
+            return
 
-        for n in ngram_sizes:
-            print(f"\nProcessing {n}-gram matrices...")
-            matrices_path = _get_matrices_path(n)
-            os.makedirs(matrices_path, exist_ok=True)
+        # Count only the genres and orders that have at least one model to (re)build
+        main_genres = sorted({genre for genre, n in build_entries})
+        ngram_sizes = sorted({n for genre, n in build_entries})
 
-            for i in range(0, len(main_genres), batch_size):
-                batch_genres = main_genres[i:i + batch_size]
-                print(f"Processing batch {i // batch_size + 1}: {batch_genres}")
+        if workers:
+            _generate_ngram_matrices_in_parallel(
+                dataset, vocabulary, main_genres, build_entries, workers, matrices_root, profiler
+            )
+            return
 
-                # CORRECT - includes min_count parameter
-                transition_matrices = build_genre_ngram_transition_matrices(
-                    dataset, batch_genres, n, min_count=min_count
-                )
+        if batch_size:
+            genre_batches = [main_genres[i:i + batch_size] for i in range(0, len(main_genres), batch_size)]
+        else:
+            genre_batches = [main_genres]
+
+        for batch_number, batch_genres in enumerate(genre_batches, 1):
+            print(f"Counting {ngram_sizes}-gram transitions in one pass with the {engine} engine "
+                  f"(batch {batch_number}: {batch_genres or "all genres"})...")
+
+            with profiler.stage("count", batch=batch_number, engine=engine) as sizes:
+                if engine == "numpy" and streaming:
+                    count_transitions = process_song_batches_and_count_multi_order_transitions_vectorized
+                    genre_ngram_transitions, genre_start_counts = count_transitions(
+                        dataset["train"].batches(), vocabulary, batch_genres, ngram_sizes
+                    )
+                    build_matrices = build_ngram_transition_matrices_from_coo
+                elif engine == "numpy":
+                    count_transitions = process_songs_and_count_multi_order_transitions_vectorized
+                    genre_ngram_transitions, genre_start_counts = count_transitions(
+                        dataset, vocabulary, batch_genres, ngram_sizes
+                    )
+                    build_matrices = build_ngram_transition_matrices_from_coo
+                else:
+                    genre_ngram_transitions, genre_start_counts = process_songs_and_count_multi_order_transitions(
+                        dataset, batch_genres, ngram_sizes, vocabulary
+                    )
+                    build_matrices = build_ngram_transition_matrices_from_counts
+
+                if profiler.enabled:
+                    sizes.update(_get_transition_count_sizes(genre_ngram_transitions, engine))
 
-                for genre, data in transition_matrices.items():
-                    _save_genre_ngram_matrices(genre, data, matrices_path, n)
+            print(f"Found {len(genre_start_counts)} genres to process")
+
+            for n in sorted(genre_ngram_transitions):
+                print(f"\nProcessing {n}-gram matrices...")
+                matrices_path = get_ngram_matrices_path(n, matrices_root)
+                os.makedirs(matrices_path, exist_ok=True)
+
+                # Release each order's counts, and each genre's, as soon as its matrices are built
+                order_counts = genre_ngram_transitions.pop(n)
+                order_min_count = min_count[n] if isinstance(min_count, dict) else min_count
+
+                for genre in batch_genres:
+                    if (genre, n) not in build_entries:
+                        continue
+
+                    genre_counts = order_counts.pop(genre, None)
+
+                    # Keep the raw counts, so new songs can later be merged in incrementally
+                    coo = genre_counts
+                    if engine == "python" and genre_counts is not None:
+                        coo = flatten_transition_counts(genre_counts)
+
+                    if profiler.enabled and coo is not None:
+                        with profiler.stage("filter", genre, n) as sizes:
+                            sizes["transitions"] = len(coo[3])
+                            sizes["kept_transitions"] = int(np.count_nonzero(np.asarray(coo[3]) >= order_min_count))
+
+                    with profiler.stage("build", genre, n) as sizes:
+                        transition_matrices = build_matrices(
+                            {genre: genre_counts} if genre_counts is not None else {},
+                            vocabulary,
+                            min_count=order_min_count,
+                            genre_start_counts=genre_start_counts if n == 1 else None
+                        )
+                        if genre in transition_matrices:
+                            sizes.update(_get_matrix_sizes(transition_matrices[genre]["matrix"]))
+
+                    if genre not in transition_matrices:
+                        artifacts = _remove_genre_artifacts(genre, matrices_path, n)
+                    else:
+                        with profiler.stage("save", genre, n) as sizes:
+                            saved = _save_genre_ngram_matrices(genre, transition_matrices[genre], matrices_path, n)
+                            saved = saved and _save_genre_transition_counts(
+                                genre, coo, vocabulary, matrices_path, n, order_min_count,
+                                genre_start_counts.get(genre) if n == 1 else None
+                            )
+                            artifacts = _get_genre_artifact_names(genre) if saved else None
+                            if saved:
+                                write_matrix_metadata(
+                                    matrices_path, genre, n, transition_matrices[genre]["matrix"],
+                                    transition_matrices[genre], {"min_count": order_min_count, "smoothing": 0.0}
+                                )
+                            if profiler.enabled and saved:
+                                sizes["artifact_bytes"] = _get_artifact_bytes(matrices_path, artifacts)
+
+                    # Record the model as soon as it is saved, so an interrupted build resumes after it
+                    if artifacts is not None:
+                        entry = dict(build_entries[genre, n], artifacts=artifacts)
+                        record_build_manifest_entry(matrices_path, genre, entry)
 
     except Exception as e:
         print(f"Error generating n-gram transition matrices: {e}")
         raise
 
+    finally:
+        profiler.write_report()
+
+
+def _plan_ngram_builds(genre_hashes, ngram_sizes, min_count, force, matrices_root=None):
+    """
+    Returns the build entry of every (genre, order) model that has to be (re)built, keyed by
+    (genre, n). Models whose manifest entry matches and whose artifacts exist are left out.
+    `matrices_root` is the root of the model variant, None for the built models.
+    """
+    code_version = get_build_code_version()
+    build_entries = {}
+    skipped = 0
+
+    for n in sorted(ngram_sizes):
+        matrices_path = get_ngram_matrices_path(n, matrices_root)
+        manifest = load_build_manifest(matrices_path)
+
+        for genre, corpus_hash in sorted(genre_hashes.items()):
+            entry = {
+                "corpus_hash": corpus_hash,
+                "n": n,
+                "min_count": min_count[n] if isinstance(min_count, dict) else min_count,
+                "code_version": code_version
+            }
+
+            if not force and is_artifact_up_to_date(manifest, matrices_path, genre, entry):
+                skipped += 1
+            else:
+                build_entries[genre, n] = entry
+
+    if skipped:
+        print(f"✓ Skipping {skipped} up-to-date models")
+
+    return build_entries
+
+
+def _get_genre_artifact_names(genre):
+    """
+    Returns the file names of the artifacts saved for one genre model.
+    """
+    return [f"transition_matrix_{genre}.npz", f"ngram_mappings_{genre}.pkl", f"transition_counts_{genre}.npz"]
+
+
+def _remove_genre_artifacts(genre, matrices_path, n):
+    """
+    Removes the artifacts of an earlier build of a genre model whose transitions are now all
+    filtered out, with their metadata sidecar, so the directory matches a fresh build.
+    Returns the (empty) artifact list.
+    """
+    for file_name in _get_genre_artifact_names(genre) + [f"matrix_metadata_{genre}.json"]:
+        file_path = os.path.join(matrices_path, file_name)
+        if os.path.exists(file_path):
+            os.remove(file_path)
+            print(f"✓ Removed outdated {genre} {n}-gram artifact {file_name}")
+
+    return []
+
+
+def _generate_ngram_matrices_in_parallel(dataset, vocabulary, main_genres, build_entries, workers, matrices_root=None,
+                                         profiler=None):
+    """
+    Partitions the corpus by genre in one scan, then builds and saves every planned (genre, order)
+    model in a process pool. Workers receive the genre's token arrays and a snapshot of the
+    vocabulary, so no dataset access happens outside the parent process. Completed models are
+    recorded in the build manifest by the parent, one at a time. With an enabled profiler, every
+    worker profiles its own stages and the parent collects the records.
+    """
+    if profiler is None:
+        profiler = BuildProfiler(enabled=False)
+
+    print("Partitioning songs by genre...")
+    with profiler.stage("partition") as sizes:
+        genre_token_arrays = encode_songs_to_token_arrays(dataset, vocabulary, main_genres)
+        sizes["token_bytes"] = sum(tokens.nbytes + lengths.nbytes for tokens, lengths in genre_token_arrays.values())
+    print(f"Found {len(genre_token_arrays)} genres to process with {workers} workers")
+
+    chords = vocabulary.chords
+
+    for n in {n for genre, n in build_entries}:
+        os.makedirs(get_ngram_matrices_path(n, matrices_root), exist_ok=True)
+
+    # Largest genres first, so the longest tasks do not start last
+    genres = sorted(genre_token_arrays, key=lambda g: genre_token_arrays[g][0].size, reverse=True)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for genre in genres:
+            tokens, lengths = genre_token_arrays.pop(genre)
+            # Chord ids fit in int32, which halves the data sent to each worker
+            tokens = tokens.astype(np.int32)
+
+            for (entry_genre, n), entry in sorted(build_entries.items()):
+                if entry_genre != genre:
+                    continue
+
+                future = executor.submit(
+                    _build_and_save_genre_ngram_matrix,
+                    genre, tokens, lengths, n, entry["min_count"], chords, get_ngram_matrices_path(n, matrices_root),
+                    profiler.enabled
+                )
+                futures[future] = (genre, n)
+
+        for future in as_completed(futures):
+            genre, n = futures[future]
+            try:
+                artifacts, records = future.result()
+            except Exception as e:
+                print(f"✗ Failed to build {genre} {n}-gram: {e}")
+                continue
+
+            profiler.extend(records)
+
+            if artifacts is not None:
+                record_build_manifest_entry(
+                    get_ngram_matrices_path(n, matrices_root), genre, dict(build_entries[genre, n], artifacts=artifacts)
+                )
+
+
+def _build_and_save_genre_ngram_matrix(genre, tokens, lengths, n, min_count, chords, matrices_path, profile=False):
+    """
+    Worker task: counts, builds and saves one genre's n-gram matrix from its token arrays.
+    Returns the names of the saved artifacts (empty if no transition survived, None if saving
+    failed) and the worker's stage records (empty unless `profile`).
+    """
+    vocabulary = ChordVocabulary(chords)
+    profiler = BuildProfiler(enabled=profile)
+
+    with profiler.stage("count", genre, n, token_bytes=tokens.nbytes + lengths.nbytes) as sizes:
+        genre_start_counts = {genre: count_start_states_vectorized(tokens, lengths)} if n == 1 else None
+        coo = count_ngram_transitions_vectorized(tokens, lengths, n)
+        if profile:
+            sizes.update(_get_transition_count_sizes({n: {genre: coo}}, "numpy"))
+
+    if profile:
+        with profiler.stage("filter", genre, n) as sizes:
+            sizes["transitions"] = len(coo[3])
+            sizes["kept_transitions"] = int(np.count_nonzero(coo[3] >= min_count))
+
+    with profiler.stage("build", genre, n) as sizes:
+        transition_matrices = build_ngram_transition_matrices_from_coo(
+            {genre: coo},
+            vocabulary,
+            min_count=min_count,
+            genre_start_counts=genre_start_counts
+        )
+        if genre in transition_matrices:
+            sizes.update(_get_matrix_sizes(transition_matrices[genre]["matrix"]))
+
+    if genre not in transition_matrices:
+        return _remove_genre_artifacts(genre, matrices_path, n), profiler.records
+
+    with profiler.stage("save", genre, n) as sizes:
+        saved = _save_genre_ngram_matrices(genre, transition_matrices[genre], matrices_path, n)
+        saved = saved and _save_genre_transition_counts(
+            genre, coo, vocabulary, matrices_path, n, min_count,
+            genre_start_counts[genre] if n == 1 else None
+        )
+        artifacts = _get_genre_artifact_names(genre) if saved else None
+        if saved:
+            write_matrix_metadata(
+                matrices_path, genre, n, transition_matrices[genre]["matrix"], transition_matrices[genre],
+                {"min_count": min_count, "smoothing": 0.0}
+            )
+        if profile and saved:
+            sizes["artifact_bytes"] = _get_artifact_bytes(matrices_path, artifacts)
+
+    return artifacts, profiler.records
+
+
+def _get_transition_count_sizes(genre_ngram_transitions, engine):
+    """
+    Returns the number of distinct transitions and states of every order's counts, over all
+    genres, and for the numpy engine the bytes of their COO arrays.
+    """
+    sizes = {}
+
+    for n, genre_counts in genre_ngram_transitions.items():
+        if engine == "numpy":
+            sizes[f"{n}_gram_transitions"] = sum(len(coo[3]) for coo in genre_counts.values())
+            sizes[f"{n}_gram_states"] = sum(len(coo[0]) for coo in genre_counts.values())
+            sizes[f"{n}_gram_bytes"] = sum(
+                sum(np.asarray(array).nbytes for array in coo) for coo in genre_counts.values()
+            )
+        else:
+            sizes[f"{n}_gram_transitions"] = sum(
+                len(successors) for transitions in genre_counts.values() for successors in transitions.values()
+            )
+            sizes[f"{n}_gram_states"] = sum(len(transitions) for transitions in genre_counts.values())
+
+    return sizes
+
+
+def _get_matrix_sizes(matrix):
+    """
+    Returns the shape, number of stored transitions and bytes of a built sparse matrix.
+    """
+    sizes = {"states": matrix.shape[0], "nnz": int(matrix.nnz)}
+
+    if hasattr(matrix, "indptr"):
+        sizes["matrix_bytes"] = matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+
+    return sizes
+
+
+def _get_artifact_bytes(matrices_path, artifacts):
+    """
+    Returns the total size on disk of a model's saved artifacts.
+    """
+    return sum(os.path.getsize(os.path.join(matrices_path, file_name)) for file_name in artifacts)
+
+
+def _save_genre_transition_counts(genre, coo, vocabulary, matrices_path, n, min_count, start_counts=None):
+    """
+    Saves the raw transition counts of a genre model as its count table, keyed by chord names.
+    `coo` holds (states, rows, cols, counts) with states as chord ids, either as an array or as
+    a list of n-gram keys. Returns True if the table was saved.
+    """
+    try:
+        states, rows, cols, counts = coo
+        chords = np.array(vocabulary.chords, dtype=str)
+        state_ids = np.array(states, dtype=np.int64).reshape(len(states), n)
+
+        save_transition_counts(
+            matrices_path, genre, n, chords[state_ids], rows, cols, counts,
+            start_counts={vocabulary.decode(chord): count for chord, count in (start_counts or {}).items()} or None,
+            min_count=min_count
+        )
+
+        print(f"✓ Saved {genre} {n}-gram transition counts")
+        return True
+
+    except Exception as e:
+        print(f"✗ Failed to save {genre} {n}-gram counts: {e}")
+        return False
+
 
 def _save_genre_ngram_matrices(genre, data, matrices_path, n):
     """
     Saves the n-gram transition matrix and mappings using unified naming convention.
-    Always saves as .npz format for consistency.
+    Always saves as .npz format for consistency. Returns True if both files were saved.
     """
     try:
         from scipy.sparse import save_npz, csr_matrix
@@ -70,37 +491,27 @@ def _save_genre_ngram_matrices(genre, data, matrices_path, n):
 
         print(f"✓ Saved {genre} {n}-gram matrix (.npz)")
 
-        # Save mappings (unchanged)
+        # Save mappings, with the start-state counts when the builder recorded them
+        mappings = {
+            "ngram_to_idx": data["ngram_to_idx"],
+            "idx_to_ngram": data["idx_to_ngram"],
+            "n": n
+        }
+
+        if "start_counts" in data:
+            mappings["start_counts"] = data["start_counts"]
+
         mappings_file = os.path.join(matrices_path, f"ngram_mappings_{genre}.pkl")
         with open(mappings_file, "wb") as f:
-            pickle.dump({
-                "ngram_to_idx": data["ngram_to_idx"],
-                "idx_to_ngram": data["idx_to_ngram"],
-                "n": n
-            }, f)
+            pickle.dump(mappings, f)
 
         element_type = "chords" if n == 1 else f"{n}-grams"
         matrix_shape = data["matrix"].shape
         total_elements = len(data["ngram_to_idx"])
 
         print(f"✓ Saved {genre} {n}-gram mappings ({matrix_shape}) - {total_elements} {element_type}")
+        return True
 
     except Exception as e:
         print(f"✗ Failed to save {genre} {n}-gram: {e}")
-
-
-def _get_matrices_path(n):
-    """
-    Returns the appropriate matrices path for a given n-gram size.
-    """
-    ngram_paths = {
-        1: MATRICES_1_GRAM_PATH,
-        2: MATRICES_2_GRAM_PATH,
-        3: MATRICES_3_GRAM_PATH,
-        4: MATRICES_4_GRAM_PATH
-    }
-
-    if n not in ngram_paths:
-        raise ValueError(f"Unsupported n-gram size: {n}")
-
-    return ngram_paths[n]
\ No newline at end of file
+        return False
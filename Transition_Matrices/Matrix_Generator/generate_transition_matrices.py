@@ -1,12 +1,14 @@
 import os
 import pickle
-from datasets import load_dataset
 
 from Transition_Matrices.Matrix_Builder.build_genre_transition_matrices import build_genre_transition_matrices
+from Transition_Matrices.Matrix_Generator.generate_ngram_transition_matrices import generate_ngram_transition_matrices
+from Transition_Matrices.Matrix_Updater.save_transition_counts import save_transition_counts
+from Utils.Dataset_Utils.load_chord_dataset import load_chord_dataset
 from Utils.path_constants import MATRICES_1_GRAM_PATH
 
 
-def generate_transition_matrices(genres_subset=None, batch_size=5):
+def generate_transition_matrices(genres_subset=None, batch_size=5, workers=None, streaming=False, corpus_path=None):
     """
     Generates transition matrices for a subset of genres from a dataset.
 
@@ -19,13 +21,31 @@ def generate_transition_matrices(genres_subset=None, batch_size=5):
                                         in the dataset are processed. Defaults to None.
         batch_size (int, optional): The number of genres to process in each batch.
                                     Defaults to 10.
+        workers (int, optional): If set, genres are built in parallel on a pool of this many
+                                 worker processes instead of in serial batches. The saved
+                                 matrices and mappings are the same. Defaults to None.
+        streaming (bool, optional): If True, only the 'chords' and 'main_genre' columns are
+                                    streamed in record batches with bounded memory, through the
+                                    n-gram pipeline. The saved artifacts are the same. Defaults to False.
+        corpus_path (str, optional): A local Parquet, CSV or JSON Lines file with 'chords' and
+                                     'main_genre' columns, or a directory of them, used instead
+                                     of the Hugging Face dataset. Defaults to None.
 
     Raises:
         Exception: If an error occurs during dataset loading, matrix generation, or saving.
     """
+    if workers or streaming:
+        # The n-gram pipeline builds the same 1-gram artifacts, keeping every transition
+        generate_ngram_transition_matrices(
+            genres_subset, ngram_sizes=[1], min_count=1, workers=workers, streaming=streaming,
+            corpus_path=corpus_path
+        )
+        print(f"All matrices saved to: {MATRICES_1_GRAM_PATH}")
+        return
+
     try:
         print("Loading dataset...")
-        dataset = load_dataset("ailsntua/Chordonomicon")
+        dataset = load_chord_dataset(corpus_path=corpus_path)
 
         print("Extracting genres...")
         main_genres = set(entry["main_genre"] for entry in dataset["train"] if entry[""'main_genre'])
@@ -77,10 +97,20 @@ def _save_genre_matrices(genre, data):
             pickle.dump({
                 "ngram_to_idx": data["chord_to_idx"],
                 "idx_to_ngram": data["idx_to_chord"],
+                "start_counts": data.get("start_counts", {}),
                 "n": 1
             }, f)
 
         print(f"✓ Saved {genre} 1-gram matrix ({data["matrix"].shape}) - {len(data["chord_to_idx"])} chords")
 
+        # Keep the raw counts, so the model can be re-derived or updated without the dataset
+        if "counts" in data:
+            states, rows, cols, counts = data["counts"]
+            save_transition_counts(
+                MATRICES_1_GRAM_PATH, genre, 1, states, rows, cols, counts,
+                start_counts=data.get("start_counts"),
+                min_count=1
+            )
+
     except Exception as e:
         print(f"✗ Failed to save {genre}: {e}")
\ No newline at end of file
@@ -1,32 +1,41 @@
-from Transition_Matrices.Matrix_Generator.generate_transition_matrices import generate_transition_matrices
 from Transition_Matrices.Matrix_Generator.generate_ngram_transition_matrices import generate_ngram_transition_matrices
 from Transition_Matrices.Matrix_Analyzer.Sparsity_Analyzer.analyze_all_matrices import analyze_all_matrices
 
 
-def create_transition_matrices_with_variants(genres_subset=None, include_ngrams=True, ngram_sizes=[2, 3, 4]):
+def create_transition_matrices_with_variants(genres_subset=None, include_ngrams=True, ngram_sizes=[2, 3, 4],
+                                             force=False, profile=False):
     """
     Create transition matrices using unified n-gram architecture.
 
+    The 1-gram and higher n-gram matrices are counted together in a single dataset pass.
+    Models that are up to date in the build manifest are skipped, so an interrupted run
+    resumes where it stopped.
+
     Args:
         genres_subset (list, optional): A list of specific genres to process.
         include_ngrams (bool): Whether to generate n-gram matrices in addition to chord matrices.
         ngram_sizes (list): Which n-gram sizes to generate if include_ngrams is True.
+        force (bool): Whether to rebuild every model, even those that are up to date.
+        profile (bool): Whether to write a per-stage time and memory report (build_profile.json).
     """
     print("=" * 80)
     print("CREATING UNIFIED N-GRAM MATRICES WITH ANALYSIS")
     print("=" * 80)
 
-    # Step 1: Generate 1-gram (chord) matrices
-    print("\nStep 1: Creating 1-gram (chord) transition matrices...")
-    generate_transition_matrices(genres_subset=genres_subset)
+    all_sizes = [1] + (ngram_sizes if include_ngrams else [])
 
-    # Step 2: Generate higher n-gram matrices
-    if include_ngrams and ngram_sizes:
-        print(f"\nStep 2: Creating {ngram_sizes}-gram transition matrices...")
-        generate_ngram_transition_matrices(genres_subset=genres_subset, ngram_sizes=ngram_sizes)
+    # Steps 1 and 2: Generate 1-gram (chord) and higher n-gram matrices from one dataset pass
+    # 1-grams keep every transition, higher orders drop transitions seen only once
+    print(f"\nSteps 1-2: Creating {all_sizes}-gram transition matrices...")
+    generate_ngram_transition_matrices(
+        genres_subset=genres_subset,
+        ngram_sizes=all_sizes,
+        min_count={n: 1 if n == 1 else 2 for n in all_sizes},
+        force=force,
+        profile=profile
+    )
 
     # Step 3: Analyze all matrices using unified analyzer
-    all_sizes = [1] + (ngram_sizes if include_ngrams else [])
     print(f"\nStep 3: Analyzing all matrices ({all_sizes}-grams)...")
     analyze_all_matrices(ngram_sizes=all_sizes)
 
@@ -35,12 +44,13 @@ def create_transition_matrices_with_variants(genres_subset=None, include_ngrams=
     print("=" * 80)
 
 
-def quick_analysis_only(ngram_sizes=None):
+def quick_analysis_only(ngram_sizes=None, workers=None):
     """
     Analyze existing matrices without regenerating using unified approach.
 
     Args:
         ngram_sizes (list): Which n-gram sizes to analyze.
+        workers (int, optional): Number of worker processes analyzing matrices in parallel.
     """
     if ngram_sizes is None:
         ngram_sizes = [1, 2, 3, 4]
@@ -49,6 +59,6 @@ def quick_analysis_only(ngram_sizes=None):
     print("ANALYZING EXISTING UNIFIED N-GRAM MATRICES")
     print("=" * 80)
 
-    analyze_all_matrices(ngram_sizes=ngram_sizes)
+    analyze_all_matrices(ngram_sizes=ngram_sizes, workers=workers)
 
     print("\nANALYSIS COMPLETE")
\ No newline at end of file
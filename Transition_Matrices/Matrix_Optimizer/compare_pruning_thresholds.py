@@ -0,0 +1,74 @@
+import os
+import time
+
+from Markov_Chains.ngram_matrix_loader import NGramMatrixLoader
+from Transition_Matrices.Matrix_Optimizer.evaluate_held_out_log_likelihood import evaluate_held_out_log_likelihood
+from Transition_Matrices.Matrix_Optimizer.prune_genre_ngram_models import prune_genre_ngram_models
+from Utils.ngram_matrices_paths import get_ngram_matrices_path
+from Utils.path_constants import PRUNED_MATRICES_PATH
+
+
+def compare_pruning_thresholds(genre, held_out_songs, thresholds=(0.0, 1e-7, 1e-6, 1e-5, 1e-4), output_path=None):
+    """
+    Prunes a genre's models at several thresholds and reports size, load time and quality.
+
+    Each threshold is written as its own model variant, which is then loaded back the way the
+    generator loads it (matrices, mappings and context trie) to time it, and scored on the
+    held-out songs. A threshold of 0 is the unpruned baseline.
+
+    Args:
+        genre (str): The genre whose built models are pruned.
+        held_out_songs (list): Song records with 'chords' (and optionally 'main_genre') fields
+            that were not used to build the models; songs of other genres are skipped.
+        thresholds (tuple, optional): Pruning thresholds to compare. Defaults to
+            (0.0, 1e-7, 1e-6, 1e-5, 1e-4).
+        output_path (str, optional): Directory of the variants, one 'threshold_{t}' directory
+            per threshold. Defaults to PRUNED_MATRICES_PATH/{genre}.
+
+    Returns:
+        list: One dict per threshold with 'threshold', 'path', 'contexts', 'pruned',
+            'size_bytes', 'load_seconds' and the held-out scores of
+            evaluate_held_out_log_likelihood.
+    """
+    if output_path is None:
+        output_path = os.path.join(PRUNED_MATRICES_PATH, genre)
+
+    songs = [song for song in held_out_songs if song.get("main_genre", genre) == genre]
+    ngram_loader = NGramMatrixLoader(genre)
+    results = []
+
+    for threshold in thresholds:
+        variant_path = os.path.join(output_path, f"threshold_{threshold:g}")
+        pruned_models = prune_genre_ngram_models(genre, threshold, ngram_loader, variant_path)
+
+        size_bytes = sum(
+            os.path.getsize(os.path.join(get_ngram_matrices_path(n, variant_path), file_name))
+            for n in pruned_models
+            for file_name in (f"transition_matrix_{genre}.npz", f"ngram_mappings_{genre}.pkl")
+        )
+
+        start = time.perf_counter()
+        variant_loader = NGramMatrixLoader(genre, matrices_path=variant_path)
+        context_trie = variant_loader.get_context_trie()
+        load_seconds = time.perf_counter() - start
+
+        result = {
+            "threshold": threshold,
+            "path": variant_path,
+            "contexts": sum(stats["contexts"] for _, _, stats in pruned_models.values()),
+            "pruned": sum(stats["pruned"] for _, _, stats in pruned_models.values()),
+            "size_bytes": size_bytes,
+            "load_seconds": load_seconds
+        }
+        result.update(evaluate_held_out_log_likelihood(context_trie, variant_loader.vocabulary, songs))
+        results.append(result)
+
+    print(f"\nPruning thresholds for {genre} ({len(songs)} held-out songs)")
+    print(f"{'threshold':>9} | {'contexts kept':>13} | {'size':>10} | {'load':>8} | "
+          f"{'log-lik/chord':>13} | {'perplexity':>10} | {'coverage':>8}")
+    for result in results:
+        print(f"{result['threshold']:>9g} | {result['contexts'] - result['pruned']:>13} | "
+              f"{result['size_bytes'] / 1024 ** 2:>7.2f} MB | {result['load_seconds']:>6.2f} s | "
+              f"{result['mean_log_likelihood']:>13.4f} | {result['perplexity']:>10.2f} | {result['coverage']:>8.1%}")
+
+    return results
@@ -0,0 +1,62 @@
+import math
+
+import numpy as np
+
+from Transition_Matrices.Data_Processor.extract_chord_sequence import extract_chord_sequence
+
+
+def evaluate_held_out_log_likelihood(context_trie, vocabulary, songs, probability_floor=1e-6, max_order=None):
+    """
+    Scores held-out songs under the back-off model the sequence generator samples from.
+
+    Every chord after the first is predicted from the longest matching context of the
+    preceding chords, exactly as in generation. Chords the model cannot produce there are
+    scored with `probability_floor` and counted as not covered.
+
+    Args:
+        context_trie (ContextTrie): Trie over the model's orders.
+        vocabulary (ChordVocabulary): Vocabulary the trie's chord ids come from.
+        songs (list): Song records with a 'chords' field.
+        probability_floor (float, optional): Probability of unpredicted chords. Defaults to 1e-6.
+        max_order (int, optional): Highest order to back off from, to score the model truncated
+            at that order. Defaults to every order in the trie.
+
+    Returns:
+        dict: 'chords' scored, total 'log_likelihood', 'mean_log_likelihood' per chord,
+            'perplexity' and 'coverage' (share of chords the model could produce).
+    """
+    max_order = context_trie.max_order if max_order is None else min(max_order, context_trie.max_order)
+    total_log_likelihood = 0.0
+    scored = 0
+    covered = 0
+
+    for song in songs:
+        sequence = extract_chord_sequence(song.get("chords") or "", vocabulary)
+
+        for position in range(1, len(sequence)):
+            match = context_trie.find_longest_context(sequence[max(0, position - max_order):position], max_order)
+            probability = 0.0
+
+            if match is not None:
+                _, chords, cumulative = match
+                hits = np.flatnonzero(chords == sequence[position])
+
+                if hits.size:
+                    hit = hits[0]
+                    probability = (cumulative[hit] - (cumulative[hit - 1] if hit else 0.0)) / cumulative[-1]
+
+            if probability > 0:
+                covered += 1
+
+            total_log_likelihood += math.log(max(probability, probability_floor))
+            scored += 1
+
+    mean_log_likelihood = total_log_likelihood / scored if scored else 0.0
+
+    return {
+        "chords": scored,
+        "log_likelihood": total_log_likelihood,
+        "mean_log_likelihood": mean_log_likelihood,
+        "perplexity": math.exp(-mean_log_likelihood),
+        "coverage": covered / scored if scored else 0.0
+    }
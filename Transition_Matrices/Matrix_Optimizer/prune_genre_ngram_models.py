@@ -0,0 +1,115 @@
+import os
+
+import numpy as np
+
+from Markov_Chains.context_trie import ContextTrie
+from Markov_Chains.ngram_matrix_loader import NGramMatrixLoader
+from Transition_Matrices.Build_Manifest.write_matrix_metadata import write_matrix_metadata
+from Transition_Matrices.Matrix_Optimizer.prune_ngram_transition_matrix import prune_ngram_transition_matrix
+from Transition_Matrices.Matrix_Updater.join_ngram_states import join_ngram_states
+from Transition_Matrices.Matrix_Updater.load_transition_counts import load_transition_counts
+from Transition_Matrices.Matrix_Updater.write_model_files_atomically import write_model_files_atomically
+from Utils.ngram_matrices_paths import get_ngram_matrices_path
+
+
+def prune_genre_ngram_models(genre, threshold, ngram_loader=None, output_path=None):
+    """
+    Prunes a genre's n-gram models with relative-entropy pruning, from order 2 upwards.
+
+    Orders are pruned bottom-up: every context of order n is compared with the back-off it
+    would get from the already pruned orders below it, so the result is the model the
+    generator actually samples from. The unigram model is the last back-off and is kept
+    whole. Contexts are weighted by their share of the order's transitions in the count
+    table, or uniformly for orders without one.
+
+    Args:
+        genre (str): The genre whose built models are pruned.
+        threshold (float): Weighted relative entropy below which a context is pruned.
+        ngram_loader (NGramMatrixLoader, optional): The loaded models to prune, so several
+            thresholds can share one load. Defaults to loading the genre's built models.
+        output_path (str, optional): Directory to write the pruned variant into, using one
+            Matrices_{n}_Gram subdirectory per order. Defaults to None, keeping it in memory.
+
+    Returns:
+        dict: {n: (matrix, mappings, stats)} where stats holds the 'contexts' before pruning
+            and the 'pruned' contexts.
+    """
+    if ngram_loader is None:
+        ngram_loader = NGramMatrixLoader(genre)
+
+    vocabulary = ngram_loader.vocabulary
+    pruned_models = {}
+    backoff_models = []
+
+    for n, matrix in sorted(ngram_loader.matrices.items()):
+        mappings = ngram_loader.mappings[n]
+
+        if matrix is None or mappings is None:
+            continue
+
+        contexts = int(np.count_nonzero(np.diff(matrix.tocsr().indptr)))
+        idx_to_ngram = mappings["idx_to_ngram"]
+        context_ids = [vocabulary.encode_ngram(idx_to_ngram[idx]) for idx in range(matrix.shape[0])]
+        next_chord_ids = np.array(
+            [ngram_ids[-1] if isinstance(ngram_ids, tuple) else ngram_ids for ngram_ids in context_ids],
+            dtype=np.int64
+        )
+
+        if n > 1 and backoff_models:
+            matrix, mappings, pruned = prune_ngram_transition_matrix(
+                matrix, mappings, context_ids, next_chord_ids, ContextTrie.from_ngram_models(backoff_models),
+                threshold, context_weights=_get_context_weights(ngram_loader.ngram_paths[n], genre, matrix, mappings)
+            )
+
+            # Re-index the chord ids of the pruned states for the next order's back-off trie
+            context_ids = [vocabulary.encode_ngram(mappings["idx_to_ngram"][idx]) for idx in range(matrix.shape[0])]
+            next_chord_ids = np.array([ngram_ids[-1] for ngram_ids in context_ids], dtype=np.int64)
+        else:
+            pruned = 0
+
+        # First spelling of every chord-id context wins, as in the loader's id index
+        ngram_to_idx = {}
+        for idx, ngram_ids in enumerate(context_ids):
+            ngram_to_idx.setdefault(ngram_ids, idx)
+        backoff_models.append((n, ngram_to_idx, next_chord_ids, matrix))
+
+        pruned_models[n] = (matrix, mappings, {"contexts": contexts, "pruned": pruned})
+
+        if output_path is not None:
+            target_path = get_ngram_matrices_path(n, output_path)
+            write_model_files_atomically(os.path.join(target_path, f"transition_matrix_{genre}.npz"),
+                                         os.path.join(target_path, f"ngram_mappings_{genre}.pkl"), matrix, mappings)
+            write_matrix_metadata(target_path, genre, n, matrix, mappings, {"pruning_threshold": threshold})
+
+        print(f"✓ Pruned {pruned}/{contexts} {genre} {n}-gram contexts (threshold {threshold:g})")
+
+    return pruned_models
+
+
+def _get_context_weights(matrices_path, genre, matrix, mappings):
+    """
+    Estimates P(h) of every matrix row from the order's count table.
+
+    Args:
+        matrices_path (str): Directory of the n-gram order.
+        genre (str): The genre of the model.
+        matrix (scipy.sparse.spmatrix): The order's transition matrix.
+        mappings (dict): The order's mappings, with 'idx_to_ngram'.
+
+    Returns:
+        numpy.ndarray or None: Share of the order's transitions leaving each row, or None
+            if the genre has no count table.
+    """
+    table = load_transition_counts(matrices_path, genre)
+
+    if table is None:
+        return None
+
+    row_totals = np.asarray(table["counts"].sum(axis=1)).ravel().astype(np.float64)
+    keys = join_ngram_states([mappings["idx_to_ngram"][idx] for idx in range(matrix.shape[0])])
+
+    # The table's state keys are sorted, so each row's count is found by binary search
+    positions = np.minimum(np.searchsorted(table["states"], keys), len(table["states"]) - 1)
+    weights = np.where(table["states"][positions] == keys, row_totals[positions], 0.0)
+
+    return weights / max(row_totals.sum(), 1.0)
@@ -0,0 +1,102 @@
+import numpy as np
+from scipy.sparse import coo_matrix
+
+
+def prune_ngram_transition_matrix(matrix, mappings, context_ids, next_chord_ids, backoff_trie, threshold,
+                                  context_weights=None, probability_floor=1e-6):
+    """
+    Prunes the contexts of an n-gram matrix whose successors the lower orders already predict.
+
+    Each context h with transitions is scored with the weighted relative entropy of its
+    successor distribution p(.|h) to the distribution q(.|h') the model backs off to when h
+    is dropped, i.e. the longest matching context of the lower orders:
+
+        D(h) = P(h) * sum_w p(w|h) * log(p(w|h) / q(w|h'))
+
+    Contexts with D(h) below the threshold are removed. A successor the back-off cannot
+    produce is scored with `probability_floor`, so contexts that add new chords are kept.
+
+    Args:
+        matrix (scipy.sparse.spmatrix): The row-stochastic transition matrix of order n.
+        mappings (dict): The order's mappings, with 'idx_to_ngram' and 'ngram_to_idx'.
+        context_ids (list): Chord-id context of every matrix row, None for rows to keep as they are.
+        next_chord_ids (numpy.ndarray): Chord id each matrix column adds to the sequence.
+        backoff_trie (ContextTrie): Trie over the (already pruned) lower orders.
+        threshold (float): Contexts scoring strictly below it are pruned; 0 keeps every context.
+        context_weights (numpy.ndarray, optional): P(h) of every row. Defaults to uniform
+            weights over the rows with transitions.
+        probability_floor (float, optional): Back-off probability of unseen successors.
+            Defaults to 1e-6.
+
+    Returns:
+        tuple: A 3-tuple containing:
+            - matrix (scipy.sparse.csr_matrix): The pruned matrix, restricted to the states
+              of the remaining transitions.
+            - mappings (dict): The mappings of the pruned matrix; other entries are copied.
+            - pruned (int): Number of contexts removed.
+
+    Raises:
+        ValueError: If `threshold` is negative.
+    """
+    if threshold < 0:
+        raise ValueError("threshold must be non-negative")
+
+    matrix = matrix.tocsr()
+    indptr, indices, data = matrix.indptr, matrix.indices, matrix.data
+    row_lengths = np.diff(indptr)
+
+    if context_weights is None:
+        context_weights = np.full(matrix.shape[0], 1.0 / max(np.count_nonzero(row_lengths), 1))
+
+    keep_rows = np.ones(matrix.shape[0], dtype=bool)
+
+    for idx in np.flatnonzero(row_lengths):
+        context = context_ids[idx]
+        if context is None:
+            continue
+
+        # The back-off of a context is the longest lower-order match of its newest chords
+        match = backoff_trie.find_longest_context(context[1:], len(context) - 1)
+        if match is None:
+            continue
+
+        _, backoff_chords, backoff_cumulative = match
+        backoff_probabilities = np.diff(backoff_cumulative, prepend=0.0) / backoff_cumulative[-1]
+
+        start, end = indptr[idx], indptr[idx + 1]
+        chords = next_chord_ids[indices[start:end]]
+        probabilities = data[start:end] / data[start:end].sum()
+
+        # Align the back-off probabilities with the row's successors
+        order = np.argsort(backoff_chords)
+        positions = np.minimum(np.searchsorted(backoff_chords, chords, sorter=order), len(order) - 1)
+        found = backoff_chords[order[positions]] == chords
+        q = np.where(found, backoff_probabilities[order[positions]], probability_floor)
+
+        # Relative entropy is non-negative; clamp the rounding error of identical distributions
+        divergence = max(float(np.sum(probabilities * np.log(probabilities / q))), 0.0)
+
+        if context_weights[idx] * divergence < threshold:
+            keep_rows[idx] = False
+
+    pruned = int(np.count_nonzero(row_lengths[~keep_rows]))
+
+    # Drop the pruned rows, then every state no remaining transition uses
+    counts = matrix.tocoo()
+    keep = keep_rows[counts.row]
+    rows, cols, values = counts.row[keep], counts.col[keep], counts.data[keep]
+
+    used_states, state_inverse = np.unique(np.concatenate([rows, cols]), return_inverse=True)
+    pruned_matrix = coo_matrix(
+        (values, (state_inverse[:rows.size], state_inverse[rows.size:])),
+        shape=(len(used_states), len(used_states))
+    ).tocsr()
+
+    idx_to_ngram = {
+        new_idx: mappings["idx_to_ngram"][int(old_idx)] for new_idx, old_idx in enumerate(used_states)
+    }
+    pruned_mappings = dict(mappings)
+    pruned_mappings["idx_to_ngram"] = idx_to_ngram
+    pruned_mappings["ngram_to_idx"] = {ngram: idx for idx, ngram in idx_to_ngram.items()}
+
+    return pruned_matrix, pruned_mappings, pruned
@@ -0,0 +1,21 @@
+from Transition_Matrices.Build_Manifest.hash_artifact_file import hash_artifact_file
+from Utils.variable_constants import MATRIX_DIGEST_MAPPINGS_KEY
+
+
+def is_model_files_pair(matrix_file, mappings):
+    """
+    Checks that loaded mappings belong to the matrix file next to them.
+
+    Mappings written by write_model_files_atomically record the content hash of their
+    matrix file; mappings without one (full builds) are always accepted.
+
+    Args:
+        matrix_file (str): Path of the transition matrix .npz file.
+        mappings (dict): The mappings loaded from the model's .pkl file.
+
+    Returns:
+        bool: False if the recorded hash differs from the matrix file's, True otherwise.
+    """
+    matrix_digest = mappings.get(MATRIX_DIGEST_MAPPINGS_KEY)
+
+    return matrix_digest is None or matrix_digest == hash_artifact_file(matrix_file)
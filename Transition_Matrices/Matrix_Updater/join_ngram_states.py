@@ -0,0 +1,36 @@
+import numpy as np
+
+from Utils.variable_constants import NGRAM_KEY_SEPARATOR
+
+
+def join_ngram_states(states):
+    """
+    Joins the chords of each n-gram state into a single string key.
+
+    Joined keys sort in the same order as the n-gram tuples, which is the index order of the
+    saved models, so they can be merged and searched with np.union1d / np.searchsorted.
+
+    Args:
+        states (numpy.ndarray or list): A (num_states, n) array of chord strings, a 1-D array of
+            already joined keys, or a list of n-gram keys (a chord string for n=1, a tuple of
+            chord strings for n>1).
+
+    Returns:
+        numpy.ndarray: 1-D unicode array of joined state keys.
+    """
+    if isinstance(states, np.ndarray) and states.ndim == 1:
+        return states.astype(str)
+
+    if isinstance(states, np.ndarray):
+        columns = [states[:, position].astype(str) for position in range(states.shape[1])]
+
+        keys = columns[0]
+        for column in columns[1:]:
+            keys = np.char.add(np.char.add(keys, NGRAM_KEY_SEPARATOR), column)
+
+        return np.asarray(keys, dtype=str)
+
+    return np.array(
+        [state if isinstance(state, str) else NGRAM_KEY_SEPARATOR.join(state) for state in states],
+        dtype=str
+    )
@@ -0,0 +1,42 @@
+import os
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+def load_transition_counts(matrices_path, genre):
+    """
+    Loads the count table written by save_transition_counts.
+
+    Args:
+        matrices_path (str): Directory of the n-gram order, e.g. MATRICES_2_GRAM_PATH.
+        genre (str): The genre of the model.
+
+    Returns:
+        dict or None: None if the genre has no count table, otherwise a dict with:
+            - 'states': 1-D unicode array of joined state keys, sorted.
+            - 'counts': scipy.sparse.csr_matrix of integer transition counts between the states.
+            - 'start_counts': dict mapping opening chords to counts.
+            - 'n': the n-gram order.
+            - 'min_count': the threshold the model was built with.
+            - 'smoothing': the additive smoothing the model was built with.
+    """
+    counts_file = os.path.join(matrices_path, f"transition_counts_{genre}.npz")
+
+    if not os.path.exists(counts_file):
+        return None
+
+    with np.load(counts_file) as table:
+        states = table["states"]
+
+        return {
+            "states": states,
+            "counts": csr_matrix(
+                (table["data"], table["indices"], table["indptr"]),
+                shape=(len(states), len(states))
+            ),
+            "start_counts": dict(zip(table["start_chords"].tolist(), table["start_counts"].tolist())),
+            "n": int(table["n"]),
+            "min_count": int(table["min_count"]),
+            "smoothing": float(table["smoothing"]) if "smoothing" in table else 0.0
+        }
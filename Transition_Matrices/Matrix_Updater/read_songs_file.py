@@ -0,0 +1,34 @@
+import json
+
+from Utils.Dataset_Utils.stream_local_corpus_batches import stream_local_corpus_batches
+
+
+def read_songs_file(file_path):
+    """
+    Reads a batch of new songs from a JSON, JSON Lines, Parquet or CSV file.
+
+    Each record must have the same fields as a Chordonomicon entry: 'main_genre' and
+    'chords' (a string of chords separated by spaces). A .json file holds a list of records,
+    .parquet and .csv files are read with pyarrow, and any other file holds one record per line.
+
+    Args:
+        file_path (str): Path of the songs file.
+
+    Returns:
+        list: The song records.
+
+    Raises:
+        ValueError: If a .json file does not contain a list of records, or a Parquet or CSV
+            file lacks the 'main_genre' or 'chords' column.
+    """
+    if file_path.lower().endswith((".parquet", ".csv")):
+        return [song for batch in stream_local_corpus_batches(file_path) for song in batch]
+
+    with open(file_path, "r", encoding="utf-8") as f:
+        if file_path.endswith(".json"):
+            songs = json.load(f)
+            if not isinstance(songs, list):
+                raise ValueError(f"{file_path} must contain a list of song records")
+            return songs
+
+        return [json.loads(line) for line in f if line.strip()]
@@ -0,0 +1,77 @@
+import io
+import os
+
+import numpy as np
+from scipy.sparse import coo_matrix
+
+from Transition_Matrices.Matrix_Updater.join_ngram_states import join_ngram_states
+from Transition_Matrices.Matrix_Updater.write_file_atomically import write_file_atomically
+
+
+def save_transition_counts(matrices_path, genre, n, states, rows, cols, counts, start_counts=None, min_count=1,
+                           smoothing=0.0):
+    """
+    Persists the raw (unfiltered) transition counts of a genre model as a count table.
+
+    The table is what incremental updates merge new songs into, so it keeps every transition,
+    including those below `min_count`, and any probability model can be derived from it with
+    derive_transition_matrix_from_counts. States are stored as joined chord keys in sorted
+    order, matching the index order of the saved models. Counts are stored as int32 when they
+    fit. The file is written atomically.
+
+    Args:
+        matrices_path (str): Directory of the n-gram order, e.g. MATRICES_2_GRAM_PATH.
+        genre (str): The genre of the model.
+        n (int): The n-gram order.
+        states (numpy.ndarray or list): The states the triples refer to, either a (num_states, n)
+            array of chord strings or a list of n-gram keys.
+        rows (numpy.ndarray): Index of the current state of each transition.
+        cols (numpy.ndarray): Index of the next state of each transition.
+        counts (numpy.ndarray): Number of occurrences of each transition.
+        start_counts (dict, optional): {opening_chord: count}, stored for start-state seeding.
+        min_count (int, optional): The threshold the model was built with. Defaults to 1.
+        smoothing (float, optional): The additive smoothing the model was built with. Defaults to 0.0.
+
+    Returns:
+        str: Path of the written count table.
+    """
+    keys = join_ngram_states(states)
+
+    # Re-index the states in sorted key order
+    order = np.argsort(keys, kind="stable")
+    positions = np.empty(len(keys), dtype=np.int64)
+    positions[order] = np.arange(len(keys))
+
+    count_matrix = coo_matrix(
+        (np.asarray(counts, dtype=np.int64), (positions[np.asarray(rows)], positions[np.asarray(cols)])),
+        shape=(len(keys), len(keys))
+    ).tocsr()
+
+    if count_matrix.nnz == 0 or count_matrix.data.max() <= np.iinfo(np.int32).max:
+        count_matrix.data = count_matrix.data.astype(np.int32)
+
+    # Sorted, so equal counts always produce the same file
+    start_counts = dict(sorted((start_counts or {}).items()))
+
+    counts_file = os.path.join(matrices_path, f"transition_counts_{genre}.npz")
+
+    def write(f):
+        # Serialize in memory first, so the atomic write only receives complete bytes
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer,
+            states=keys[order],
+            indptr=count_matrix.indptr,
+            indices=count_matrix.indices,
+            data=count_matrix.data,
+            start_chords=np.array(list(start_counts), dtype=str),
+            start_counts=np.array(list(start_counts.values()), dtype=np.int64),
+            n=np.int64(n),
+            min_count=np.int64(min_count),
+            smoothing=np.float64(smoothing)
+        )
+        f.write(buffer.getvalue())
+
+    write_file_atomically(counts_file, write)
+
+    return counts_file
@@ -0,0 +1,20 @@
+from Utils.variable_constants import NGRAM_KEY_SEPARATOR
+
+
+def split_ngram_state_keys(keys, n):
+    """
+    Converts joined state keys back into the n-gram keys used by the saved mappings.
+
+    Args:
+        keys (numpy.ndarray or list): Joined state keys, as produced by join_ngram_states.
+        n (int): The n-gram order.
+
+    Returns:
+        list: A chord string per key for n=1, a tuple of chord strings per key for n>1.
+    """
+    keys = list(keys.tolist() if hasattr(keys, "tolist") else keys)
+
+    if n == 1:
+        return keys
+
+    return [tuple(key.split(NGRAM_KEY_SEPARATOR)) for key in keys]
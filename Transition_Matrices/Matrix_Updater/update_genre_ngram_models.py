@@ -0,0 +1,204 @@
+import os
+import pickle
+
+import numpy as np
+from scipy.sparse import coo_matrix, csr_matrix, load_npz
+
+from Transition_Matrices.Build_Manifest.record_build_manifest_entry import record_build_manifest_entry
+from Transition_Matrices.Build_Manifest.write_matrix_metadata import write_matrix_metadata
+from Transition_Matrices.Data_Processor.count_ngram_transitions_vectorized import count_ngram_transitions_vectorized
+from Transition_Matrices.Data_Processor.count_start_states_vectorized import count_start_states_vectorized
+from Transition_Matrices.Data_Processor.encode_songs_to_token_arrays import encode_songs_to_token_arrays
+from Transition_Matrices.Matrix_Updater.is_model_files_pair import is_model_files_pair
+from Transition_Matrices.Matrix_Updater.join_ngram_states import join_ngram_states
+from Transition_Matrices.Matrix_Updater.load_transition_counts import load_transition_counts
+from Transition_Matrices.Matrix_Updater.save_transition_counts import save_transition_counts
+from Transition_Matrices.Matrix_Updater.split_ngram_state_keys import split_ngram_state_keys
+from Transition_Matrices.Matrix_Updater.write_model_files_atomically import write_model_files_atomically
+from Utils.chord_vocabulary import get_chord_vocabulary
+from Utils.ngram_matrices_paths import get_ngram_matrices_path
+
+
+def update_genre_ngram_models(songs, ngram_sizes=(1, 2, 3, 4), min_count=2, vocabulary=None):
+    """
+    Merges a batch of new songs into the persisted count tables and models of their genres.
+
+    For every genre in the batch and every requested order, the batch is counted on its own,
+    its counts are added to the genre's count table (see save_transition_counts), and only
+    the model rows whose counts changed are renormalized. All other rows are carried over
+    from the saved model unchanged, so the result equals a full rebuild on the corpus plus
+    the batch, at a cost driven by the batch and the model size instead of the corpus.
+    Count tables, matrices and mappings are written atomically, and the mappings record the
+    hash of their matrix, so a crash between the two files is detected on load.
+
+    Args:
+        songs (list): Song records with 'main_genre' and 'chords' fields, as in Chordonomicon.
+        ngram_sizes (list or tuple, optional): The orders to update. Defaults to (1, 2, 3, 4).
+        min_count (int or dict, optional): Threshold for genres that have no model yet, either
+            one value or a dict mapping each order to its threshold. Existing models keep the
+            threshold and smoothing stored in their count table. Defaults to 2.
+        vocabulary (ChordVocabulary, optional): Vocabulary used to intern chords. Defaults to
+            the process-wide vocabulary.
+
+    Returns:
+        dict: {genre: [updated orders]}.
+    """
+    if vocabulary is None:
+        vocabulary = get_chord_vocabulary()
+
+    genre_token_arrays = encode_songs_to_token_arrays({"train": songs}, vocabulary)
+
+    # Snapshot after encoding, so every chord of the batch has a name
+    chords = np.array(vocabulary.chords, dtype=str)
+
+    updated_models = {}
+
+    for genre, (tokens, lengths) in genre_token_arrays.items():
+        print(f"Updating {genre} with {len(lengths)} new songs...")
+
+        for n in sorted(ngram_sizes):
+            updated = _update_genre_order_model(
+                genre, n, tokens, lengths, chords, get_ngram_matrices_path(n),
+                min_count[n] if isinstance(min_count, dict) else min_count
+            )
+
+            if updated:
+                updated_models.setdefault(genre, []).append(n)
+
+    return updated_models
+
+
+def _update_genre_order_model(genre, n, tokens, lengths, chords, matrices_path, default_min_count):
+    """
+    Updates the count table and model of one (genre, order) with the batch token arrays.
+    Returns True if the model was written.
+    """
+    matrix_file = os.path.join(matrices_path, f"transition_matrix_{genre}.npz")
+    mappings_file = os.path.join(matrices_path, f"ngram_mappings_{genre}.pkl")
+
+    table = load_transition_counts(matrices_path, genre)
+
+    if table is None:
+        if os.path.exists(matrix_file):
+            print(f"Warning: {genre} {n}-gram model has no count table; rebuild it once to enable updates")
+            return False
+
+        # New genre or order: start from an empty table
+        table = {
+            "states": np.empty(0, dtype=str),
+            "counts": csr_matrix((0, 0), dtype=np.int64),
+            "start_counts": {},
+            "n": n,
+            "min_count": default_min_count,
+            "smoothing": 0.0
+        }
+
+    # Load the current model; a missing model is an empty one
+    if os.path.exists(matrix_file) and os.path.exists(mappings_file):
+        with open(mappings_file, "rb") as f:
+            mappings = pickle.load(f)
+
+        if not is_model_files_pair(matrix_file, mappings):
+            print(f"✗ {genre} {n}-gram matrix and mappings are from different writes; "
+                  "re-derive the model from its count table before updating it")
+            return False
+
+        model_matrix = load_npz(matrix_file).tocoo()
+        idx_to_ngram = mappings["idx_to_ngram"]
+        model_keys = join_ngram_states([idx_to_ngram[idx] for idx in range(len(idx_to_ngram))])
+    else:
+        model_matrix = coo_matrix((0, 0))
+        mappings = {"n": n}
+        model_keys = np.empty(0, dtype=str)
+
+    batch_states, rows, cols, counts = count_ngram_transitions_vectorized(tokens, lengths, n)
+
+    if counts.size == 0 and n > 1:
+        return False
+
+    # Merge the batch states into the sorted state keys of the table
+    batch_keys = join_ngram_states(chords[batch_states])
+    table_keys = table["states"]
+    merged_keys = np.union1d(table_keys, batch_keys)
+    table_positions = np.searchsorted(merged_keys, table_keys)
+    batch_positions = np.searchsorted(merged_keys, batch_keys)
+
+    # Add the batch counts to the table; duplicate entries are summed by the CSR conversion
+    table_counts = table["counts"].tocoo()
+    merged_counts = coo_matrix(
+        (
+            np.concatenate([table_counts.data, counts]),
+            (
+                np.concatenate([table_positions[table_counts.row], batch_positions[rows]]),
+                np.concatenate([table_positions[table_counts.col], batch_positions[cols]])
+            )
+        ),
+        shape=(len(merged_keys), len(merged_keys))
+    ).tocsr()
+
+    start_counts = table["start_counts"]
+    if n == 1:
+        for chord_id, count in count_start_states_vectorized(tokens, lengths).items():
+            start_counts[str(chords[chord_id])] = start_counts.get(str(chords[chord_id]), 0) + count
+
+    min_count = table["min_count"]
+    smoothing = table["smoothing"]
+    merged_coo = merged_counts.tocoo()
+    save_transition_counts(
+        matrices_path, genre, n, merged_keys, merged_coo.row, merged_coo.col, merged_coo.data,
+        start_counts=start_counts if n == 1 else None,
+        min_count=min_count,
+        smoothing=smoothing
+    )
+
+    # Recompute only the rows the batch touched, with the model's filtering and smoothing
+    touched_rows = np.unique(batch_positions[rows])
+    touched = merged_counts[touched_rows].tocoo()
+    keep = touched.data >= min_count
+    touched_row_keys = merged_keys[touched_rows[touched.row[keep]]]
+    touched_col_keys = merged_keys[touched.col[keep]]
+    touched_values = touched.data[keep] + smoothing
+
+    # Counts only grow, so the new model states are the old ones plus those of touched rows
+    new_model_keys = np.union1d(model_keys, np.concatenate([touched_row_keys, touched_col_keys]))
+
+    if new_model_keys.size == 0:
+        print(f"Warning: No {genre} {n}-gram transitions reach min_count={min_count} yet")
+        return False
+
+    # Carry over the untouched rows of the old model under their new indices
+    old_positions = np.searchsorted(new_model_keys, model_keys)
+    carried = ~np.isin(model_keys, merged_keys[touched_rows])[model_matrix.row]
+
+    new_rows = np.searchsorted(new_model_keys, touched_row_keys)
+    new_cols = np.searchsorted(new_model_keys, touched_col_keys)
+    row_totals = np.bincount(new_rows, weights=touched_values, minlength=len(new_model_keys))
+
+    matrix = coo_matrix(
+        (
+            np.concatenate([model_matrix.data[carried], touched_values / row_totals[new_rows]]),
+            (
+                np.concatenate([old_positions[model_matrix.row[carried]], new_rows]),
+                np.concatenate([old_positions[model_matrix.col[carried]], new_cols])
+            )
+        ),
+        shape=(len(new_model_keys), len(new_model_keys))
+    ).tocsr()
+
+    ngrams = split_ngram_state_keys(new_model_keys, n)
+
+    mappings["ngram_to_idx"] = {ngram: idx for idx, ngram in enumerate(ngrams)}
+    mappings["idx_to_ngram"] = dict(enumerate(ngrams))
+    if n == 1:
+        mappings["start_counts"] = start_counts
+
+    write_model_files_atomically(matrix_file, mappings_file, matrix, mappings)
+
+    # The model no longer matches its corpus slice, so the next build must not skip it
+    record_build_manifest_entry(matrices_path, genre, None)
+    write_matrix_metadata(matrices_path, genre, n, matrix, mappings, {"min_count": min_count, "smoothing": smoothing})
+
+    print(f"✓ Updated {genre} {n}-gram model ({matrix.shape}) - "
+          f"{len(touched_rows)} rows renormalized, {counts.sum()} new transitions")
+
+    return True
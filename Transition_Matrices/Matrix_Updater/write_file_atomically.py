@@ -0,0 +1,33 @@
+import os
+import tempfile
+
+
+def write_file_atomically(file_path, write):
+    """
+    Writes a file so that readers see either the old or the new content, never a partial file.
+
+    The content is written to a temporary file in the same directory, flushed to disk and
+    then moved over the target with os.replace, which is atomic on the same filesystem.
+
+    Args:
+        file_path (str): Path of the file to write.
+        write (callable): Called with the open binary file object; writes the content.
+    """
+    directory = os.path.dirname(file_path) or "."
+    os.makedirs(directory, exist_ok=True)
+
+    file_descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_", suffix=os.path.basename(file_path))
+
+    try:
+        with os.fdopen(file_descriptor, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(temp_path, file_path)
+
+    except BaseException:
+        # Never leave a half-written temporary file behind
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
@@ -0,0 +1,35 @@
+import hashlib
+import io
+import pickle
+
+from scipy.sparse import save_npz
+
+from Transition_Matrices.Matrix_Updater.write_file_atomically import write_file_atomically
+from Utils.variable_constants import MATRIX_DIGEST_MAPPINGS_KEY
+
+
+def write_model_files_atomically(matrix_file, mappings_file, matrix, mappings):
+    """
+    Writes the matrix and mappings files of a model so that a mismatched pair is detected.
+
+    Each file is replaced atomically (see write_file_atomically), but the two renames are
+    separate. The mappings are written first and record the content hash of the matrix
+    file that follows them, so a crash between the renames leaves new mappings next to the
+    old matrix, which is_model_files_pair detects at load time.
+
+    Args:
+        matrix_file (str): Path of the transition matrix .npz file.
+        mappings_file (str): Path of the n-gram mappings .pkl file.
+        matrix (scipy.sparse.csr_matrix): The transition matrix.
+        mappings (dict): The n-gram mappings; not modified, the hash is added to a copy.
+    """
+    buffer = io.BytesIO()
+    save_npz(buffer, matrix)
+    matrix_bytes = buffer.getvalue()
+
+    # Same digest as hash_artifact_file computes from the written file
+    paired_mappings = dict(mappings)
+    paired_mappings[MATRIX_DIGEST_MAPPINGS_KEY] = hashlib.blake2b(matrix_bytes, digest_size=16).hexdigest()
+
+    write_file_atomically(mappings_file, lambda f: pickle.dump(paired_mappings, f))
+    write_file_atomically(matrix_file, lambda f: f.write(matrix_bytes))
@@ -1,26 +1,42 @@
+from Transition_Matrices.Matrix_Analyzer.Entropy_Analyzer.analyze_all_matrix_entropy import analyze_all_matrix_entropy
+from Transition_Matrices.Matrix_Generator.derive_transition_matrices_from_counts import \
+    derive_transition_matrices_from_counts
+from Transition_Matrices.Matrix_Generator.generate_ngram_transition_matrices import \
+    generate_ngram_transition_matrices
 from Transition_Matrices.Matrix_Generator.generate_transition_matrices import generate_transition_matrices
 from Transition_Matrices.Matrix_Generator.transition_matrices_variants import create_transition_matrices_with_variants, \
     quick_analysis_only
+from Transition_Matrices.Matrix_Optimizer.compare_pruning_thresholds import compare_pruning_thresholds
+from Transition_Matrices.Matrix_Updater.read_songs_file import read_songs_file
+from Transition_Matrices.Matrix_Updater.update_genre_ngram_models import update_genre_ngram_models
 
 
-def create_transition_matrices():
+def create_transition_matrices(corpus_path=None):
     """
     Create basic transition matrices (original version).
 
     This function generates transition matrices for all or a subset of genres
     without performing additional analysis or creating matrix variants.
+
+    Args:
+        corpus_path (str, optional): A local Parquet, CSV or JSON Lines corpus (or a directory
+            of them) to build from offline instead of the Chordonomicon dataset.
     """
-    generate_transition_matrices()
+    generate_transition_matrices(corpus_path=corpus_path)
 
 
-def create_all_variants():
+def create_all_variants(profile=False):
     """
     Create all matrix variants with analysis.
 
     This function generates transition matrices for all or a subset of genres,
     performs analysis on the generated matrices, and creates additional matrix variants.
+
+    Args:
+        profile (bool, optional): If True, records the time and memory of every build stage
+            and (genre, order) in Data/Matrices/build_profile.json.
     """
-    create_transition_matrices_with_variants()
+    create_transition_matrices_with_variants(profile=profile)
 
 
 def analyze_existing_matrices():
@@ -33,14 +49,106 @@ def analyze_existing_matrices():
     quick_analysis_only()
 
 
+def analyze_existing_matrix_entropy(held_out_file=None):
+    """
+    Analyze the entropy and branching factor of existing matrices, per genre and order.
+
+    This function prints the row entropy distribution, mean branching factor and size of every
+    genre's models and, given held-out songs, the perplexity each order reaches.
+
+    Args:
+        held_out_file (str, optional): Path of a songs file that was not used to build the models.
+    """
+    analyze_all_matrix_entropy(held_out_songs=read_songs_file(held_out_file) if held_out_file else None)
+
+
+def update_with_new_songs(songs_file):
+    """
+    Merge new songs into the existing matrices without regenerating.
+
+    This function reads a JSON, JSON Lines, Parquet or CSV file of songs with 'main_genre' and 'chords'
+    fields and adds their transitions to the saved count tables, renormalizing only the
+    affected rows of each genre's 1- to 4-gram matrices.
+
+    Args:
+        songs_file (str): Path of the songs file.
+    """
+    update_genre_ngram_models(read_songs_file(songs_file))
+
+
+def rederive_matrices(min_count=None, smoothing=None):
+    """
+    Re-derive existing matrices from their saved counts with new settings.
+
+    This function renormalizes every saved count table with the given filtering threshold
+    and additive smoothing, without loading or recounting the dataset.
+
+    Args:
+        min_count (int or dict, optional): Minimum transition count, per order if a dict.
+        smoothing (float, optional): Additive smoothing constant.
+    """
+    derive_transition_matrices_from_counts(min_count=min_count, smoothing=smoothing)
+
+
+def create_key_relative_matrices(corpus_path=None):
+    """
+    Create transposition-invariant (key-relative) 1- to 4-gram matrices.
+
+    Transitions are encoded as root intervals and qualities, so every transposition of a
+    progression adds to the same counts. The models are written next to the absolute ones and
+    loaded with NGramMatrixLoader(genre, key_relative=True).
+
+    Args:
+        corpus_path (str, optional): A local corpus to build from instead of the Chordonomicon dataset.
+    """
+    generate_ngram_transition_matrices(
+        ngram_sizes=[1, 2, 3, 4],
+        min_count={1: 1, 2: 2, 3: 2, 4: 2},
+        corpus_path=corpus_path,
+        key_relative=True
+    )
+
+
+def prune_matrices(genre, held_out_file):
+    """
+    Prune a genre's higher-order models at several thresholds and compare them.
+
+    This function writes one relative-entropy pruned variant per threshold and reports its
+    size, load time and log-likelihood on held-out songs, to pick a size/quality point.
+
+    Args:
+        genre (str): The genre to prune.
+        held_out_file (str): Path of a songs file that was not used to build the models.
+    """
+    compare_pruning_thresholds(genre, read_songs_file(held_out_file))
+
+
 if __name__ == "__main__":
     # Choose your approach:
 
     # Option 1: Basic matrices only
     # create_transition_matrices()
 
+    # Option 1b: Basic matrices from a local corpus, fully offline
+    # create_transition_matrices(corpus_path="Data/Corpus/progressions.parquet")
+
     # Option 2: Full analysis with all variants
     create_all_variants()
 
     # Option 3: Just analyze existing matrices
     # analyze_existing_matrices()
+
+    # Option 4: Merge a batch of new songs into the existing matrices
+    # update_with_new_songs("new_songs.jsonl")
+
+    # Option 5: Re-derive existing matrices from their saved counts
+    # rederive_matrices(min_count={1: 1, 2: 3, 3: 3, 4: 3}, smoothing=0.1)
+
+    # Option 6: Compare relative-entropy pruning thresholds on held-out songs
+    # prune_matrices("rock", "held_out_songs.jsonl")
+
+    # Option 7: Transposition-invariant models over root intervals and qualities
+    # create_key_relative_matrices()
+
+    # Option 8: Entropy, branching factor and held-out perplexity of every genre and order
+    # analyze_existing_matrix_entropy("held_out_songs.jsonl")
@@ -0,0 +1,99 @@
+import os
+import pickle
+
+import numpy as np
+
+from Utils.chord_vocabulary import canonicalize_chord, format_chord_symbol, parse_chord_symbol
+from Utils.ngram_matrices_paths import get_ngram_matrices_path
+from Utils.path_constants import CHROMA_CHORDS_PATH
+from Utils.variable_constants import CHORD_PITCH_TABLE_FILE_NAME, CHORD_QUALITY_INTERVALS
+
+
+def generate_chord_pitch_table(matrices_path=None):
+    """
+    Precomputes the MIDI pitches of every chord the models can generate, for rendering without music21.
+
+    The vocabulary is the chroma template names plus every chord of the built 1-gram models,
+    closed under transposition: each (quality, bass interval) found is voiced on all 12 roots,
+    so key-relative models rendered in any key stay within the table. Every chord is voiced
+    from the intervals of its quality in CHORD_QUALITY_INTERVALS: the root in octave 3 with
+    the intervals above it, and a slash bass in the octave below the root. Chords of unknown
+    quality are left to the renderer's music21 fallback.
+
+    Args:
+        matrices_path (str, optional): Root of the built models to take the vocabulary from.
+            Defaults to the built models.
+
+    Returns:
+        dict: MIDI pitch tuples keyed by canonical chord symbol.
+    """
+    templates_file = os.path.join(CHROMA_CHORDS_PATH, "chordonomicon_templates.npz")
+    with np.load(templates_file) as templates:
+        chord_symbols = {canonicalize_chord(str(name)) for name in templates["names"]}
+
+    unigram_path = get_ngram_matrices_path(1, matrices_path)
+    for filename in sorted(os.listdir(unigram_path)) if os.path.exists(unigram_path) else []:
+        if filename.startswith("ngram_mappings_") and filename.endswith(".pkl"):
+            with open(os.path.join(unigram_path, filename), "rb") as f:
+                chord_symbols.update(pickle.load(f)["idx_to_ngram"].values())
+
+    # Every chord shape in all 12 keys
+    shapes = set()
+    for chord_symbol in chord_symbols:
+        parsed = parse_chord_symbol(chord_symbol)
+        if parsed is not None:
+            root, quality, bass = parsed
+            shapes.add((quality, None if bass is None else (bass - root) % 12))
+
+    canonical_symbols = sorted({
+        format_chord_symbol(root, quality, None if bass_interval is None else root + bass_interval)
+        for quality, bass_interval in shapes for root in range(12)
+    })
+    print(f"Voicing {len(canonical_symbols)} chords ({len(shapes)} shapes in 12 keys)...")
+
+    chord_pitches = {}
+    skipped = []
+
+    for chord_symbol in canonical_symbols:
+        root, quality, bass = parse_chord_symbol(chord_symbol)
+
+        if quality in CHORD_QUALITY_INTERVALS:
+            chord_pitches[chord_symbol] = _voice_intervals(root, CHORD_QUALITY_INTERVALS[quality], bass)
+        else:
+            skipped.append(chord_symbol)
+
+    names = list(chord_pitches)
+    offsets = np.zeros(len(names) + 1, dtype=np.int64)
+    np.cumsum([len(chord_pitches[name]) for name in names], out=offsets[1:])
+
+    table_file = os.path.join(CHROMA_CHORDS_PATH, CHORD_PITCH_TABLE_FILE_NAME)
+    np.savez_compressed(
+        table_file,
+        names=np.array(names),
+        offsets=offsets,
+        pitches=np.fromiter((p for name in names for p in chord_pitches[name]), dtype=np.uint8, count=offsets[-1])
+    )
+
+    print(f"✓ Saved {len(names)} chord voicings to {table_file}")
+    if skipped:
+        print(f"✗ {len(skipped)} chords could not be voiced and are left to music21, e.g. {skipped[:5]}")
+
+    return chord_pitches
+
+
+def _voice_intervals(root, intervals, bass=None):
+    """
+    Voices a chord from its intervals: the root in octave 3 (MIDI 48-59) with the intervals above
+    it, and the bass, if any, in the octave below the root.
+    """
+    root_pitch = 48 + root
+    pitches = tuple(root_pitch + interval for interval in intervals)
+
+    if bass is not None:
+        pitches = (root_pitch - (root - bass) % 12,) + pitches
+
+    return pitches
+
+
+if __name__ == "__main__":
+    generate_chord_pitch_table()
@@ -1,26 +1,32 @@
 import numpy as np
 import os.path
 import re
-from datasets import load_dataset
 from pychord import Chord
 
 from Utils.Chroma_Chords_Generation.chord_sort_key import chord_sort_key
 from Utils.Chroma_Chords_Generation.manual_chord_to_chroma import manual_chord_to_chroma
+from Utils.Dataset_Utils.load_chord_dataset import load_chord_dataset
 from Utils.path_constants import CHROMA_CHORDS_PATH
 from Utils.variable_constants import NOTE_TO_SEMITONE
 
-def generate_chroma_chords_from_dataset():
+def generate_chroma_chords_from_dataset(streaming=False, corpus_path=None):
     """
     Generates chroma vectors from Chordonomicon dataset using pychord library.
+
+    Args:
+        streaming (bool, optional): If True, only the 'chords' column is streamed in record
+            batches instead of loading the full dataset into memory. Defaults to False.
+        corpus_path (str, optional): A local Parquet, CSV or JSON Lines file, or a directory of
+            them, read instead of the Chordonomicon dataset. Defaults to None.
     """
-    print("Loading Chordonomicon dataset...")
-    dataset = load_dataset("ailsntua/Chordonomicon")
+    print(f"Loading {corpus_path or "Chordonomicon dataset"}...")
+    dataset = load_chord_dataset(streaming=streaming, columns=("chords",), corpus_path=corpus_path)
     chord_data = dataset['train'] if 'train' in dataset else dataset[list(dataset.keys())[0]]
 
     # Extract all chord symbols from progressions
     all_chord_symbols = set()
 
-    print(f"Extracting chords from {len(chord_data)} songs...")
+    print(f"Extracting chords from {len(chord_data) if hasattr(chord_data, "__len__") else "streamed"} songs...")
 
     for item in chord_data:
         chord_progression = item['chords']
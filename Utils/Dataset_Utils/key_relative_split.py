@@ -0,0 +1,52 @@
+from Utils.key_relative_chords import to_key_relative_tokens
+
+
+class KeyRelativeSplit:
+    """
+    Re-iterable view of a dataset split whose chord strings are rewritten as key-relative tokens.
+
+    Every song keeps its other fields; its 'chords' become the space-separated tokens of
+    to_key_relative_tokens, so the unchanged counting pipeline builds transposition-invariant
+    models. Section markers such as '<verse_1>' have no root and are dropped along the way.
+
+    Attributes:
+        split: The wrapped split, an iterable of song records (optionally with batches()).
+
+    Methods:
+        batches():
+            Yields the rewritten split as lists of song records.
+    """
+
+    def __init__(self, split):
+        """
+        Initializes the KeyRelativeSplit.
+
+        Args:
+            split: An iterable of song records, such as a Hugging Face split or a StreamedSplit.
+        """
+        self.split = split
+
+    @staticmethod
+    def _rewrite(entry):
+        """
+        Returns a copy of a song record with its chords as key-relative tokens.
+        """
+        chord_string = entry.get("chords")
+        if not chord_string:
+            return entry
+
+        return dict(entry, chords=" ".join(to_key_relative_tokens(chord_string.split())))
+
+    def batches(self):
+        """
+        Yields the rewritten split as lists of song records.
+
+        Yields:
+            list: The song records of one batch of the wrapped split.
+        """
+        for batch in self.split.batches():
+            yield [self._rewrite(entry) for entry in batch]
+
+    def __iter__(self):
+        for entry in self.split:
+            yield self._rewrite(entry)
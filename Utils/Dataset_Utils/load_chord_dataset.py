@@ -0,0 +1,76 @@
+from Utils.Dataset_Utils.stream_dataset_batches import stream_dataset_batches
+from Utils.Dataset_Utils.stream_local_corpus_batches import stream_local_corpus_batches
+from Utils.variable_constants import CHORDONOMICON_DATASET
+
+
+def load_chord_dataset(streaming=False, batch_size=10000, columns=("chords", "main_genre"), corpus_path=None):
+    """
+    Loads the Chordonomicon dataset or a local corpus, either fully or as a bounded-memory stream.
+
+    Args:
+        streaming (bool, optional): If True, the 'train' split is a re-iterable stream over
+            record batches holding only `columns`; every iteration opens a new stream, so
+            callers that scan the dataset several times keep working. If False, the whole
+            dataset is loaded with every column. Defaults to False.
+        batch_size (int, optional): Number of songs per streamed batch. Defaults to 10000.
+        columns (tuple, optional): Columns read in streaming mode. Defaults to ("chords", "main_genre").
+        corpus_path (str, optional): A local Parquet, CSV or JSON Lines file, or a directory of
+            them, read instead of the Hugging Face dataset. Local corpora are always read in
+            chunks of `batch_size` songs, holding only `columns`, without network access.
+            Defaults to None.
+
+    Returns:
+        The loaded DatasetDict, or {"train": StreamedSplit} in streaming mode or for a local corpus.
+    """
+    if streaming or corpus_path is not None:
+        return {"train": StreamedSplit(batch_size, columns, corpus_path)}
+
+    # Imported here, so local corpora can be read where datasets is not installed
+    from datasets import load_dataset
+
+    return load_dataset(CHORDONOMICON_DATASET)
+
+
+class StreamedSplit:
+    """
+    Re-iterable view of the streamed 'train' split of the Chordonomicon dataset or a local corpus.
+
+    Attributes:
+        batch_size (int): Number of songs per streamed batch.
+        columns (tuple): Columns read from the dataset.
+        corpus_path (str or None): Local corpus file or directory, or None for the Hugging Face dataset.
+
+    Methods:
+        batches():
+            Yields the split as lists of song records.
+    """
+
+    def __init__(self, batch_size=10000, columns=("chords", "main_genre"), corpus_path=None):
+        """
+        Initializes the StreamedSplit.
+
+        Args:
+            batch_size (int, optional): Number of songs per streamed batch. Defaults to 10000.
+            columns (tuple, optional): Columns read from the dataset. Defaults to ("chords", "main_genre").
+            corpus_path (str, optional): Local corpus file or directory to read instead of the
+                Hugging Face dataset. Defaults to None.
+        """
+        self.batch_size = batch_size
+        self.columns = columns
+        self.corpus_path = corpus_path
+
+    def batches(self):
+        """
+        Opens a new stream and yields the split as lists of song records.
+
+        Yields:
+            list: Up to `batch_size` song records.
+        """
+        if self.corpus_path is not None:
+            yield from stream_local_corpus_batches(self.corpus_path, self.batch_size, self.columns)
+        else:
+            yield from stream_dataset_batches(self.batch_size, self.columns)
+
+    def __iter__(self):
+        for batch in self.batches():
+            yield from batch
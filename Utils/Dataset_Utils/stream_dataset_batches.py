@@ -0,0 +1,28 @@
+from Utils.variable_constants import CHORDONOMICON_DATASET
+
+
+def stream_dataset_batches(batch_size=10000, columns=("chords", "main_genre"), dataset_name=CHORDONOMICON_DATASET,
+                           split="train"):
+    """
+    Streams a dataset split in record batches, reading only the requested columns.
+
+    The split is opened as a streaming (iterable) dataset, so nothing beyond the current batch
+    is held in memory and the other columns of the dataset are never decoded.
+
+    Args:
+        batch_size (int, optional): Number of songs per batch. Defaults to 10000.
+        columns (tuple, optional): Columns to read. Defaults to ("chords", "main_genre").
+        dataset_name (str, optional): Hugging Face dataset identifier. Defaults to Chordonomicon.
+        split (str, optional): The split to stream. Defaults to "train".
+
+    Yields:
+        list: Up to `batch_size` song records, each a dict holding the requested columns.
+    """
+    # Imported here, so local corpora can be read where datasets is not installed
+    from datasets import load_dataset
+
+    columns = list(columns)
+    dataset = load_dataset(dataset_name, split=split, streaming=True).select_columns(columns)
+
+    for batch in dataset.iter(batch_size=batch_size):
+        yield [dict(zip(columns, values)) for values in zip(*(batch[column] for column in columns))]
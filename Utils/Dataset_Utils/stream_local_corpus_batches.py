@@ -0,0 +1,124 @@
+import csv
+import os
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.json as pa_json
+import pyarrow.parquet as pq
+
+from Utils.variable_constants import LOCAL_CORPUS_SUFFIXES
+
+
+def stream_local_corpus_batches(corpus_path, batch_size=10000, columns=("chords", "main_genre")):
+    """
+    Streams a local Parquet, CSV or JSON Lines corpus in record batches with pyarrow.
+
+    Only the requested columns are read, chunk by chunk, so memory is bounded by the batch
+    size. A directory is read file by file in sorted name order, which keeps builds from the
+    same files reproducible.
+
+    Args:
+        corpus_path (str): A corpus file, or a directory of corpus files.
+        batch_size (int, optional): Maximum number of songs per batch. Defaults to 10000.
+        columns (tuple, optional): Columns to read. Defaults to ("chords", "main_genre").
+
+    Yields:
+        list: Up to `batch_size` song records, each a dict holding the requested columns.
+
+    Raises:
+        ValueError: If a file has an unsupported suffix or lacks one of the requested columns,
+            or a directory holds no corpus files.
+    """
+    columns = list(columns)
+
+    if os.path.isdir(corpus_path):
+        file_paths = [
+            os.path.join(corpus_path, file_name) for file_name in sorted(os.listdir(corpus_path))
+            if file_name.lower().endswith(LOCAL_CORPUS_SUFFIXES)
+        ]
+
+        if not file_paths:
+            raise ValueError(f"No {"/".join(LOCAL_CORPUS_SUFFIXES)} files found in {corpus_path}")
+    else:
+        file_paths = [corpus_path]
+
+    for file_path in file_paths:
+        for record_batch in _read_record_batches(file_path, batch_size, columns):
+            # Readers return blocks of their own size; cap every batch at batch_size songs
+            for offset in range(0, record_batch.num_rows, batch_size):
+                yield record_batch.slice(offset, batch_size).select(columns).to_pylist()
+
+
+def _read_record_batches(file_path, batch_size, columns):
+    """
+    Opens a corpus file with the pyarrow reader for its format.
+
+    Args:
+        file_path (str): Path of a .parquet, .csv or .jsonl file.
+        batch_size (int): Number of rows per Parquet batch.
+        columns (list): Columns to read.
+
+    Returns:
+        iterable: The file's pyarrow RecordBatches.
+
+    Raises:
+        ValueError: If the suffix is not supported or a requested column is missing.
+    """
+    suffix = os.path.splitext(file_path)[1].lower()
+
+    if suffix == ".parquet":
+        parquet_file = pq.ParquetFile(file_path)
+        _check_columns(file_path, parquet_file.schema_arrow.names, columns)
+        return parquet_file.iter_batches(batch_size=batch_size, columns=columns)
+
+    if suffix == ".csv":
+        # Read every column as text, so chords and genres are never parsed as numbers, and
+        # empty cells as nulls, as in the Parquet and JSON Lines readers
+        _check_columns(file_path, _read_csv_header(file_path), columns)
+        return pa_csv.open_csv(
+            file_path,
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=columns,
+                column_types={column: pa.string() for column in columns},
+                strings_can_be_null=True
+            )
+        )
+
+    if suffix == ".jsonl":
+        reader = pa_json.open_json(file_path)
+        _check_columns(file_path, reader.schema.names, columns)
+        return reader
+
+    raise ValueError(f"Unsupported corpus file: {file_path} (expected {"/".join(LOCAL_CORPUS_SUFFIXES)})")
+
+
+def _read_csv_header(file_path):
+    """
+    Reads the column names from the first line of a CSV file.
+
+    Args:
+        file_path (str): Path of the CSV file.
+
+    Returns:
+        list: The column names.
+    """
+    with open(file_path, "r", encoding="utf-8", newline="") as f:
+        return next(csv.reader(f), [])
+
+
+def _check_columns(file_path, available_columns, columns):
+    """
+    Checks that a corpus file has every requested column.
+
+    Args:
+        file_path (str): Path of the corpus file.
+        available_columns (list): Columns present in the file.
+        columns (list): Requested columns.
+
+    Raises:
+        ValueError: If a requested column is missing.
+    """
+    missing = [column for column in columns if column not in available_columns]
+
+    if missing:
+        raise ValueError(f"{file_path} is missing the column(s): {", ".join(missing)}")
@@ -0,0 +1,125 @@
+import hashlib
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Tuple
+
+import numpy as np
+
+from Utils.chord_vocabulary import canonicalize_chord
+from Utils.path_constants import CHROMA_CHORDS_PATH
+from Utils.variable_constants import CHORD_PITCH_TABLE_FILE_NAME
+
+# A note letter with its accidental, at the start of the symbol or after the bass slash
+_NOTE_PATTERN = re.compile(r"(^|/)([A-G])(#|b|s(?!us))?")
+
+_MUSIC21_ACCIDENTALS = {None: "", "#": "#", "s": "#", "b": "-"}
+
+
+def _to_music21_figure(chord_symbol: str) -> str:
+    """
+    Spells a chord symbol the way music21 expects it.
+
+    music21 writes flats as "-" ("B-m7") and does not read the Chordonomicon "s" sharps, so
+    only the root and bass are respelled. The quality is kept as written: the canonical
+    qualities (e.g. 'no3d', 'add13') mean other chords to music21, or nothing at all.
+
+    Args:
+        chord_symbol (str): The chord symbol as written, e.g. 'Bbm7/F'.
+
+    Returns:
+        str: The music21 chord figure, e.g. 'B-m7/F'.
+    """
+    return _NOTE_PATTERN.sub(
+        lambda match: match.group(1) + match.group(2) + _MUSIC21_ACCIDENTALS[match.group(3)], chord_symbol.strip()
+    )
+
+
+@lru_cache(maxsize=1024)
+def get_music21_chord_pitches(chord_symbol: str) -> Tuple[int, ...]:
+    """
+    Returns the MIDI pitches music21 voices a chord symbol with.
+
+    music21 is imported on first use only, since importing it takes about half a second.
+
+    Args:
+        chord_symbol (str): The chord symbol as written, in any spelling.
+
+    Returns:
+        Tuple[int, ...]: The MIDI note numbers (0-127) of the chord, lowest first.
+
+    Raises:
+        ValueError: If music21 cannot interpret the chord symbol.
+    """
+    import music21
+
+    chord = music21.harmony.ChordSymbol(_to_music21_figure(chord_symbol))
+
+    return tuple(pitch.midi for pitch in chord.pitches)
+
+
+@lru_cache(maxsize=None)
+def load_chord_pitch_table() -> Dict[str, Tuple[int, ...]]:
+    """
+    Loads the precomputed chord to MIDI pitch table, once per process.
+
+    The table is written by generate_chord_pitch_table, which voices every chord of the model
+    vocabulary (in all 12 keys) once. A missing table leaves every chord to music21.
+
+    Returns:
+        Dict[str, Tuple[int, ...]]: MIDI pitches keyed by canonical chord symbol.
+    """
+    table_file = os.path.join(CHROMA_CHORDS_PATH, CHORD_PITCH_TABLE_FILE_NAME)
+
+    if not os.path.exists(table_file):
+        return {}
+
+    with np.load(table_file) as table:
+        names, offsets, pitches = table["names"], table["offsets"], table["pitches"].tolist()
+
+    return {
+        str(name): tuple(pitches[start:end]) for name, start, end in zip(names, offsets[:-1], offsets[1:])
+    }
+
+
+@lru_cache(maxsize=None)
+def get_chord_pitch_table_version() -> str:
+    """
+    Returns a digest of the precomputed chord pitch table, once per process.
+
+    Renders record it, so MIDI files voiced from an older table are known to be out of date.
+
+    Returns:
+        str: The hex digest (BLAKE2b, 16 bytes) of the table file, or '' if there is no table.
+    """
+    table_file = os.path.join(CHROMA_CHORDS_PATH, CHORD_PITCH_TABLE_FILE_NAME)
+
+    if not os.path.exists(table_file):
+        return ""
+
+    with open(table_file, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+def get_chord_pitches(chord_symbol: str) -> Tuple[int, ...]:
+    """
+    Returns the MIDI pitches of a chord symbol in any spelling.
+
+    The symbol is canonicalized only to look it up in the precomputed table. Other chords are
+    voiced by music21 from the symbol as written, with the results of recent ones cached.
+
+    Args:
+        chord_symbol (str): The chord symbol, e.g. 'C#min7' or 'Csmin7'.
+
+    Returns:
+        Tuple[int, ...]: The MIDI note numbers (0-127) of the chord, lowest first.
+
+    Raises:
+        ValueError: If the chord is not in the table and music21 cannot interpret it.
+    """
+    pitches = load_chord_pitch_table().get(canonicalize_chord(chord_symbol))
+
+    if pitches is None:
+        pitches = get_music21_chord_pitches(chord_symbol)
+
+    return pitches
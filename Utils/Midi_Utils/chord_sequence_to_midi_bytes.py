@@ -0,0 +1,58 @@
+import io
+
+import pretty_midi
+
+from Utils.Midi_Utils.chord_pitch_table import get_chord_pitches
+
+
+def chord_sequence_to_midi_bytes(sequence, duration=0.5, velocity=100, program=0):
+    """
+    Render a sequence of chord symbols to a MIDI file in memory.
+
+    Each chord is played as simultaneous notes for `duration` seconds, one chord after the
+    other. The MIDI pitches of each chord are looked up in the precomputed chord pitch table,
+    and the file is serialized into a memory buffer, so nothing is read from or written to
+    disk. Wrap the result in io.BytesIO where a file object is needed.
+
+    Args:
+        sequence (list): List of chord symbol strings to convert to MIDI.
+            Examples: ['C', 'Am', 'F', 'G'], ['Cmaj7', 'Dm7', 'G7', 'Cmaj7']
+            Any enharmonic spelling is accepted, including the Chordonomicon "s" sharps.
+        duration (float, optional): Duration of each chord in seconds. Defaults to 0.5.
+        velocity (int, optional): MIDI velocity (volume) for all notes, ranging
+            from 0 (silent) to 127 (maximum volume). Defaults to 100.
+        program (int, optional): MIDI program number (instrument) to use, ranging
+            from 0-127. 0 is typically acoustic grand piano. Defaults to 0.
+
+    Returns:
+        bytes: The content of the Standard MIDI File.
+
+    Raises:
+        ValueError: If a chord symbol is not in the pitch table and cannot be interpreted.
+        ValueError: If velocity or program values are outside valid MIDI ranges.
+    """
+    # Convert each distinct chord to its MIDI pitch collection (MIDI note numbers 0-127) once
+    pitches_by_chord = {chord: get_chord_pitches(chord) for chord in dict.fromkeys(sequence)}
+    chord_notes_list = [pitches_by_chord[chord] for chord in sequence]
+
+    # Initialize MIDI file structure with specified instrument
+    midi = pretty_midi.PrettyMIDI()
+    instrument = pretty_midi.Instrument(program=program)
+    start = 0.0  # Track current time position in the sequence
+
+    # Add each chord to the MIDI file as a collection of simultaneous notes
+    for notes in chord_notes_list:
+        # Create a MIDI note for each pitch in the current chord
+        for note in notes:
+            # All notes in the chord start and end at the same time (polyphonic)
+            midi_note = pretty_midi.Note(velocity=velocity, pitch=note, start=start, end=start+duration)
+            instrument.notes.append(midi_note)
+        # Move to the next chord's start time (sequential chord progression)
+        start += duration
+
+    # Add the instrument to the MIDI file and serialize it to memory
+    midi.instruments.append(instrument)
+    buffer = io.BytesIO()
+    midi.write(buffer)
+
+    return buffer.getvalue()
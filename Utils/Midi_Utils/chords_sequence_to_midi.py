@@ -1,18 +1,23 @@
 import os
-import music21
-import pretty_midi
 
+from Utils.Midi_Utils.chord_sequence_to_midi_bytes import chord_sequence_to_midi_bytes
+from Utils.Midi_Utils.midi_render_manifest import get_midi_render_stamp, update_midi_render_manifest
 from Utils.path_constants import MIDI_SEQUENCES_PATH
 
 
-def chord_sequence_to_midi(json_path, sequence, sequence_type, duration=0.5, velocity=100, program=0):
+def chord_sequence_to_midi(json_path, sequence, sequence_type, duration=0.5, velocity=100, program=0,
+                           output_path=None, record_render=True):
     """
     Convert a sequence of chord symbols to a MIDI file.
 
     This function takes a sequence of chord symbol strings (e.g., 'C', 'Am', 'F7') and
     converts them into a MIDI file where each chord is played as simultaneous notes.
-    The function uses music21 to interpret chord symbols and extract MIDI pitches,
-    then uses pretty_midi to create the actual MIDI file with customizable parameters.
+    The file is rendered in memory by chord_sequence_to_midi_bytes, which looks the MIDI
+    pitches of each chord up in the precomputed chord pitch table (voicings of the whole
+    model vocabulary), and is then written to disk; services that send the MIDI to
+    clients can call chord_sequence_to_midi_bytes directly. The render parameters and the
+    pitch table version are recorded in the output directory's render manifest, which
+    export_chord_sequences_to_midi checks to skip up-to-date files.
 
     Args:
         json_path (str): Path to the original JSON file containing the chord sequence.
@@ -20,7 +25,7 @@ def chord_sequence_to_midi(json_path, sequence, sequence_type, duration=0.5, vel
             will be extracted and used as part of the MIDI filename.
         sequence (list): List of chord symbol strings to convert to MIDI.
             Examples: ['C', 'Am', 'F', 'G'], ['Cmaj7', 'Dm7', 'G7', 'Cmaj7']
-            Chord symbols should follow standard notation supported by music21.
+            Any enharmonic spelling is accepted, including the Chordonomicon "s" sharps.
         sequence_type (str): Identifier for the type of sequence being converted.
             This is appended to the MIDI filename for identification purposes.
             Examples: 'original', 'generated', 'modified'
@@ -30,46 +35,32 @@ def chord_sequence_to_midi(json_path, sequence, sequence_type, duration=0.5, vel
             from 0 (silent) to 127 (maximum volume). Defaults to 100.
         program (int, optional): MIDI program number (instrument) to use, ranging
             from 0-127. 0 is typically acoustic grand piano. Defaults to 0.
+        output_path (str, optional): Directory to write the MIDI file to. Defaults to
+            MIDI_SEQUENCES_PATH.
+        record_render (bool, optional): Whether to record the render in the directory's
+            manifest. Batch exports pass False and record all their files at once. Defaults to True.
 
     Returns:
         None: The function writes the MIDI file to disk and does not return a value.
-            The output file is saved to MIDI_SEQUENCES_PATH with filename format:
+            The output file is saved to `output_path` with filename format:
             "{base_name}_{sequence_type}.mid"
 
     Raises:
-        music21.exceptions.ChordException: If a chord symbol cannot be interpreted.
+        ValueError: If a chord symbol is not in the pitch table and cannot be interpreted.
         OSError: If the output directory doesn't exist or isn't writable.
         ValueError: If velocity or program values are outside valid MIDI ranges.
     """
     # Extract base filename from JSON path to create meaningful MIDI filename
     base_name = os.path.splitext(os.path.basename(json_path))[0]
     midi_file_name = f"{base_name}_{sequence_type}.mid"
-    midi_file_path = os.path.join(MIDI_SEQUENCES_PATH, midi_file_name)
+    output_path = output_path or MIDI_SEQUENCES_PATH
+    midi_file_path = os.path.join(output_path, midi_file_name)
 
-    # Convert chord symbols to MIDI pitch collections
-    chord_notes_list = []
-    for chord_name in sequence:
-        # Use music21 to interpret chord symbol and extract constituent pitches
-        chord = music21.harmony.ChordSymbol(chord_name)
-        # Convert music21 pitch objects to MIDI note numbers (0-127)
-        midi_pitches = [p.midi for p in chord.pitches]
-        chord_notes_list.append(midi_pitches)
+    # Render in memory first, so a chord that cannot be rendered leaves no file behind
+    midi_bytes = chord_sequence_to_midi_bytes(sequence, duration, velocity, program)
 
-    # Initialize MIDI file structure with specified instrument
-    midi = pretty_midi.PrettyMIDI()
-    instrument = pretty_midi.Instrument(program=program)
-    start = 0.0  # Track current time position in the sequence
+    with open(midi_file_path, "wb") as f:
+        f.write(midi_bytes)
 
-    # Add each chord to the MIDI file as a collection of simultaneous notes
-    for notes in chord_notes_list:
-        # Create a MIDI note for each pitch in the current chord
-        for note in notes:
-            # All notes in the chord start and end at the same time (polyphonic)
-            midi_note = pretty_midi.Note(velocity=velocity, pitch=note, start=start, end=start+duration)
-            instrument.notes.append(midi_note)
-        # Move to the next chord's start time (sequential chord progression)
-        start += duration
-
-    # Add the instrument to the MIDI file and write to disk
-    midi.instruments.append(instrument)
-    midi.write(midi_file_path)
+    if record_render:
+        update_midi_render_manifest(output_path, {midi_file_name: get_midi_render_stamp(duration, velocity, program)})
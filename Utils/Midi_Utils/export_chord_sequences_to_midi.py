@@ -0,0 +1,152 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from Utils.Midi_Utils.chords_sequence_to_midi import chord_sequence_to_midi
+from Utils.Midi_Utils.midi_render_manifest import get_midi_render_stamp, load_midi_render_manifest, \
+    update_midi_render_manifest
+from Utils.path_constants import CHORD_SEQUENCES_PATH, MIDI_SEQUENCES_PATH
+
+
+def export_chord_sequences_to_midi(sources=None, sequence_types=("input", "generated"), workers=None, force=False,
+                                   output_path=None, duration=0.5, velocity=100, program=0):
+    """
+    Converts many saved chord sequence files to MIDI, optionally in a process pool.
+
+    Every JSON file is read once and each requested sequence ('input_sequence' and/or
+    'generated_sequence') is rendered with chord_sequence_to_midi, giving the same
+    "{base_name}_{sequence_type}.mid" files. A MIDI file is up to date and skipped if it is
+    newer than its JSON file and the output directory's render manifest records it with the
+    same duration, velocity, program and chord pitch table; the manifest is updated once all
+    files are written. Workers take files in chunks and keep their chord pitch table loaded
+    between files.
+
+    Args:
+        sources (str or list of str, optional): A directory whose JSON files are exported, or a
+            list of JSON file paths (a job list). Defaults to CHORD_SEQUENCES_PATH.
+        sequence_types (tuple of str, optional): Sequences to render, among 'input' and
+            'generated'. Defaults to both.
+        workers (int, optional): Number of worker processes. Defaults to None, exporting the
+            files one after another in this process.
+        force (bool, optional): Whether to render files that are up to date. Defaults to False.
+        output_path (str, optional): Directory to write the MIDI files to. Defaults to
+            MIDI_SEQUENCES_PATH.
+        duration (float, optional): Duration of each chord in seconds. Defaults to 0.5.
+        velocity (int, optional): MIDI velocity for all notes (0-127). Defaults to 100.
+        program (int, optional): MIDI program number (instrument, 0-127). Defaults to 0.
+
+    Returns:
+        dict: 'files' processed, MIDI files 'written', 'skipped' as up to date, 'failed' JSON
+            files with their error, 'seconds' taken and 'files_per_second'.
+
+    Raises:
+        ValueError: If a sequence type is unknown or `workers` is below 1.
+    """
+    unknown = set(sequence_types) - {"input", "generated"}
+    if unknown:
+        raise ValueError(f"Unknown sequence types: {sorted(unknown)}")
+
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    if sources is None:
+        sources = CHORD_SEQUENCES_PATH
+
+    if isinstance(sources, str):
+        json_paths = [
+            os.path.join(sources, filename) for filename in sorted(os.listdir(sources)) if filename.endswith(".json")
+        ]
+    else:
+        json_paths = list(sources)
+
+    output_path = output_path or MIDI_SEQUENCES_PATH
+    os.makedirs(output_path, exist_ok=True)
+
+    render_stamp = get_midi_render_stamp(duration, velocity, program)
+    manifest = {} if force else load_midi_render_manifest(output_path)
+    up_to_date = {file_name for file_name, stamp in manifest.items() if stamp == render_stamp}
+
+    export_file = partial(
+        _export_chord_sequence_file, sequence_types=tuple(sequence_types), force=force, output_path=output_path,
+        duration=duration, velocity=velocity, program=program, up_to_date=up_to_date
+    )
+    results = {"files": len(json_paths), "written": 0, "skipped": 0, "failed": {}}
+
+    print(f"Exporting {len(json_paths)} chord sequence files to MIDI"
+          + (f" with {workers} workers..." if workers else "..."))
+
+    start = time.perf_counter()
+
+    if workers and len(json_paths) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Chunks amortize the inter-process overhead of small files
+            chunksize = max(1, len(json_paths) // (workers * 4))
+            file_results = list(executor.map(export_file, json_paths, chunksize=chunksize))
+    else:
+        file_results = [export_file(json_path) for json_path in json_paths]
+
+    written_files = []
+    for json_path, (written, skipped, error) in zip(json_paths, file_results):
+        results["written"] += len(written)
+        results["skipped"] += skipped
+        written_files.extend(written)
+        if error is not None:
+            results["failed"][json_path] = error
+            print(f"✗ Failed to export {os.path.basename(json_path)}: {error}")
+
+    update_midi_render_manifest(output_path, {file_name: render_stamp for file_name in written_files})
+
+    results["seconds"] = time.perf_counter() - start
+    results["files_per_second"] = len(json_paths) / results["seconds"] if results["seconds"] > 0 else 0.0
+
+    print(f"✓ Exported {results['written']} MIDI files ({results['skipped']} up to date, "
+          f"{len(results['failed'])} failed) from {len(json_paths)} files in {results['seconds']:.2f} s "
+          f"({results['files_per_second']:.1f} files/s)")
+
+    return results
+
+
+def _export_chord_sequence_file(json_path, sequence_types, force, output_path, duration, velocity, program,
+                                up_to_date):
+    """
+    Renders the requested sequences of one chord sequence file.
+
+    Returns:
+        tuple: (written, skipped, error) where written lists the names of the MIDI files
+            written and error is None or the message of the failure.
+    """
+    base_name = os.path.splitext(os.path.basename(json_path))[0]
+    written = []
+    skipped = 0
+
+    try:
+        source_mtime = os.path.getmtime(json_path)
+        data = None
+
+        for sequence_type in sequence_types:
+            midi_file_name = f"{base_name}_{sequence_type}.mid"
+            midi_file_path = os.path.join(output_path, midi_file_name)
+
+            if not force and midi_file_name in up_to_date and os.path.exists(midi_file_path) \
+                    and os.path.getmtime(midi_file_path) >= source_mtime:
+                skipped += 1
+                continue
+
+            # The JSON file is only read if one of its sequences needs rendering
+            if data is None:
+                with open(json_path, "r") as f:
+                    data = json.load(f)
+
+            sequence = data.get(f"{sequence_type}_sequence")
+            if not sequence:
+                continue
+
+            chord_sequence_to_midi(json_path, sequence, sequence_type, duration, velocity, program, output_path,
+                                   record_render=False)
+            written.append(midi_file_name)
+    except Exception as e:
+        return written, skipped, str(e)
+
+    return written, skipped, None
@@ -0,0 +1,74 @@
+import json
+import os
+import tempfile
+from typing import Dict
+
+from Utils.Midi_Utils.chord_pitch_table import get_chord_pitch_table_version
+from Utils.variable_constants import MIDI_RENDER_MANIFEST_FILE_NAME
+
+
+def get_midi_render_stamp(duration: float, velocity: int, program: int) -> Dict:
+    """
+    Returns the record of how a MIDI file is rendered: its parameters and the pitch table used.
+
+    Args:
+        duration (float): Duration of each chord in seconds.
+        velocity (int): MIDI velocity of all notes.
+        program (int): MIDI program number (instrument).
+
+    Returns:
+        Dict: 'duration', 'velocity', 'program' and 'pitch_table' (the table digest).
+    """
+    return {
+        "duration": duration,
+        "velocity": velocity,
+        "program": program,
+        "pitch_table": get_chord_pitch_table_version()
+    }
+
+
+def load_midi_render_manifest(output_path: str) -> Dict[str, Dict]:
+    """
+    Loads the render stamps of the MIDI files in an output directory.
+
+    Args:
+        output_path (str): The MIDI output directory.
+
+    Returns:
+        Dict[str, Dict]: Render stamps keyed by MIDI file name; empty if the directory has no
+            readable manifest.
+    """
+    try:
+        with open(os.path.join(output_path, MIDI_RENDER_MANIFEST_FILE_NAME), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def update_midi_render_manifest(output_path: str, stamps: Dict[str, Dict]) -> None:
+    """
+    Records the render stamps of newly written MIDI files in the directory's manifest.
+
+    The manifest is rewritten through a temporary file and os.replace, so readers never see
+    a partial manifest.
+
+    Args:
+        output_path (str): The MIDI output directory.
+        stamps (Dict[str, Dict]): Render stamps keyed by MIDI file name.
+    """
+    if not stamps:
+        return
+
+    manifest = load_midi_render_manifest(output_path)
+    manifest.update(stamps)
+
+    manifest_file = os.path.join(output_path, MIDI_RENDER_MANIFEST_FILE_NAME)
+    file_descriptor, temp_path = tempfile.mkstemp(dir=output_path, prefix=".tmp_")
+    try:
+        with os.fdopen(file_descriptor, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(temp_path, manifest_file)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
@@ -0,0 +1,252 @@
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from Utils.variable_constants import NOTE_TO_SEMITONE, CANONICAL_PITCH_NAMES, CHORD_QUALITY_ALIASES
+
+# Root letter with an optional accidental. Chordonomicon writes sharps as "s" ("Cs", "Fsmin"),
+# so "s" counts as a sharp unless it starts "sus".
+_CHORD_PATTERN = re.compile(r"^([A-G])(#|b|s(?!us))?(.*)$")
+_BASS_PATTERN = re.compile(r"^([A-G])(#|b|s)?$")
+
+_ACCIDENTAL_OFFSETS = {None: 0, "": 0, "#": 1, "s": 1, "b": -1}
+
+
+def _pitch_class(letter: str, accidental: Optional[str]) -> int:
+    """
+    Returns the pitch class (0-11) of a note letter and accidental.
+    """
+    return (NOTE_TO_SEMITONE[letter] + _ACCIDENTAL_OFFSETS[accidental]) % 12
+
+
+@lru_cache(maxsize=None)
+def parse_chord_symbol(chord_symbol: str) -> Optional[Tuple[int, str, Optional[int]]]:
+    """
+    Parses a chord symbol into its root, quality and bass.
+
+    Accepts "#", "b" and the Chordonomicon "s" as accidentals, and maps alternative quality
+    spellings (e.g. "m7", "maj") to the Chordonomicon ones via CHORD_QUALITY_ALIASES.
+
+    Args:
+        chord_symbol (str): The chord symbol, e.g. 'C#min7', 'Dbmin7', 'Csmin7/Gs'.
+
+    Returns:
+        tuple or None: (root_pitch_class, quality, bass_pitch_class). bass_pitch_class is None
+            when there is no bass note or it equals the root. None if the symbol has no root.
+    """
+    match = _CHORD_PATTERN.match(chord_symbol.strip())
+    if not match:
+        return None
+
+    letter, accidental, rest = match.groups()
+    root = _pitch_class(letter, accidental)
+
+    quality, _, bass_symbol = rest.partition("/")
+    quality = CHORD_QUALITY_ALIASES.get(quality, quality)
+
+    bass = None
+    if bass_symbol:
+        bass_match = _BASS_PATTERN.match(bass_symbol)
+        if not bass_match:
+            return None
+        bass = _pitch_class(*bass_match.groups())
+
+        # A bass equal to the root is the plain chord
+        if bass == root:
+            bass = None
+
+    return root, quality, bass
+
+
+def format_chord_symbol(root: int, quality: str, bass: Optional[int] = None) -> str:
+    """
+    Formats a root, quality and bass as a canonical chord symbol.
+
+    Args:
+        root (int): Root pitch class (0-11).
+        quality (str): Canonical chord quality, e.g. 'min7'.
+        bass (int, optional): Bass pitch class, or None for root position.
+
+    Returns:
+        str: The canonical chord symbol, e.g. 'Dbmin7/Ab'.
+    """
+    symbol = CANONICAL_PITCH_NAMES[root % 12] + quality
+
+    if bass is not None and bass % 12 != root % 12:
+        symbol += "/" + CANONICAL_PITCH_NAMES[bass % 12]
+
+    return symbol
+
+
+@lru_cache(maxsize=None)
+def canonicalize_chord(chord_symbol: str) -> str:
+    """
+    Returns the canonical spelling of a chord symbol.
+
+    Enharmonic spellings share one canonical form ('C#min', 'Csmin' and 'Dbmin' all become
+    'Dbmin'). Symbols without a recognizable root are returned stripped but otherwise unchanged.
+
+    Args:
+        chord_symbol (str): The chord symbol to canonicalize.
+
+    Returns:
+        str: The canonical chord symbol.
+    """
+    parsed = parse_chord_symbol(chord_symbol)
+
+    if parsed is None:
+        return chord_symbol.strip()
+
+    return format_chord_symbol(*parsed)
+
+
+class ChordVocabulary:
+    """
+    Interns chord symbols as integer ids, one id per canonical chord.
+
+    Every spelling of a chord maps to the same id, so the pipeline can count, index and
+    generate on small integers and only decode to strings at its edges (dataset input,
+    saved mappings, user input and output). Thread-safe.
+
+    Methods:
+        encode(chord_symbol: str) -> int:
+            Returns the id of a chord, interning it if it is new.
+
+        lookup(chord_symbol: str) -> Optional[int]:
+            Returns the id of a chord, or None if it has never been interned.
+
+        decode(chord_id: int) -> str:
+            Returns the canonical symbol of an id.
+
+        encode_sequence(chord_symbols) / decode_sequence(chord_ids):
+            Element-wise encode / decode of a chord sequence.
+
+        encode_ngram(ngram) / decode_ngram(ngram_ids):
+            Encode / decode an n-gram key (a single chord for n=1, a tuple for n>1).
+    """
+
+    def __init__(self, chord_symbols: Iterable[str] = ()):
+        """
+        Initializes the vocabulary, optionally interning a list of chords in order.
+
+        Args:
+            chord_symbols (Iterable[str], optional): Chords to intern up front. Passing the
+                output of `chords` from another vocabulary reproduces its ids.
+        """
+        self._id_to_chord: List[str] = []
+        self._chord_to_id: Dict[str, int] = {}
+        self._spelling_to_id: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        for chord_symbol in chord_symbols:
+            self.encode(chord_symbol)
+
+    def __len__(self) -> int:
+        return len(self._id_to_chord)
+
+    @property
+    def chords(self) -> List[str]:
+        """
+        List[str]: Canonical chord symbols, indexed by id.
+        """
+        return list(self._id_to_chord)
+
+    def encode(self, chord_symbol: str) -> int:
+        """
+        Returns the id of a chord, interning it if it is new.
+
+        Args:
+            chord_symbol (str): Any spelling of the chord.
+
+        Returns:
+            int: The chord id.
+        """
+        chord_id = self._spelling_to_id.get(chord_symbol)
+        if chord_id is not None:
+            return chord_id
+
+        canonical = canonicalize_chord(chord_symbol)
+
+        with self._lock:
+            chord_id = self._chord_to_id.get(canonical)
+            if chord_id is None:
+                chord_id = len(self._id_to_chord)
+                self._id_to_chord.append(canonical)
+                self._chord_to_id[canonical] = chord_id
+
+            self._spelling_to_id[chord_symbol] = chord_id
+
+        return chord_id
+
+    def lookup(self, chord_symbol: str) -> Optional[int]:
+        """
+        Returns the id of a chord without interning it.
+
+        Args:
+            chord_symbol (str): Any spelling of the chord.
+
+        Returns:
+            int or None: The chord id, or None if the chord is unknown.
+        """
+        chord_id = self._spelling_to_id.get(chord_symbol)
+        if chord_id is not None:
+            return chord_id
+
+        return self._chord_to_id.get(canonicalize_chord(chord_symbol))
+
+    def decode(self, chord_id: int) -> str:
+        """
+        Returns the canonical symbol of an id.
+
+        Args:
+            chord_id (int): The chord id.
+
+        Returns:
+            str: The canonical chord symbol.
+        """
+        return self._id_to_chord[chord_id]
+
+    def encode_sequence(self, chord_symbols: Iterable[str]) -> List[int]:
+        """
+        Encodes a chord sequence, interning new chords.
+        """
+        return [self.encode(chord_symbol) for chord_symbol in chord_symbols]
+
+    def decode_sequence(self, chord_ids: Iterable[int]) -> List[str]:
+        """
+        Decodes a sequence of chord ids to canonical symbols.
+        """
+        return [self._id_to_chord[chord_id] for chord_id in chord_ids]
+
+    def encode_ngram(self, ngram):
+        """
+        Encodes an n-gram key: a chord string for n=1, a tuple of chords for n>1.
+        """
+        if isinstance(ngram, tuple):
+            return tuple(self.encode(chord_symbol) for chord_symbol in ngram)
+
+        return self.encode(ngram)
+
+    def decode_ngram(self, ngram_ids):
+        """
+        Decodes an n-gram key: a chord id for n=1, a tuple of ids for n>1.
+        """
+        if isinstance(ngram_ids, tuple):
+            return tuple(self._id_to_chord[chord_id] for chord_id in ngram_ids)
+
+        return self._id_to_chord[ngram_ids]
+
+
+# Vocabulary shared by every pipeline stage in the process
+_default_vocabulary = ChordVocabulary()
+
+
+def get_chord_vocabulary() -> ChordVocabulary:
+    """
+    Returns the process-wide ChordVocabulary.
+
+    Returns:
+        ChordVocabulary: The shared vocabulary instance.
+    """
+    return _default_vocabulary
@@ -1,11 +1,11 @@
-from Audio_Input.chord_sequence_controller import ChordSequenceController
 from Markov_Chains.markov_chain_sequence_generator import MarkovChainSequenceGenerator
+from Markov_Chains.model_sequence_seeder import ModelSequenceSeeder
 from Markov_Chains.ngram_matrix_loader import NGramMatrixLoader
 from Utils.get_valid_genre import get_valid_genre
 from Utils.save_sequence_to_json import save_sequence_to_json
 
 
-def generate_music_sequence(in_seq, in_len, out_len, m_genre):
+def generate_music_sequence(in_seq, in_len, out_len, m_genre, seed_mode="model", key_relative=False):
     """
     Generate a musical chord sequence using genre-specific Markov chain models.
 
@@ -25,6 +25,15 @@ def generate_music_sequence(in_seq, in_len, out_len, m_genre):
             integer representing the number of new chords to generate beyond the input.
         m_genre (str): Musical genre for the Markov model. Examples: 'blues', 'jazz',
             'rock', 'pop'. Case-insensitive. Must correspond to available trained models.
+        seed_mode (str, optional): Where the initial sequence comes from.
+            - 'model': Seeds, validates and completes the input with the loaded n-gram model
+              only (start-state distribution and 1-gram vocabulary). Needs neither the
+              `datasets` package nor network access.
+            - 'dataset': Uses ChordSequenceController, which loads the Chordonomicon dataset
+              to draw a random seed window and validate chords against the corpus.
+            Defaults to 'model'.
+        key_relative (bool, optional): Use the transposition-invariant models built with
+            key_relative=True; the output stays in the key of the input. Defaults to False.
 
     Returns:
         None: The function prints results and saves output to JSON files, but does not
@@ -32,7 +41,8 @@ def generate_music_sequence(in_seq, in_len, out_len, m_genre):
             directory with timestamped filenames.
 
     Raises:
-        ValueError: If the genre is invalid or not supported by the available models.
+        ValueError: If the genre is invalid or not supported by the available models,
+            or if seed_mode is unknown.
         SystemExit: If critical validation errors occur that prevent execution.
     """
     # Store the initial input sequence for processing
@@ -53,8 +63,18 @@ def generate_music_sequence(in_seq, in_len, out_len, m_genre):
         print("Error:", e)
         exit(1)  # Exit if genre validation fails
 
-    # Initialize the chord sequence controller with input parameters
-    controller = ChordSequenceController(initial_sequence, input_sequence_length, genre)
+    # Load the pre-trained n-gram transition matrices for the specified genre
+    ngram_loader = NGramMatrixLoader(genre=genre, key_relative=key_relative)  # Initialize with required parameters
+
+    # Initialize the component that prepares the input sequence
+    if seed_mode == "model":
+        controller = ModelSequenceSeeder(ngram_loader, initial_sequence, input_sequence_length)
+    elif seed_mode == "dataset":
+        # Imported here so the model-only path never needs the datasets package
+        from Audio_Input.chord_sequence_controller import ChordSequenceController
+        controller = ChordSequenceController(initial_sequence, input_sequence_length, genre)
+    else:
+        raise ValueError(f"Unknown seed_mode '{seed_mode}'. Use 'model' or 'dataset'")
 
     # Process the initial sequence to create a properly formatted input sequence
     try:
@@ -64,9 +84,6 @@ def generate_music_sequence(in_seq, in_len, out_len, m_genre):
         print("Error:", e)
         # Continue execution even if sequence processing has issues
 
-    # Load the pre-trained n-gram transition matrices for the specified genre
-    ngram_loader = NGramMatrixLoader(genre=genre)  # Initialize with required parameters
-
     # Create the Markov chain generator with the loaded matrices
     markov_generator = MarkovChainSequenceGenerator(ngram_loader)
 
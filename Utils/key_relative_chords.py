@@ -0,0 +1,105 @@
+from typing import Iterable, List, Optional
+
+from Utils.chord_vocabulary import ChordVocabulary, format_chord_symbol, parse_chord_symbol
+
+# Separates the root interval from the quality in a key-relative token, e.g. "5:min7"
+KEY_RELATIVE_SEPARATOR = ":"
+
+
+def to_key_relative_tokens(chord_symbols: Iterable[str]) -> List[str]:
+    """
+    Encodes a chord sequence so that its 12 transpositions give the same tokens.
+
+    The opening chord is transposed to C (e.g. 'Ebmin7' becomes 'Cmin7'); every later chord
+    becomes '{interval}:{quality}', its root interval in semitones above the previous chord's
+    root, with '/{bass interval}' above its own root for slash chords. 'D G A' and 'F Bb C'
+    both become ['C', '5:', '2:']. Symbols without a recognizable root are skipped.
+
+    Args:
+        chord_symbols (Iterable[str]): Chord symbols in any spelling.
+
+    Returns:
+        List[str]: The key-relative tokens, one per recognized chord.
+    """
+    tokens = []
+    previous_root = None
+
+    for chord_symbol in chord_symbols:
+        parsed = parse_chord_symbol(chord_symbol)
+        if parsed is None:
+            continue
+
+        root, quality, bass = parsed
+
+        if previous_root is None:
+            tokens.append(format_chord_symbol(0, quality, None if bass is None else bass - root))
+        else:
+            token = f"{(root - previous_root) % 12}{KEY_RELATIVE_SEPARATOR}{quality}"
+            if bass is not None:
+                token += f"/{(bass - root) % 12}"
+            tokens.append(token)
+
+        previous_root = root
+
+    return tokens
+
+
+def from_key_relative_tokens(tokens: Iterable[str], root: int = 0) -> List[str]:
+    """
+    Decodes key-relative tokens back to canonical chord symbols in a given key.
+
+    Chord symbols among the tokens (the transposed opening chord) are moved up by `root`
+    semitones; interval tokens are placed relative to the previous chord's root.
+
+    Args:
+        tokens (Iterable[str]): Tokens as produced by to_key_relative_tokens.
+        root (int, optional): Pitch class (0-11) the opening chord's C is transposed to. Defaults to 0.
+
+    Returns:
+        List[str]: The canonical chord symbols; tokens that cannot be decoded are skipped.
+    """
+    chord_symbols = []
+    current_root = root
+
+    for token in tokens:
+        interval, separator, quality = token.partition(KEY_RELATIVE_SEPARATOR)
+
+        if separator and interval.isdigit():
+            quality, _, bass_interval = quality.partition("/")
+            current_root = (current_root + int(interval)) % 12
+            bass = current_root + int(bass_interval) if bass_interval.isdigit() else None
+        else:
+            parsed = parse_chord_symbol(token)
+            if parsed is None:
+                continue
+
+            token_root, quality, bass = parsed
+            current_root = (root + token_root) % 12
+            bass = None if bass is None else current_root + bass - token_root
+
+        chord_symbols.append(format_chord_symbol(current_root, quality, bass))
+
+    return chord_symbols
+
+
+def get_chord_root(chord_symbol: str) -> Optional[int]:
+    """
+    Returns the root pitch class (0-11) of a chord symbol, or None if it has no root.
+    """
+    parsed = parse_chord_symbol(chord_symbol)
+
+    return None if parsed is None else parsed[0]
+
+
+# Vocabulary of the key-relative models, kept apart from the absolute chords' vocabulary
+_key_relative_vocabulary = ChordVocabulary()
+
+
+def get_key_relative_vocabulary() -> ChordVocabulary:
+    """
+    Returns the process-wide ChordVocabulary of key-relative tokens.
+
+    Returns:
+        ChordVocabulary: The vocabulary instance shared by key-relative builds and loaders.
+    """
+    return _key_relative_vocabulary
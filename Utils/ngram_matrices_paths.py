@@ -0,0 +1,63 @@
+import operator
+import os
+import re
+
+from Utils.path_constants import MATRICES_PATH
+
+# Directory name of an n-gram order inside MATRICES_PATH, e.g. "Matrices_6_Gram"
+_NGRAM_DIRECTORY_PATTERN = re.compile(r"^Matrices_(\d+)_Gram$")
+
+
+def get_ngram_matrices_path(n, matrices_path=None):
+    """
+    Returns the directory holding the artifacts of an n-gram order.
+
+    Every order lives in its own Matrices_{n}_Gram directory inside MATRICES_PATH, so any
+    order can be built and loaded; MATRICES_1_GRAM_PATH to MATRICES_4_GRAM_PATH are the same
+    paths for the first four orders.
+
+    Args:
+        n (int): The n-gram order.
+        matrices_path (str, optional): Root of a model variant laid out the same way, e.g. a
+            pruned copy. Defaults to MATRICES_PATH.
+
+    Returns:
+        str: The directory of the order.
+
+    Raises:
+        ValueError: If `n` is not a positive integer.
+    """
+    try:
+        order = operator.index(n)
+    except TypeError:
+        order = 0
+
+    if order < 1:
+        raise ValueError(f"Unsupported n-gram size: {n}")
+
+    return os.path.join(MATRICES_PATH if matrices_path is None else matrices_path, f"Matrices_{order}_Gram")
+
+
+def list_ngram_orders(matrices_path=None):
+    """
+    Lists the n-gram orders that have an artifact directory.
+
+    Args:
+        matrices_path (str, optional): Root of a model variant to scan. Defaults to MATRICES_PATH.
+
+    Returns:
+        list: The orders found in the directory, in ascending order.
+    """
+    if matrices_path is None:
+        matrices_path = MATRICES_PATH
+
+    if not os.path.exists(matrices_path):
+        return []
+
+    orders = []
+    for directory_name in os.listdir(matrices_path):
+        match = _NGRAM_DIRECTORY_PATTERN.match(directory_name)
+        if match and int(match.group(1)) >= 1 and os.path.isdir(os.path.join(matrices_path, directory_name)):
+            orders.append(int(match.group(1)))
+
+    return sorted(orders)
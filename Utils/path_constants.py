@@ -31,6 +31,12 @@ MATRICES_3_GRAM_PATH = os.path.join(MATRICES_PATH, "Matrices_3_Gram")
 # Path to the "Matrices_1_Gram" directory inside the "Matrices" directory.
 MATRICES_4_GRAM_PATH = os.path.join(MATRICES_PATH, "Matrices_4_Gram")
 
+# Path to the "Key_Relative_Matrices" directory inside the "Data" directory.
+KEY_RELATIVE_MATRICES_PATH = os.path.join(DATA_PATH, "Key_Relative_Matrices")
+
+# Path to the "Pruned_Matrices" directory inside the "Data" directory.
+PRUNED_MATRICES_PATH = os.path.join(DATA_PATH, "Pruned_Matrices")
+
 # Path to the "Midi_Sequences" directory inside the "Data" directory.
 MIDI_SEQUENCES_PATH = os.path.join(DATA_PATH, "Midi_Sequences")
 
@@ -52,12 +58,24 @@ MATRIX_COMPARISON_PATH = os.path.join(MATRIX_ANALYZER_PATH, "Matrix_Comparison")
 # Path to the "Sparsity_Analyzer" directory inside the "Matrix_Analyzer" directory.
 SPARSITY_ANALYZER_PATH = os.path.join(MATRIX_ANALYZER_PATH, "Sparsity_Analyzer")
 
+# Path to the "Build_Manifest" directory inside the "TRANSITION_MATRICES_PATH" directory.
+BUILD_MANIFEST_PATH = os.path.join(TRANSITION_MATRICES_PATH, "Build_Manifest")
+
+# Path to the "Build_Profiler" directory inside the "TRANSITION_MATRICES_PATH" directory.
+BUILD_PROFILER_PATH = os.path.join(TRANSITION_MATRICES_PATH, "Build_Profiler")
+
 # Path to the "Matrix_Builder" directory inside the "TRANSITION_MATRICES_PATH" directory.
 MATRIX_BUILDER_PATH = os.path.join(TRANSITION_MATRICES_PATH, "Matrix_Builder")
 
+# Path to the "Matrix_Generator" directory inside the "TRANSITION_MATRICES_PATH" directory.
+MATRIX_GENERATOR_PATH = os.path.join(TRANSITION_MATRICES_PATH, "Matrix_Generator")
+
 # Path to the "Matrix_Optimizer" directory inside the "TRANSITION_MATRICES_PATH" directory.
 MATRIX_OPTIMIZER_PATH = os.path.join(TRANSITION_MATRICES_PATH, "Matrix_Optimizer")
 
+# Path to the "Matrix_Updater" directory inside the "TRANSITION_MATRICES_PATH" directory.
+MATRIX_UPDATER_PATH = os.path.join(TRANSITION_MATRICES_PATH, "Matrix_Updater")
+
 # Path to the "Utils" directory within the project.
 UTILS_PATH = os.path.join(ROOT_PATH, "Utils")
 
@@ -13,6 +13,24 @@ NOTE_TO_SEMITONE = {
     "B": 11
 }
 
+# Hugging Face identifier of the Chordonomicon dataset
+CHORDONOMICON_DATASET = "ailsntua/Chordonomicon"
+
+# Name of the build manifest kept in every Matrices_{n}_Gram directory
+BUILD_MANIFEST_FILE_NAME = "build_manifest.json"
+
+# Name of the build profile report written next to the matrices of a profiled build
+BUILD_PROFILE_FILE_NAME = "build_profile.json"
+
+# Name of the chord to MIDI pitch table kept next to the chroma templates in Data/Chroma_Chords
+CHORD_PITCH_TABLE_FILE_NAME = "chord_pitch_table.npz"
+
+# Name of the manifest of render parameters kept in every MIDI output directory
+MIDI_RENDER_MANIFEST_FILE_NAME = "midi_render_manifest.json"
+
+# File suffixes read as a local corpus
+LOCAL_CORPUS_SUFFIXES = (".parquet", ".csv", ".jsonl")
+
 CHORDONOMICON_GENRES = [
     "alternative",
     "country",
@@ -26,4 +44,104 @@ CHORDONOMICON_GENRES = [
     "reggae",
     "rock",
     "soul"
-]
\ No newline at end of file
+]
+
+# Spelling used for each pitch class (index = semitone) in canonical chord symbols.
+# Flats match the naming of the chroma templates in Data/Chroma_Chords.
+CANONICAL_PITCH_NAMES = ["C", "Db", "D", "Eb", "E", "F", "Gb", "G", "Ab", "A", "Bb", "B"]
+
+# Alternative quality spellings mapped to the Chordonomicon spelling used in canonical symbols
+CHORD_QUALITY_ALIASES = {
+    "maj": "",
+    "M": "",
+    "m": "min",
+    "mi": "min",
+    "-": "min",
+    "m7": "min7",
+    "mi7": "min7",
+    "-7": "min7",
+    "M7": "maj7",
+    "ma7": "maj7",
+    "m9": "min9",
+    "m11": "min11",
+    "m13": "min13",
+    "M9": "maj9",
+    "mmaj7": "minmaj7",
+    "mMaj7": "minmaj7",
+    "madd9": "minadd9",
+    "add2": "add9",
+    "6": "add13",
+    "m6": "minadd13",
+    "o": "dim",
+    "o7": "dim7",
+    "m7b5": "dimb7",
+    "+": "aug",
+    "sus": "sus4",
+    "5": "no3d"
+}
+
+# Semitone intervals above the root for every canonical chord quality
+CHORD_QUALITY_INTERVALS = {
+    "": (0, 4, 7),
+    "min": (0, 3, 7),
+    "dim": (0, 3, 6),
+    "aug": (0, 4, 8),
+    "sus2": (0, 2, 7),
+    "sus4": (0, 5, 7),
+    "no3d": (0, 7),
+    "7": (0, 4, 7, 10),
+    "maj7": (0, 4, 7, 11),
+    "min7": (0, 3, 7, 10),
+    "minmaj7": (0, 3, 7, 11),
+    "dim7": (0, 3, 6, 9),
+    "dimb7": (0, 3, 6, 10),
+    "augmaj7": (0, 4, 8, 11),
+    "7sus2": (0, 2, 7, 10),
+    "7sus4": (0, 5, 7, 10),
+    "maj7sus2": (0, 2, 7, 11),
+    "maj7sus4": (0, 5, 7, 11),
+    "add9": (0, 4, 7, 14),
+    "minadd9": (0, 3, 7, 14),
+    "add11": (0, 4, 7, 17),
+    "minadd11": (0, 3, 7, 17),
+    "add13": (0, 4, 7, 21),
+    "minadd13": (0, 3, 7, 21),
+    "dimadd13": (0, 3, 6, 21),
+    "9": (0, 4, 7, 10, 14),
+    "maj9": (0, 4, 7, 11, 14),
+    "min9": (0, 3, 7, 10, 14),
+    "minmaj9": (0, 3, 7, 11, 14),
+    "augmaj9": (0, 4, 8, 11, 14),
+    "dim9": (0, 3, 6, 9, 14),
+    "dimb9": (0, 3, 6, 9, 13),
+    "minb9": (0, 3, 7, 13),
+    "majs9": (0, 4, 7, 15),
+    "7b9": (0, 4, 7, 10, 13),
+    "11": (0, 4, 7, 10, 14, 17),
+    "11b9": (0, 4, 7, 10, 13, 17),
+    "11s": (0, 4, 7, 10, 14, 18),
+    "maj11": (0, 4, 7, 11, 14, 17),
+    "min11": (0, 3, 7, 10, 14, 17),
+    "minmaj11": (0, 3, 7, 11, 14, 17),
+    "augmaj11": (0, 4, 8, 11, 14, 17),
+    "dim11b9": (0, 3, 6, 9, 13, 17),
+    "min1113b": (0, 3, 7, 10, 14, 17, 20),
+    "maj911s": (0, 4, 7, 11, 14, 18),
+    "majs911s": (0, 4, 7, 15, 18),
+    "13": (0, 4, 7, 10, 14, 21),
+    "13b": (0, 4, 7, 10, 20),
+    "13b9": (0, 4, 7, 10, 13, 21),
+    "dim13b9": (0, 3, 6, 9, 13, 21),
+    "maj13": (0, 4, 7, 11, 14, 21),
+    "min13": (0, 3, 7, 10, 14, 21),
+    "minmaj13": (0, 3, 7, 11, 14, 21),
+    "maj1311s": (0, 4, 7, 11, 14, 18, 21)
+}
+
+# Separator used to join the chords of an n-gram into one key in persisted count tables.
+# It sorts below every printable character, so joined keys sort like the n-gram tuples.
+NGRAM_KEY_SEPARATOR = "\x01"
+
+# Mappings key recording the content hash of the matrix file written alongside them.
+# A mismatch means a crash left the model with a new matrix and old mappings.
+MATRIX_DIGEST_MAPPINGS_KEY = "matrix_blake2b"